@@ -1,17 +1,41 @@
 import sys
+from collections import deque
 import numpy as np
 from PyQt5.QtWidgets import (QApplication, QWidget, QPushButton, QVBoxLayout, QHBoxLayout,
-                             QLabel, QComboBox, QSlider, QLineEdit, QGridLayout)
-from PyQt5.QtCore import Qt
-from qutip import Bloch 
+                             QLabel, QComboBox, QSlider, QLineEdit, QGridLayout, QCheckBox)
+from PyQt5.QtCore import Qt, QTimer
 from quantum_simulator import QuantumSimulator
-from qutip import Qobj
+from custom_gates import CUSTOM_GATES
+
+MAX_FPS = 60  # Upper bound on Bloch sphere repaints per second
+TRAIL_LENGTH = 50  # Number of recent states drawn as a trail behind the state arrow
+ANIMATION_FRAMES = 45  # Frames used to animate one gate (0.75 s at MAX_FPS)
 
 class QuantumGUI(QWidget):
     def __init__(self):
         super().__init__()
         self.simulator = QuantumSimulator()
         self.setFixedSize(500, 400)
+
+        # Redraws are coalesced: update_bloch only marks the view dirty and the
+        # timer repaints at most once per frame.
+        self._render_pending = False
+        self._render_timer = QTimer(self)
+        self._render_timer.setSingleShot(True)
+        self._render_timer.setInterval(int(1000 / MAX_FPS))
+        self._render_timer.timeout.connect(self._render_frame)
+        self._trail = deque(maxlen=TRAIL_LENGTH)
+
+        # Gate animations replay a precomputed trajectory one frame per tick.
+        self._animation_frames = None
+        self._animation_index = 0
+        self._animation_timer = QTimer(self)
+        self._animation_timer.setInterval(int(1000 / MAX_FPS))
+        self._animation_timer.timeout.connect(self._animation_step)
+
+        # Matrix text already parsed and validated -> registered custom gate name.
+        self._custom_gate_names = {}
+
         self.init_ui()
 
     def init_ui(self):
@@ -69,8 +93,7 @@ class QuantumGUI(QWidget):
         gate_layout = QVBoxLayout()
         state_layout = QVBoxLayout()
 
-        self.bloch = Bloch()
-        self.bloch.show()
+        self.bloch = None  # Created on first render, see _ensure_bloch
 
         # --- Gate Controls ---
         self.gate_combo = QComboBox()
@@ -82,6 +105,9 @@ class QuantumGUI(QWidget):
         gate_layout.addWidget(QLabel("Select Gate:"))
         gate_layout.addWidget(self.gate_combo)
 
+        self.animate_checkbox = QCheckBox("Animate gates")
+        gate_layout.addWidget(self.animate_checkbox)
+
         self.apply_gate_btn = QPushButton("Apply Gate")
         self.apply_gate_btn.clicked.connect(self.apply_gate)
         gate_layout.addWidget(self.apply_gate_btn)
@@ -169,16 +195,15 @@ class QuantumGUI(QWidget):
 
     def apply_custom_gate(self):
         try:
-            matrix = []
-            for i in range(2):
-                row = []
-                for j in range(2):
-                    text = self.matrix_inputs[i][j].text()
-                    value = complex(eval(text, {"sqrt": np.sqrt, "pi": np.pi, "__builtins__": {}}))
-                    row.append(value)
-                matrix.append(row)
-    
-            self.simulator.apply_gate("custom", matrix=matrix)
+            texts = tuple(self.matrix_inputs[i][j].text() for i in range(2) for j in range(2))
+            gate_name = self._custom_gate_names.get(texts)
+            if gate_name is None:
+                values = [complex(eval(text, {"sqrt": np.sqrt, "pi": np.pi, "__builtins__": {}}))
+                          for text in texts]
+                gate_name = CUSTOM_GATES.register(np.reshape(values, (2, 2)))
+                self._custom_gate_names[texts] = gate_name
+
+            self.simulator.apply_gate(gate_name)
             self.update_bloch()
 
             self.custom_popup.close()
@@ -192,11 +217,34 @@ class QuantumGUI(QWidget):
             theta = np.deg2rad(self.rotation_slider.value())
             kwargs['theta'] = theta
         try:
-            self.simulator.apply_gate(gate_name, **kwargs)
-            self.update_bloch()
+            if self.animate_checkbox.isChecked():
+                frames = self.simulator.gate_trajectory(gate_name, frames=ANIMATION_FRAMES, **kwargs)
+                self.simulator.apply_gate(gate_name, **kwargs)
+                self.play_trajectory(frames)
+            else:
+                self.simulator.apply_gate(gate_name, **kwargs)
+                self.update_bloch()
         except Exception as e:
             print(f"Failed to apply gate: {e}")
 
+    def play_trajectory(self, frames):
+        """
+        Plays back a precomputed (frames, 3) Bloch trajectory, then shows the current state.
+        """
+        self._ensure_bloch()
+        self._animation_frames = frames
+        self._animation_index = 0
+        self._animation_timer.start()
+
+    def _animation_step(self):
+        if self._animation_index >= len(self._animation_frames):
+            self._animation_timer.stop()
+            self._animation_frames = None
+            self.update_bloch()
+            return
+        self._draw_state(*self._animation_frames[self._animation_index])
+        self._animation_index += 1
+
     def redo(self):
         self.simulator.redo()
         self.update_bloch()
@@ -227,15 +275,54 @@ class QuantumGUI(QWidget):
         self.simulator.load_state(name)
         self.update_bloch()
 
-    def update_bloch(self):
-        theta, phi = self.simulator.get_bloch_coordinates()
-
-        state_vector = np.array([np.cos(theta/2), np.sin(theta/2) * np.exp(1j * phi)])
-        state_qobj = Qobj(state_vector)
-
-        self.bloch.clear()
-        self.bloch.add_states(state_qobj)
+    def _ensure_bloch(self):
+        # qutip pulls in scipy and matplotlib, so it is only imported when the
+        # sphere is first drawn rather than when this module is imported.
+        # If the user closed the Bloch window, it is rebuilt on the next draw.
+        import matplotlib.pyplot as plt
+        if self.bloch is not None and plt.fignum_exists(self.bloch.fig.number):
+            return
+        from qutip import Bloch
+        self.bloch = Bloch()
         self.bloch.show()
+        self._init_state_artists()
+
+    def _init_state_artists(self):
+        # The sphere, axes and labels are drawn once by Bloch.show(); afterwards only
+        # these two line artists are updated in place.
+        axes = self.bloch.axes
+        color = self.bloch.vector_default_color[0]
+        self._trail_line, = axes.plot([], [], [], color=color, alpha=0.4, linewidth=1.5)
+        self._arrow_line, = axes.plot([0, 0], [0, 0], [0, 0], color=color,
+                                      linewidth=self.bloch.vector_width, marker="o",
+                                      markevery=[1])
+
+    def update_bloch(self):
+        """
+        Schedules a repaint of the Bloch sphere.
+        Any number of calls within one frame result in a single repaint.
+        """
+        # Any other action cancels a running animation and shows the current state.
+        self._animation_timer.stop()
+        self._render_pending = True
+        if not self._render_timer.isActive():
+            self._render_timer.start()
+
+    def _render_frame(self):
+        if not self._render_pending:
+            return
+        self._render_pending = False
+        x, y, z = self.simulator.get_bloch_cartesian()
+        self._trail.append((x, y, z))
+        self._draw_state(x, y, z)
+
+    def _draw_state(self, x, y, z):
+        self._ensure_bloch()
+        # qutip's Bloch view maps the physical (x, y, z) axes onto matplotlib's (y, -x, z).
+        self._arrow_line.set_data_3d([0, y], [0, -x], [0, z])
+        trail = np.array(self._trail)
+        self._trail_line.set_data_3d(trail[:, 1], -trail[:, 0], trail[:, 2])
+        self.bloch.fig.canvas.draw_idle()
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
@@ -0,0 +1,11 @@
+"""
+Entry point for ``python -m backend``; runs the headless gate-script CLI (see cli.py).
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cli import main  # noqa: E402
+
+sys.exit(main())
@@ -0,0 +1,286 @@
+"""
+Headless asyncio HTTP/JSON API around QuantumSimulator.
+
+Every request is a JSON object POSTed to /<operation>; the session is selected with the
+X-Session-Id header (default "default") and each session is an independent
+SimulatorSession from a SessionManager. Connections are HTTP/1.1 keep-alive and requests
+may be pipelined: they are processed in order and answered in order.
+
+Operations:
+    POST /apply_gate     {"gate_name": "rotation_x", "kwargs": {"theta": 1.57}}
+    POST /apply_circuit  {"circuit": [["hadamard", {}], ["t", {}]]}
+    POST /reset          {"preset": "plus"}
+    POST /undo, /redo    {}
+    POST /save_state     {"name": "psi"}             -> {"result": "psi_1"}
+    POST /load_state     {"name": "psi"}
+    GET  /bloch                                      -> {"result": [theta, phi]}
+    POST /batch          {"ops": [{"op": "apply_gate", "gate_name": "hadamard"}, ...]}
+
+Every successful response is {"ok": true, "result": ..., "bloch": [theta, phi]}; failures are
+{"ok": false, "error": "..."} with a 4xx status, or 503 when every session slot is in use.
+A batch is checked as a whole before it runs; if an operation still fails part-way, the
+error response also carries "applied", the number of operations that took effect.
+Sessions idle for longer than the manager's idle_timeout are evicted in the background.
+
+Usage: python api_server.py [--host 127.0.0.1] [--port 8765]
+"""
+import argparse
+import asyncio
+import json
+
+from quantum_gates import resolve_gate
+from qubit_state import PRESETS
+from session_manager import SessionManager
+from state_history import HistoryFullError
+
+DEFAULT_SESSION = "default"
+MAX_BODY_BYTES = 16 * 1024 * 1024
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large", 503: "Service Unavailable"}
+
+# Operation -> {field: (expected type, required)}; bodies are checked before dispatch.
+BODY_FIELDS = {
+    "apply_gate": {"gate_name": (str, True), "kwargs": (dict, False)},
+    "apply_circuit": {"circuit": (list, True)},
+    "reset": {"preset": (str, False)},
+    "save_state": {"name": (str, True)},
+    "load_state": {"name": (str, True)},
+}
+
+
+class ApiError(Exception):
+    def __init__(self, status, message, applied=None):
+        """
+        :param applied: For a failed batch, how many of its operations ran before the failure.
+        """
+        super().__init__(message)
+        self.status = status
+        self.applied = applied
+
+
+def _load_state(sim, body):
+    name = body["name"]
+    if name not in sim.saved_states:
+        raise ApiError(404, f"No saved state named '{name}'")
+    sim.load_state(name)
+
+
+def _save_state(sim, body):
+    if not body["name"]:
+        raise ApiError(400, "save_state requires a non-empty 'name'.")
+    sim.save_state(body["name"])
+    return sim.last_state_name
+
+
+def _check_body(sim, op, body):
+    for field, (expected, required) in BODY_FIELDS.get(op, {}).items():
+        if field not in body:
+            if required:
+                raise ApiError(400, f"{op} requires a '{field}'.")
+        elif not isinstance(body[field], expected):
+            raise ApiError(400, f"{op}: '{field}' must be a {expected.__name__}.")
+    if op == "apply_circuit":
+        for entry in body["circuit"]:
+            if not (isinstance(entry, str) or (isinstance(entry, list) and len(entry) == 2
+                                               and isinstance(entry[0], str) and isinstance(entry[1], dict))):
+                raise ApiError(400, "apply_circuit entries must be gate names or [gate_name, kwargs] pairs.")
+    # Resolve gates and presets up front so a bad one fails before anything is applied.
+    try:
+        if op == "apply_gate":
+            resolve_gate(body["gate_name"], **body.get("kwargs", {}))
+        elif op == "apply_circuit":
+            sim.compile_circuit(body["circuit"])
+        elif op == "reset" and body.get("preset", "zero") not in PRESETS:
+            raise ValueError(f"Unknown preset {body['preset']}")
+    except (TypeError, ValueError) as e:
+        raise ApiError(400, f"{op} failed: {e}")
+
+
+OPERATIONS = {
+    "apply_gate": lambda sim, body: sim.apply_gate(body["gate_name"], **body.get("kwargs", {})),
+    "apply_circuit": lambda sim, body: sim.apply_circuit(body["circuit"]),
+    "reset": lambda sim, body: sim.reset(body.get("preset", "zero")),
+    "undo": lambda sim, body: sim.undo(),
+    "redo": lambda sim, body: sim.redo(),
+    "save_state": _save_state,
+    "load_state": _load_state,
+    "bloch": lambda sim, body: None,
+}
+
+
+def _prepare(sim, op, body):
+    handler = OPERATIONS.get(op) if isinstance(op, str) else None
+    if handler is None:
+        raise ApiError(404, f"Unknown operation: {op}")
+    _check_body(sim, op, body)
+    return handler
+
+
+def _call(handler, sim, op, body):
+    try:
+        return handler(sim, body)
+    except ApiError:
+        raise
+    except HistoryFullError as e:
+        raise ApiError(400, f"{op} failed, history is full: {e}")
+    except Exception as e:
+        raise ApiError(400, f"{op} failed: {e}")
+
+
+def run_operation(sim, op, body):
+    """
+    Runs one named operation against a session.
+    A batch is validated as a whole before any of its operations runs; if one still fails
+    while running, the ApiError carries how many operations were applied before it.
+    :return: The operation's JSON-serializable result (or None).
+    :raises ApiError: For unknown operations or invalid arguments.
+    """
+    if op == "batch":
+        ops = body.get("ops")
+        if not isinstance(ops, list) or not all(isinstance(item, dict) for item in ops):
+            raise ApiError(400, "batch requires an 'ops' list of objects.")
+        handlers = [_prepare(sim, item.get("op"), item) for item in ops]
+        results = []
+        for handler, item in zip(handlers, ops):
+            try:
+                results.append(_call(handler, sim, item["op"], item))
+            except ApiError as e:
+                e.applied = len(results)
+                raise
+        return results
+    return _call(_prepare(sim, op, body), sim, op, body)
+
+
+class ApiServer:
+    def __init__(self, manager=None, evict_interval=None):
+        """
+        :param manager: The SessionManager to serve; a new one is created if omitted.
+        :param evict_interval: Seconds between idle-session sweeps; defaults to a quarter of
+            the manager's idle_timeout.
+        """
+        self.manager = manager if manager is not None else SessionManager()
+        self.evict_interval = evict_interval if evict_interval is not None else self.manager.idle_timeout / 4
+        self._evictor = None
+
+    def handle(self, path, headers, payload):
+        """
+        Handles one parsed HTTP request.
+        :return: A (status, response dict) pair.
+        """
+        try:
+            try:
+                body = json.loads(payload) if payload else {}
+            except ValueError as e:
+                raise ApiError(400, f"Invalid JSON: {e}")
+            if not isinstance(body, dict):
+                raise ApiError(400, "Request body must be a JSON object.")
+            op = path.strip("/").split("?", 1)[0]
+            session_id = headers.get("x-session-id", DEFAULT_SESSION)
+            try:
+                with self.manager.session(session_id) as sim:
+                    result = run_operation(sim, op, body)
+                    theta, phi = sim.get_bloch_coordinates()
+            except RuntimeError as e:
+                # run_operation reports its own failures as ApiError, so this is the manager being full.
+                raise ApiError(503, str(e))
+            return 200, {"ok": True, "result": result, "bloch": [float(theta), float(phi)]}
+        except ApiError as e:
+            response = {"ok": False, "error": str(e)}
+            if e.applied is not None:
+                response["applied"] = e.applied
+            return e.status, response
+        except Exception as e:
+            return 400, {"ok": False, "error": f"Invalid request: {e}"}
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    _, path, _ = request_line.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    # Without a usable length the rest of the stream cannot be framed.
+                    status, response = 400, {"ok": False, "error": "Invalid Content-Length header."}
+                    keep_alive = False
+                elif length > MAX_BODY_BYTES:
+                    status, response = 413, {"ok": False, "error": "Request body too large."}
+                    keep_alive = False
+                else:
+                    payload = await reader.readexactly(length) if length else b""
+                    status, response = self.handle(path, headers, payload)
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(_encode_response(status, response, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=8765):
+        """
+        Starts listening and returns the asyncio.Server (port 0 picks a free port).
+        Also starts the background task that evicts idle sessions.
+        """
+        if self._evictor is None or self._evictor.done():
+            self._evictor = asyncio.ensure_future(self._evict_idle_sessions())
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    def close(self):
+        """
+        Stops the idle-session eviction task.
+        """
+        if self._evictor is not None:
+            self._evictor.cancel()
+            self._evictor = None
+
+    async def _evict_idle_sessions(self):
+        while True:
+            await asyncio.sleep(self.evict_interval)
+            self.manager.evict_idle()
+
+
+def _encode_response(status, response, keep_alive):
+    body = json.dumps(response).encode("utf-8")
+    head = (f"HTTP/1.1 {status} {REASONS.get(status, 'Error')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+
+async def serve(host, port):
+    server = await ApiServer().start(host, port)
+    print(f"Serving on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
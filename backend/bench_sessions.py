@@ -0,0 +1,68 @@
+"""
+Contention benchmark for SessionManager.
+
+Runs the same workload -- every worker thread applying gates on behalf of many users --
+twice: once with every user funnelled through the process-wide QuantumSimulator behind
+one global lock, and once with a SimulatorSession per user from a SessionManager.
+
+Usage: python bench_sessions.py [--threads 8] [--users 64] [--ops 20000]
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from quantum_simulator import QuantumSimulator
+from session_manager import SessionManager
+
+GATES = ["hadamard", "pauli_x", "t", "phase", "pauli_z"]
+
+
+def _run(threads, users, ops, work):
+    per_thread = ops // threads
+
+    def worker(thread_index):
+        for i in range(per_thread):
+            work(f"user{(thread_index * per_thread + i) % users}", GATES[i % len(GATES)])
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(worker, range(threads)))
+    return per_thread * threads / (time.perf_counter() - start)
+
+
+def bench_singleton(threads, users, ops):
+    simulator = QuantumSimulator()
+    global_lock = threading.Lock()
+
+    def work(user, gate):
+        with global_lock:
+            simulator.apply_gate(gate)
+
+    return _run(threads, users, ops, work)
+
+
+def bench_sessions(threads, users, ops):
+    manager = SessionManager(max_sessions=users)
+
+    def work(user, gate):
+        with manager.session(user) as sim:
+            sim.apply_gate(gate)
+
+    return _run(threads, users, ops, work)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--users", type=int, default=64)
+    parser.add_argument("--ops", type=int, default=20000)
+    args = parser.parse_args()
+    for name, bench in (("singleton + global lock", bench_singleton),
+                        ("per-user sessions", bench_sessions)):
+        rate = bench(args.threads, args.users, args.ops)
+        print(f"{name:<26} {rate:>12,.0f} ops/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Performance benchmarks for the gate, state and simulator hot paths.
+
+Micro benchmarks time a single call (best of several repeats) and report seconds per call.
+Macro benchmarks run whole scenarios -- long scripted sessions, undo/redo storms, bulk
+save/load -- and report seconds per operation. Results are written as JSON and can be
+compared against a stored baseline:
+
+    python benchmarks.py run --output baseline.json
+    python benchmarks.py run --output current.json
+    python benchmarks.py compare baseline.json current.json --threshold 0.2
+
+compare exits with status 1 if any benchmark is slower than the baseline by more than
+the threshold (0.2 = 20%). --scale shrinks or grows the macro scenarios, e.g. --scale 0.01
+for a quick smoke run.
+"""
+import argparse
+import itertools
+import json
+import platform
+import sys
+import time
+import timeit
+
+import numpy as np
+
+from density_matrix import DensityMatrixBatch, NoiseChannels
+from quantum_gates import QuantumGates
+from qubit_state import QubitState
+from session_manager import SimulatorSession
+
+BENCHMARKS = {}  # name -> (kind, setup function)
+MICRO_REPEAT = 5
+MICRO_TARGET_SECONDS = 0.05  # Approximate duration of one micro repeat at scale 1
+
+
+def benchmark(name, kind="micro"):
+    """
+    Registers a benchmark.
+    Micro benchmark functions return the callable to time; macro benchmark functions take the
+    scale, run the scenario themselves and return the number of operations performed.
+    """
+    def register(func):
+        BENCHMARKS[name] = (kind, func)
+        return func
+    return register
+
+
+# --- Micro benchmarks -------------------------------------------------------
+
+@benchmark("qubit_state.apply_gate")
+def _qubit_apply_gate():
+    qubit, gate = QubitState(), QuantumGates.hadamard()
+    return lambda: qubit.apply_gate(gate)
+
+
+@benchmark("qubit_state.get_bloch_vector")
+def _qubit_bloch_vector():
+    qubit = QubitState(1, 1j)
+    return qubit.get_bloch_vector
+
+
+for _name in ("identity", "pauli_x", "pauli_y", "pauli_z", "hadamard", "phase", "t_gate"):
+    benchmark(f"quantum_gates.{_name}")(lambda _name=_name: getattr(QuantumGates, _name))
+
+
+@benchmark("quantum_gates.rotation_x.cached")
+def _rotation_cached():
+    return lambda: QuantumGates.rotation_x(0.5)
+
+
+@benchmark("quantum_gates.rotation_x.uncached")
+def _rotation_uncached():
+    # Every call uses a fresh angle, so each lookup misses the rotation cache.
+    angles = (i * 1e-6 for i in itertools.count())
+    return lambda: QuantumGates.rotation_x(next(angles))
+
+
+@benchmark("quantum_gates.custom_gate")
+def _custom_gate():
+    matrix = [[0, 1], [1, 0]]
+    return lambda: QuantumGates.custom_gate(matrix)
+
+
+@benchmark("quantum_simulator.apply_gate")
+def _simulator_apply_gate():
+    sim = SimulatorSession()
+    return lambda: sim.apply_gate("hadamard")
+
+
+@benchmark("quantum_simulator.apply_gate.rotation")
+def _simulator_apply_rotation():
+    sim = SimulatorSession()
+    return lambda: sim.apply_gate("rotation_x", theta=0.3)
+
+
+# --- Macro benchmarks -------------------------------------------------------
+
+SESSION_GATES = [("hadamard", {}), ("t", {}), ("rotation_x", {"theta": 0.1}),
+                 ("phase", {}), ("rotation_z", {"theta": 0.7})]
+
+
+@benchmark("scenario.scripted_session_1m_gates", kind="macro")
+def _scripted_session(scale):
+    sim = SimulatorSession()
+    count = max(1, int(1_000_000 * scale))
+    for i in range(count):
+        name, kwargs = SESSION_GATES[i % len(SESSION_GATES)]
+        sim.apply_gate(name, **kwargs)
+    return count
+
+
+@benchmark("scenario.undo_redo_storm", kind="macro")
+def _undo_redo_storm(scale):
+    sim = SimulatorSession(history_capacity=10_001)
+    depth = max(1, int(10_000 * min(scale, 1)))
+    rounds = max(1, int(20 * scale))
+    for _ in range(depth):
+        sim.apply_gate("hadamard")
+    for _ in range(rounds):
+        for _ in range(depth):
+            sim.undo()
+        for _ in range(depth):
+            sim.redo()
+    return 2 * depth * rounds
+
+
+@benchmark("scenario.save_load_named_states", kind="macro")
+def _save_load_states(scale):
+    sim = SimulatorSession()
+    count = max(1, int(100_000 * scale))
+    for i in range(count):
+        sim.save_state(f"state{i % 100}")
+    for name in sim.saved_states.names():
+        sim.load_state(name)
+    return 2 * count
+
+
+@benchmark("scenario.density_matrix_ensemble_1m", kind="macro")
+def _density_matrix_ensemble(scale):
+    # One rotation, a T1/T2 channel, a depolarizing channel and a Bloch readout per qubit.
+    count = max(1, int(1_000_000 * scale))
+    batch = DensityMatrixBatch(count)
+    batch.apply_gate(QuantumGates.rotation_y(1.0))
+    batch.apply_channel(NoiseChannels.thermal_relaxation(0.1, 50.0, 70.0))
+    batch.apply_channel(NoiseChannels.depolarizing(0.01))
+    batch.get_bloch_cartesian()
+    return count
+
+
+# --- Runner -----------------------------------------------------------------
+
+def _run_micro(func, scale):
+    target = func()
+    # Calibrate so one repeat takes roughly MICRO_TARGET_SECONDS * scale.
+    number, elapsed = 1, 0.0
+    while elapsed < 0.005:
+        number *= 10
+        elapsed = timeit.timeit(target, number=number)
+    number = max(1, int(number * MICRO_TARGET_SECONDS * scale / elapsed))
+    best = min(timeit.repeat(target, number=number, repeat=MICRO_REPEAT))
+    return best / number, number * MICRO_REPEAT
+
+
+def _run_macro(func, scale):
+    start = time.perf_counter()
+    ops = func(scale)
+    return (time.perf_counter() - start) / ops, ops
+
+
+def run_benchmarks(scale=1.0, pattern=None):
+    """
+    Runs every registered benchmark whose name contains pattern.
+    :return: A JSON-serializable dict with "meta" and "results" entries.
+    """
+    results = {}
+    for name, (kind, func) in BENCHMARKS.items():
+        if pattern and pattern not in name:
+            continue
+        runner = _run_micro if kind == "micro" else _run_macro
+        seconds_per_op, ops = runner(func, scale)
+        results[name] = {"kind": kind, "seconds_per_op": seconds_per_op,
+                         "ops_per_sec": 1 / seconds_per_op, "ops": ops}
+    meta = {"python": platform.python_version(), "numpy": np.__version__,
+            "platform": platform.platform(), "timestamp": time.time(), "scale": scale}
+    return {"meta": meta, "results": results}
+
+
+def compare_results(baseline, current, threshold=0.2):
+    """
+    Compares two run_benchmarks outputs.
+    :param threshold: Allowed relative slowdown before a benchmark counts as a regression.
+    :return: A list of (name, baseline s/op, current s/op, ratio, regressed) tuples for the
+        benchmarks present in both runs.
+    """
+    rows = []
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        before = baseline["results"][name]["seconds_per_op"]
+        after = result["seconds_per_op"]
+        ratio = after / before
+        rows.append((name, before, after, ratio, ratio > 1 + threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="Run the benchmarks and emit JSON.")
+    run.add_argument("--output", help="File to write the JSON results to (default: stdout).")
+    run.add_argument("--scale", type=float, default=1.0)
+    run.add_argument("--filter", help="Only run benchmarks whose name contains this text.")
+    compare = commands.add_parser("compare", help="Compare a run against a baseline.")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        report = run_benchmarks(args.scale, args.filter)
+        text = json.dumps(report, indent=2)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(text)
+            for name, result in report["results"].items():
+                print(f"{name:<45} {result['seconds_per_op'] * 1e6:>12.3f} us/op", file=sys.stderr)
+        else:
+            print(text)
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+    rows = compare_results(baseline, current, args.threshold)
+    for name, before, after, ratio, regressed in rows:
+        flag = "REGRESSION" if regressed else ""
+        print(f"{name:<45} {before * 1e6:>10.3f} -> {after * 1e6:>10.3f} us/op  x{ratio:5.2f} {flag}")
+    return 1 if any(row[4] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+import numpy as np
+
+from qubit_state import PRESETS, QubitState
+from quantum_gates import GATE_REGISTRY, _constant, registry_generation, resolve_gate
+
+PAULI_MATRICES = np.array([[[0, 1], [1, 0]],
+                           [[0, -1j], [1j, 0]],
+                           [[1, 0], [0, -1]]], dtype=complex)
+
+
+def su2_to_so3(gate_matrix):
+    """
+    Converts a 2x2 unitary (or an (..., 2, 2) stack) into the 3x3 real rotation it induces
+    on the Bloch sphere: R[i, j] = tr(sigma_i U sigma_j U^dagger) / 2. Global phase drops out.
+    """
+    gate_matrix = np.asarray(gate_matrix, dtype=complex)
+    conjugated = np.einsum("...ab,jbc,...dc->...jad", gate_matrix, PAULI_MATRICES, gate_matrix.conj())
+    return np.einsum("iba,...jab->...ij", PAULI_MATRICES, conjugated).real / 2
+
+
+# Registered gates that take no parameters; their rotations are computed once per registry generation.
+SO3_GATE_NAMES = ("identity", "pauli_x", "pauli_y", "pauli_z", "hadamard", "phase", "t")
+_so3_gates = {}  # gate name -> read-only 3x3 rotation
+_so3_generation = None
+
+
+def so3_gate(gate_name, **kwargs):
+    """
+    Returns the 3x3 rotation for a named gate, using the precomputed table when possible.
+    The table is rebuilt whenever a gate name is rebound (see quantum_gates.registry_generation).
+    :raises ValueError: If the gate name is unknown.
+    """
+    global _so3_gates, _so3_generation
+    if _so3_generation != registry_generation():
+        _so3_gates = {name: _constant(su2_to_so3(resolve_gate(name)), dtype=float)
+                      for name in SO3_GATE_NAMES if name in GATE_REGISTRY}
+        _so3_generation = registry_generation()
+    rotation = _so3_gates.get(gate_name.lower())
+    if rotation is None:
+        rotation = su2_to_so3(resolve_gate(gate_name, **kwargs))
+    return rotation
+
+
+class BlochVectorState:
+    """
+    A pure single-qubit state stored directly as its real Cartesian Bloch vector (x, y, z).
+
+    Gates act as 3x3 real rotation matrices, so applying gates and reading the Cartesian
+    coordinates involve no complex arithmetic or trigonometry. The representation drops
+    the global phase, which has no physical meaning; conversion to and from QubitState is
+    otherwise exact.
+    """
+
+    def __init__(self, x=0.0, y=0.0, z=1.0):
+        self.vector = np.array([x, y, z], dtype=float)
+        self.normalize()
+
+    @classmethod
+    def from_qubit_state(cls, qubit):
+        return cls(*qubit.get_bloch_cartesian())
+
+    def to_qubit_state(self):
+        """
+        :return: A QubitState with a real, non-negative alpha and the same Bloch vector.
+        """
+        x, y, z = self.vector
+        if z > -1 + 1e-15:
+            alpha = np.sqrt((1 + z) / 2)
+            beta = (x + 1j*y) / (2 * alpha)
+        else:
+            alpha, beta = 0.0, 1.0
+        return QubitState(complex(alpha), complex(beta))
+
+    def normalize(self):
+        norm = np.sqrt(self.vector @ self.vector)
+        if norm == 0:
+            raise ValueError("Bloch vector has zero length!")
+        self.vector /= norm
+
+    def apply_rotation(self, rotation):
+        self.vector = rotation @ self.vector
+
+    def apply_gate(self, gate_matrix):
+        """
+        :param gate_matrix: A 3x3 rotation (applied directly) or a 2x2 unitary (converted first).
+        """
+        gate_matrix = np.asarray(gate_matrix)
+        if gate_matrix.shape == (2, 2):
+            gate_matrix = su2_to_so3(gate_matrix)
+        self.apply_rotation(gate_matrix)
+
+    def apply_named_gate(self, gate_name, **kwargs):
+        self.apply_rotation(so3_gate(gate_name, **kwargs))
+
+    def set_preset(self, preset_name):
+        if preset_name not in PRESETS:
+            raise ValueError(f"Unknown preset {preset_name}")
+        self.vector = np.array(QubitState(*PRESETS[preset_name]).get_bloch_cartesian(), dtype=float)
+
+    def get_bloch_cartesian(self):
+        x, y, z = self.vector
+        return x, y, z
+
+    def get_bloch_vector(self):
+        """
+        :return: (theta, phi) with phi in (-pi, pi]. Only computed on request.
+        """
+        x, y, z = self.vector
+        return np.arccos(np.clip(z, -1.0, 1.0)), np.arctan2(y, x)
+
+    def get_state_vector(self):
+        return self.to_qubit_state().get_state_vector()
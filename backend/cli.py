@@ -0,0 +1,149 @@
+"""
+Headless command-line runner for gate scripts.
+
+A script holds one operation per line (or several separated by ";"); blank lines and
+text after "#" are ignored:
+
+    reset plus
+    hadamard
+    rotation_x theta=1.5708
+    custom matrix=[[0,1],[1,0]]
+    save checkpoint_a
+    undo
+    redo
+    load checkpoint_a
+
+Gate lines are a gate name followed by key=value arguments (values are parsed as JSON,
+so numbers and nested lists work, but a value must not contain spaces). After the script
+has run, the final state vector and Bloch coordinates are printed.
+
+This module only depends on the NumPy simulator core and never imports Qt, qutip or
+matplotlib, so it starts quickly on machines without a display.
+
+Usage: python -m cli SCRIPT [--json]          (from backend/)
+       python -m backend SCRIPT [--json]      (from the repository root)
+       python -m cli -e "hadamard; t" [--json]
+"""
+import argparse
+import json
+import sys
+
+from quantum_simulator import QuantumSimulator
+
+CONTROL_COMMANDS = {
+    "reset": lambda sim, args: sim.reset(*args),
+    "undo": lambda sim, args: sim.undo(),
+    "redo": lambda sim, args: sim.redo(),
+    "save": lambda sim, args: sim.save_state(*args),
+    "load": lambda sim, args: sim.load_state(*args),
+}
+
+
+def _parse_value(text):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def parse_line(line):
+    """
+    Parses one script line into (command, positional args, keyword args), or None if empty.
+    """
+    line = line.split("#", 1)[0].strip()
+    if not line:
+        return None
+    command, *tokens = line.split()
+    args, kwargs = [], {}
+    for token in tokens:
+        key, sep, value = token.partition("=")
+        if sep:
+            kwargs[key] = _parse_value(value)
+        else:
+            args.append(token)
+    return command.lower(), args, kwargs
+
+
+def iter_script(lines):
+    """
+    Yields parsed operations from an iterable of script lines.
+    """
+    for number, line in enumerate(lines, start=1):
+        for part in line.split(";"):
+            try:
+                parsed = parse_line(part)
+            except ValueError as e:
+                raise ValueError(f"Line {number}: {e}")
+            if parsed is not None:
+                yield number, parsed
+
+
+def run_script(lines, simulator=None):
+    """
+    Runs a gate script against a simulator.
+    :param lines: Iterable of script lines.
+    :param simulator: The simulator to drive (defaults to the QuantumSimulator singleton).
+    :return: The simulator after the script has run.
+    :raises ValueError: If a line names an unknown gate or has invalid arguments.
+    """
+    sim = simulator if simulator is not None else QuantumSimulator()
+    for number, (command, args, kwargs) in iter_script(lines):
+        try:
+            if command in CONTROL_COMMANDS:
+                CONTROL_COMMANDS[command](sim, args)
+            else:
+                sim.apply_gate(command, **kwargs)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Line {number} ({command}): {e}")
+    return sim
+
+
+def _summary(sim):
+    alpha, beta = sim.get_state_vector()
+    theta, phi = sim.get_bloch_coordinates()
+    x, y, z = sim.get_bloch_cartesian()
+    return {
+        "state": [[alpha.real, alpha.imag], [beta.real, beta.imag]],
+        "bloch": {"theta": float(theta), "phi": float(phi)},
+        "cartesian": [float(x), float(y), float(z)],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="cli", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("script", nargs="?", help="Path to a gate script, or - for stdin.")
+    parser.add_argument("-e", "--execute", help="Run the given script text instead of a file.")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON.")
+    args = parser.parse_args(argv)
+
+    if args.execute is not None:
+        lines = args.execute.splitlines()
+    elif args.script in (None, "-"):
+        lines = sys.stdin
+    else:
+        try:
+            with open(args.script, encoding="utf-8") as f:
+                lines = f.readlines()
+        except OSError as e:
+            print(f"error: cannot read {args.script}: {e.strerror}", file=sys.stderr)
+            return 1
+    try:
+        sim = run_script(lines)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    summary = _summary(sim)
+    if args.json:
+        print(json.dumps(summary))
+    else:
+        (ar, ai), (br, bi) = summary["state"]
+        print(f"state:     alpha = {complex(ar, ai):.6f}, beta = {complex(br, bi):.6f}")
+        print(f"bloch:     theta = {summary['bloch']['theta']:.6f}, phi = {summary['bloch']['phi']:.6f}")
+        print("cartesian: x = {:.6f}, y = {:.6f}, z = {:.6f}".format(*summary["cartesian"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
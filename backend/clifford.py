@@ -0,0 +1,163 @@
+import numpy as np
+
+from qubit_state import PRESETS, QubitState
+from quantum_gates import HADAMARD, IDENTITY, PAULI_X, PAULI_Y, PAULI_Z, PHASE, _constant
+
+N_CLIFFORDS = 24
+
+
+def _canonical(matrix):
+    """
+    Removes the global phase of a 2x2 unitary so equal gates compare equal: the first
+    non-zero entry (in row-major order) is made real and positive.
+    """
+    flat = matrix.ravel()
+    pivot = flat[np.flatnonzero(np.abs(flat) > 1e-9)[0]]
+    return matrix * (abs(pivot) / pivot)
+
+
+def _key(matrix):
+    return tuple(np.round(_canonical(matrix), 9).ravel() + 0.0)  # + 0.0 folds -0.0 into 0.0
+
+
+def _generate():
+    # Breadth-first closure of {I} under right-multiplication by H and S, modulo global phase.
+    matrices, index = [IDENTITY], {_key(IDENTITY): 0}
+    for matrix in matrices:
+        for generator in (HADAMARD, PHASE):
+            product = _canonical(generator @ matrix)
+            key = _key(product)
+            if key not in index:
+                index[key] = len(matrices)
+                matrices.append(product)
+    return _constant(matrices), index
+
+
+CLIFFORD_MATRICES, _CLIFFORD_INDEX = _generate()
+assert len(CLIFFORD_MATRICES) == N_CLIFFORDS
+
+
+def clifford_index(gate_matrix):
+    """
+    :param gate_matrix: A 2x2 unitary.
+    :return: The integer (0-23) of the Clifford equal to gate_matrix up to global phase.
+    :raises ValueError: If the matrix is not a single-qubit Clifford.
+    """
+    index = _CLIFFORD_INDEX.get(_key(np.asarray(gate_matrix, dtype=complex)))
+    if index is None:
+        raise ValueError("Gate is not a single-qubit Clifford.")
+    return index
+
+
+# COMPOSE[first, second] is the Clifford for applying first, then second (matrix second @ first).
+COMPOSE = _constant([[clifford_index(CLIFFORD_MATRICES[second] @ CLIFFORD_MATRICES[first])
+                      for second in range(N_CLIFFORDS)] for first in range(N_CLIFFORDS)], dtype=np.uint8)
+INVERSE = _constant(np.argmax(COMPOSE == 0, axis=1), dtype=np.uint8)
+
+# Registered gate names that are Cliffords -> their integer index.
+CLIFFORD_GATES = {name: clifford_index(matrix) for name, matrix in [
+    ("identity", IDENTITY), ("pauli_x", PAULI_X), ("pauli_y", PAULI_Y), ("pauli_z", PAULI_Z),
+    ("hadamard", HADAMARD), ("phase", PHASE)]}
+
+
+def gate_indices(gate_names):
+    """
+    Maps gate names to Clifford indices.
+    :raises ValueError: If a name is not one of CLIFFORD_GATES.
+    """
+    try:
+        return np.array([CLIFFORD_GATES[name.lower()] for name in gate_names], dtype=np.uint8)
+    except KeyError as e:
+        raise ValueError(f"Gate {e.args[0]} is not a Clifford gate.")
+
+
+def reduce_sequences(sequences):
+    """
+    Composes Clifford sequences into single Cliffords with a pairwise tree reduction,
+    so a length-L sequence costs log2(L) vectorized table lookups.
+    :param sequences: Integer array of shape (..., L), in application order.
+    :return: Integer array of shape (...) holding the composed Clifford of each sequence.
+    """
+    sequences = np.asarray(sequences, dtype=np.uint8)
+    if sequences.shape[-1] == 0:
+        return np.zeros(sequences.shape[:-1], dtype=np.uint8)
+    while sequences.shape[-1] > 1:
+        if sequences.shape[-1] % 2:
+            last = sequences[..., -1:]
+            sequences = sequences[..., :-1]
+        else:
+            last = None
+        sequences = COMPOSE[sequences[..., 0::2], sequences[..., 1::2]]
+        if last is not None:
+            sequences = np.concatenate([sequences, last], axis=-1)
+    return sequences[..., 0]
+
+
+def random_rb_sequences(n_sequences, length, rng=None):
+    """
+    Draws randomized-benchmarking sequences: length uniformly random Cliffords followed by
+    the recovery Clifford that inverts them, so every sequence composes to the identity.
+    :param n_sequences: Number of sequences.
+    :param length: Number of random Cliffords per sequence, before the recovery gate.
+    :param rng: A numpy Generator (or seed); defaults to a fresh unseeded generator.
+    :return: Integer array of shape (n_sequences, length + 1).
+    """
+    rng = np.random.default_rng(rng)
+    sequences = np.empty((n_sequences, length + 1), dtype=np.uint8)
+    sequences[:, :length] = rng.integers(0, N_CLIFFORDS, size=(n_sequences, length), dtype=np.uint8)
+    sequences[:, length] = INVERSE[reduce_sequences(sequences[:, :length])]
+    return sequences
+
+
+class CliffordState:
+    """
+    A qubit that has only seen Clifford gates, stored as its initial state plus the integer
+    index of the accumulated Clifford. Applying a gate is one table lookup; the amplitudes
+    are only computed when the state is read. Readouts are exact up to the global phase.
+    """
+
+    def __init__(self, alpha=1+0j, beta=0+0j):
+        self.initial = QubitState(alpha, beta).get_state_vector()
+        self.clifford = 0
+
+    def apply_index(self, index):
+        self.clifford = int(COMPOSE[self.clifford, index])
+
+    def apply_named_gate(self, gate_name):
+        """
+        :raises ValueError: If the gate is not one of CLIFFORD_GATES.
+        """
+        index = CLIFFORD_GATES.get(gate_name.lower())
+        if index is None:
+            raise ValueError(f"Gate '{gate_name}' is not a Clifford gate.")
+        self.clifford = int(COMPOSE[self.clifford, index])
+
+    def apply_gate(self, gate_matrix):
+        """
+        :raises ValueError: If the matrix is not a Clifford.
+        """
+        self.apply_index(clifford_index(gate_matrix))
+
+    def apply_sequence(self, indices):
+        self.apply_index(reduce_sequences(indices))
+
+    def set_state(self, alpha, beta):
+        self.initial = QubitState(alpha, beta).get_state_vector()
+        self.clifford = 0
+
+    def set_preset(self, preset_name):
+        if preset_name not in PRESETS:
+            raise ValueError(f"Unknown preset {preset_name}")
+        self.set_state(*PRESETS[preset_name])
+
+    def to_qubit_state(self):
+        return QubitState(*(CLIFFORD_MATRICES[self.clifford] @ self.initial))
+
+    def get_state_vector(self):
+        return self.to_qubit_state().get_state_vector()
+
+    def get_bloch_vector(self):
+        return self.to_qubit_state().get_bloch_vector()
+
+    def get_bloch_cartesian(self):
+        return self.to_qubit_state().get_bloch_cartesian()
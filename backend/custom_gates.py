@@ -0,0 +1,188 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from quantum_gates import GATE_REGISTRY, _constant, register_gate, unregister_gate
+from state_library import save_array_atomic, write_json_atomic
+
+GATES_FILE = "gates.npy"
+INDEX_FILE = "index.json"
+FINGERPRINT_DECIMALS = 12  # Entries are rounded before hashing so float noise maps to one fingerprint
+UNITARY_ATOL = 1e-8
+
+
+def fingerprint(matrix):
+    """
+    Computes a content hash for a 2x2 gate matrix.
+    :param matrix: A 2x2 complex matrix.
+    :return: A 16-character hex string; equal matrices (to FINGERPRINT_DECIMALS) share it.
+    """
+    rounded = np.round(np.asarray(matrix, dtype=complex), FINGERPRINT_DECIMALS) + 0.0  # folds -0.0 into 0.0
+    return hashlib.blake2b(np.ascontiguousarray(rounded).tobytes(), digest_size=8).hexdigest()
+
+
+def validate_unitaries(matrices):
+    """
+    Checks a whole stack of candidate gate matrices for unitarity in one batched operation.
+    :param matrices: Anything convertible to an (N, 2, 2) complex array.
+    :return: The (N, 2, 2) complex array and a boolean (N,) mask of which matrices are unitary.
+    :raises ValueError: If the input cannot be converted or is not a stack of 2x2 matrices.
+    """
+    try:
+        matrices = np.array(matrices, dtype=complex)
+    except Exception as e:
+        raise ValueError(f"Invalid matrix format: {e}")
+    if matrices.ndim != 3 or matrices.shape[1:] != (2, 2):
+        raise ValueError("Custom gate matrices must be 2x2.")
+    products = np.einsum("nji,njk->nik", matrices.conj(), matrices)
+    valid = np.all(np.abs(products - np.eye(2)) <= UNITARY_ATOL, axis=(1, 2))
+    return matrices, valid
+
+
+class CustomGateRegistry:
+    """
+    Named custom gates that are validated once, then applied by name through apply_gate.
+
+    Each matrix is checked for unitarity when it is registered, stored read-only under its
+    name and content fingerprint, and added to the gate registry with a factory that simply
+    returns the stored matrix. Registering a matrix that is already known (same fingerprint)
+    reuses the existing entry. A registry can be written to a directory holding a gates.npy
+    stack and a JSON index, and reloaded without re-running the validation.
+    """
+
+    def __init__(self):
+        self._matrices = {}  # name -> read-only 2x2 matrix
+        self._fingerprints = {}  # name -> fingerprint
+        self._by_fingerprint = {}  # fingerprint -> name
+
+    def __len__(self):
+        return len(self._matrices)
+
+    def __contains__(self, name):
+        return name.lower() in self._matrices
+
+    def __getitem__(self, name):
+        """
+        :return: The read-only matrix registered under name.
+        :raises KeyError: If there is no custom gate with that name.
+        """
+        return self._matrices[name.lower()]
+
+    def names(self):
+        return list(self._matrices)
+
+    def fingerprint_of(self, name):
+        return self._fingerprints[name.lower()]
+
+    def name_for(self, matrix):
+        """
+        :return: The name under which an equal matrix is registered, or None.
+        """
+        return self._by_fingerprint.get(fingerprint(matrix))
+
+    def register(self, matrix, name=None, overwrite=False):
+        """
+        Validates and registers a single custom gate.
+        :param matrix: A 2x2 unitary matrix.
+        :param name: Gate name; defaults to "custom_<fingerprint>".
+        :param overwrite: Whether an existing custom gate with the same name may be replaced.
+        :return: The name the gate can be applied under.
+        :raises ValueError: If the matrix is not a 2x2 unitary, or the name is taken.
+        """
+        return self.register_many([matrix], None if name is None else [name], overwrite)[0]
+
+    def register_many(self, matrices, names=None, overwrite=False):
+        """
+        Validates a batch of custom gates in one check and registers all of them.
+        Nothing is registered if any matrix is invalid, a name is taken, or one name is given
+        two different matrices within the batch.
+        :param matrices: A sequence or (N, 2, 2) array of unitary matrices.
+        :param names: Optional gate names, one per matrix; default to "custom_<fingerprint>".
+        :param overwrite: Whether existing custom gates with the same names may be replaced.
+        :return: The list of names the gates can be applied under.
+        :raises ValueError: If any matrix is not a 2x2 unitary, a name is taken, or a name
+            repeats with different matrices.
+        """
+        matrices, valid = validate_unitaries(matrices)
+        if not valid.all():
+            positions = np.flatnonzero(~valid).tolist()
+            raise ValueError(f"Custom gate matrices at positions {positions} are not unitary.")
+        if names is not None and len(names) != len(matrices):
+            raise ValueError("Expected one name per custom gate matrix.")
+        return self._add(matrices, [fingerprint(m) for m in matrices], names, overwrite)
+
+    def unregister(self, name):
+        """
+        Removes a custom gate from this registry and from the gate registry.
+        :raises KeyError: If there is no custom gate with that name.
+        """
+        name = name.lower()
+        del self._matrices[name]
+        digest = self._fingerprints.pop(name)
+        if self._by_fingerprint.get(digest) == name:
+            del self._by_fingerprint[digest]
+        unregister_gate(name)
+
+    def clear(self):
+        for name in self.names():
+            self.unregister(name)
+
+    def dump(self, path):
+        """
+        Writes the registry to a directory (created if needed). Each file is written to a
+        temporary file and renamed into place, so readers never see a partial file.
+        :param path: Target directory.
+        """
+        os.makedirs(path, exist_ok=True)
+        names = self.names()
+        stack = np.array([self._matrices[name] for name in names], dtype=complex).reshape(-1, 2, 2)
+        save_array_atomic(os.path.join(path, GATES_FILE), stack)
+        write_json_atomic(os.path.join(path, INDEX_FILE),
+                          {"names": names, "fingerprints": [self._fingerprints[name] for name in names]})
+
+    def load(self, path, overwrite=False):
+        """
+        Registers the gates stored by dump(). The matrices were validated when first registered,
+        so only their fingerprints are checked against the index to detect corrupted files.
+        :param path: Directory containing gates.npy and index.json.
+        :return: The list of loaded gate names.
+        :raises ValueError: If the stored matrices do not match their fingerprints.
+        """
+        with open(os.path.join(path, INDEX_FILE), encoding="utf-8") as f:
+            index = json.load(f)
+        matrices = np.load(os.path.join(path, GATES_FILE))
+        digests = [fingerprint(m) for m in matrices]
+        if digests != index["fingerprints"]:
+            raise ValueError(f"Custom gate registry at '{path}' is inconsistent with its index.")
+        return self._add(matrices, digests, index["names"], overwrite)
+
+    def _add(self, matrices, digests, names, overwrite):
+        if names is None:
+            names = [self._by_fingerprint.get(digest, f"custom_{digest}") for digest in digests]
+        names = [name.lower() for name in names]
+        batch = {}
+        for name, digest in zip(names, digests):
+            if batch.setdefault(name, digest) != digest:
+                raise ValueError(f"Gate '{name}' is given two different matrices in one batch.")
+        for name, digest in zip(names, digests):
+            if self._fingerprints.get(name) == digest:
+                continue  # Already registered with the same content
+            if name in GATE_REGISTRY and not (overwrite and name in self._matrices):
+                raise ValueError(f"Gate '{name}' is already registered.")
+        for name, digest, matrix in zip(names, digests, matrices):
+            if self._fingerprints.get(name) == digest:
+                continue
+            if name in self._matrices:
+                self.unregister(name)
+            matrix = _constant(matrix)
+            self._matrices[name] = matrix
+            self._fingerprints[name] = digest
+            self._by_fingerprint.setdefault(digest, name)
+            register_gate(name, lambda _matrix=matrix, **kwargs: _matrix)
+        return names
+
+
+# Process-wide registry; its gates are applied by name through QuantumSimulator.apply_gate.
+CUSTOM_GATES = CustomGateRegistry()
@@ -0,0 +1,177 @@
+import numpy as np
+
+from qubit_state import PRESETS, precision_dtype
+from quantum_gates import IDENTITY, PAULI_X, PAULI_Y, PAULI_Z, _constant
+
+
+class NoiseChannels:
+    """
+    Kraus representations of common single-qubit noise channels.
+    Every method returns a read-only (K, 2, 2) stack of Kraus operators.
+    """
+
+    @staticmethod
+    def amplitude_damping(gamma):
+        """
+        Energy relaxation (T1): |1> decays to |0> with probability gamma.
+        """
+        return _constant([[[1, 0], [0, np.sqrt(1 - gamma)]],
+                          [[0, np.sqrt(gamma)], [0, 0]]])
+
+    @staticmethod
+    def phase_damping(lam):
+        """
+        Pure dephasing: coherences are scaled by sqrt(1 - lam).
+        """
+        return _constant([[[1, 0], [0, np.sqrt(1 - lam)]],
+                          [[0, 0], [0, np.sqrt(lam)]]])
+
+    @staticmethod
+    def dephasing(p):
+        """
+        Phase flip: Z is applied with probability p.
+        """
+        return _constant([np.sqrt(1 - p) * IDENTITY, np.sqrt(p) * PAULI_Z])
+
+    @staticmethod
+    def depolarizing(p):
+        """
+        With probability p the state is replaced by the maximally mixed state.
+        """
+        return _constant([np.sqrt(1 - 3*p/4) * IDENTITY, np.sqrt(p/4) * PAULI_X,
+                          np.sqrt(p/4) * PAULI_Y, np.sqrt(p/4) * PAULI_Z])
+
+    @staticmethod
+    def thermal_relaxation(t, t1, t2):
+        """
+        Combined T1/T2 decay over a duration t (amplitude damping followed by pure dephasing).
+        :raises ValueError: If t2 > 2 * t1, which no physical channel allows.
+        """
+        if t2 > 2 * t1:
+            raise ValueError("T2 cannot exceed 2 * T1.")
+        gamma = 1 - np.exp(-t / t1)
+        lam = 1 - np.exp(t / t1 - 2 * t / t2)
+        damping = NoiseChannels.amplitude_damping(gamma)
+        dephasing = NoiseChannels.phase_damping(lam)
+        return _constant(np.einsum("aij,bjk->abik", dephasing, damping).reshape(-1, 2, 2))
+
+    @staticmethod
+    def custom_channel(operators):
+        """
+        Validates a user-supplied set of Kraus operators.
+        :raises ValueError: If the operators are not 2x2 or do not preserve the trace.
+        """
+        operators = np.array(operators, dtype=complex)
+        if operators.ndim != 3 or operators.shape[1:] != (2, 2):
+            raise ValueError("Kraus operators must have shape (K, 2, 2).")
+        completeness = np.einsum("kji,kjl->il", operators.conj(), operators)
+        if not np.allclose(completeness, np.eye(2), atol=1e-8):
+            raise ValueError("Kraus operators must satisfy sum(K^dagger K) = I.")
+        return _constant(operators)
+
+
+def superoperator(kraus):
+    """
+    Builds the 4x4 matrix S with vec(sum_k K rho K^dagger) = S @ vec(rho) (row-major vec).
+    """
+    kraus = np.asarray(kraus, dtype=complex)
+    return np.einsum("kij,kml->imjl", kraus, kraus.conj()).reshape(4, 4)
+
+
+class DensityMatrixBatch:
+    """
+    N independent single-qubit density matrices stored as one (N, 2, 2) complex array.
+
+    The mixed-state counterpart to QubitStateBatch: unitaries and Kraus channels are applied
+    to the whole ensemble at once. Operations shared by every qubit are folded into a 4x4
+    superoperator and applied as a single (N, 4) x (4, 4) product; per-qubit stacks use einsum.
+    """
+
+    def __init__(self, n, alpha=1+0j, beta=0+0j, dtype=np.complex128):
+        """
+        :param dtype: Matrix precision; complex64 ("single") halves the memory of large ensembles.
+        """
+        self.dtype = precision_dtype(dtype)
+        self.rho = np.empty((n, 2, 2), dtype=self.dtype)
+        self.set_state(alpha, beta)
+
+    @classmethod
+    def from_states(cls, states, **kwargs):
+        """
+        Builds pure density matrices from an (N, 2) array of [alpha, beta] rows.
+        :param kwargs: Precision option, as for the constructor.
+        """
+        states = np.asarray(states, dtype=complex)
+        return cls(states.shape[0], states[:, 0], states[:, 1], **kwargs)
+
+    def __len__(self):
+        return self.rho.shape[0]
+
+    def set_state(self, alpha, beta):
+        vec = np.empty((len(self), 2), dtype=complex)
+        vec[:, 0] = alpha
+        vec[:, 1] = beta
+        vec /= np.linalg.norm(vec, axis=1)[:, None]
+        self.rho = np.einsum("ni,nj->nij", vec, vec.conj()).astype(self.dtype)
+
+    def set_preset(self, preset_name):
+        if preset_name not in PRESETS:
+            raise ValueError(f"Unknown preset {preset_name}")
+        self.set_state(*PRESETS[preset_name])
+
+    def normalize(self):
+        """
+        Rescales every matrix to unit trace.
+        """
+        trace = (self.rho[:, 0, 0] + self.rho[:, 1, 1]).real
+        if np.any(trace == 0):
+            raise ValueError("Density matrix has zero trace!")
+        self.rho /= trace[:, None, None]
+
+    def apply_gate(self, gate_matrix):
+        """
+        :param gate_matrix: One shared 2x2 unitary or an (N, 2, 2) per-qubit stack.
+        """
+        gate_matrix = np.asarray(gate_matrix)
+        if gate_matrix.shape == (2, 2):
+            self._apply_superoperator(superoperator(gate_matrix[None]))
+        elif gate_matrix.shape == (len(self), 2, 2):
+            gate_matrix = gate_matrix.astype(self.dtype, copy=False)
+            self.rho = np.einsum("nij,njk,nlk->nil", gate_matrix, self.rho, gate_matrix.conj())
+        else:
+            raise ValueError(
+                f"Gate must have shape (2, 2) or ({len(self)}, 2, 2), got {gate_matrix.shape}.")
+
+    def apply_channel(self, kraus):
+        """
+        :param kraus: A shared (K, 2, 2) Kraus stack or a per-qubit (N, K, 2, 2) stack.
+        """
+        kraus = np.asarray(kraus)
+        if kraus.ndim == 3 and kraus.shape[1:] == (2, 2):
+            self._apply_superoperator(superoperator(kraus))
+        elif kraus.ndim == 4 and kraus.shape[0] == len(self) and kraus.shape[2:] == (2, 2):
+            kraus = kraus.astype(self.dtype, copy=False)
+            self.rho = np.einsum("nkij,njl,nkml->nim", kraus, self.rho, kraus.conj())
+        else:
+            raise ValueError(f"Kraus operators must have shape (K, 2, 2) or ({len(self)}, K, 2, 2).")
+
+    def _apply_superoperator(self, superop):
+        flat = self.rho.reshape(len(self), 4)
+        self.rho = (flat @ superop.T.astype(self.dtype, copy=False)).reshape(len(self), 2, 2)
+
+    def get_bloch_cartesian(self):
+        """
+        :return: Arrays (x, y, z); the vectors lie inside the unit ball, on its surface only for pure states.
+        """
+        coherence = self.rho[:, 1, 0]
+        return 2 * coherence.real, 2 * coherence.imag, (self.rho[:, 0, 0] - self.rho[:, 1, 1]).real
+
+    def get_bloch_radius(self):
+        x, y, z = self.get_bloch_cartesian()
+        return np.sqrt(x**2 + y**2 + z**2)
+
+    def purity(self):
+        """
+        :return: tr(rho^2) for every qubit, 1 for pure states and 1/2 for the maximally mixed state.
+        """
+        return np.einsum("nij,nji->n", self.rho, self.rho).real
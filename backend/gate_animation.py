@@ -0,0 +1,112 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from quantum_gates import PARAMETRIC_GATE_STACKS, gate_key, registry_generation, resolve_gate
+
+AXIS_DECIMALS = 12  # Start vectors are rounded to this many decimals in cache keys
+
+
+def rotation_axis_angle(gate_matrix):
+    """
+    Finds the Bloch-sphere rotation performed by a 2x2 unitary.
+    The shorter of the two equivalent rotations is returned, so angle is in [0, pi].
+    :return: A tuple (unit axis as a length-3 array, angle in radians).
+    """
+    gate_matrix = np.asarray(gate_matrix, dtype=complex)
+    su2 = gate_matrix * np.exp(-0.5j * np.angle(np.linalg.det(gate_matrix)))
+    # su2 = cos(a/2) I - i sin(a/2) (n . sigma)
+    cos_half = (su2[0, 0] + su2[1, 1]).real / 2
+    sin_axis = np.array([-(su2[0, 1] + su2[1, 0]).imag / 2,
+                         (su2[1, 0] - su2[0, 1]).real / 2,
+                         (su2[1, 1] - su2[0, 0]).imag / 2])
+    if cos_half < 0:
+        cos_half, sin_axis = -cos_half, -sin_axis
+    sin_half = np.sqrt(sin_axis @ sin_axis)
+    if sin_half < 1e-15:
+        return np.array([0.0, 0.0, 1.0]), 0.0
+    return sin_axis / sin_half, 2 * np.arctan2(sin_half, cos_half)
+
+
+def rotate_vectors(vector, axis, angles):
+    """
+    Rotates one Bloch vector about an axis by every angle at once (Rodrigues' formula).
+    :return: An array of shape (len(angles), 3).
+    """
+    angles = np.asarray(angles, dtype=float)[:, None]
+    cos, sin = np.cos(angles), np.sin(angles)
+    return vector * cos + np.cross(axis, vector) * sin + axis * (axis @ vector) * (1 - cos)
+
+
+def gate_trajectory(gate_name, start_state, frames=60, **kwargs):
+    """
+    Computes the path on the Bloch sphere traced by the fractional powers U^t, t in [0, 1].
+    Rotation gates follow their own parameter (Rx(t*theta)), so a 270 degree rotation is
+    animated the long way round; other gates follow the shortest geodesic.
+    :param gate_name: Any registered gate name.
+    :param start_state: A QubitState to start from.
+    :param frames: Number of points, including both end points.
+    :return: A (frames, 3) array of Cartesian Bloch vectors.
+    """
+    steps = np.linspace(0.0, 1.0, frames)
+    start = np.array(start_state.get_bloch_cartesian(), dtype=float)
+    name = gate_name.lower()
+    if name in PARAMETRIC_GATE_STACKS:
+        axis = np.eye(3)["xyz".index(name[-1])]
+        angle = float(kwargs.get("theta", 0))
+    else:
+        axis, angle = rotation_axis_angle(resolve_gate(name, **kwargs))
+    return rotate_vectors(start, axis, steps * angle)
+
+
+class TrajectoryCache:
+    """
+    Bounded LRU cache of gate trajectories keyed on (gate, parameters, start vector, frames).
+    Safe to share between threads (e.g. simulator sessions): lookups and updates hold a lock,
+    while trajectories are computed outside it.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._generation = registry_generation()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, gate_name, kwargs, start_state, frames=60):
+        """
+        Returns the (read-only) trajectory for a gate applied to start_state, computing it on a miss.
+        """
+        start = tuple(np.round(start_state.get_bloch_cartesian(), AXIS_DECIMALS) + 0.0)
+        key = (gate_key(gate_name, kwargs), start, frames)
+        with self._lock:
+            if self._generation != registry_generation():
+                self._entries.clear()  # A gate name was rebound or removed since these were computed
+                self._generation = registry_generation()
+            trajectory = self._entries.get(key)
+            if trajectory is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return trajectory
+            self.misses += 1
+        trajectory = gate_trajectory(gate_name, start_state, frames, **kwargs)
+        trajectory.setflags(write=False)
+        with self._lock:
+            self._entries[key] = trajectory
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return trajectory
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+TRAJECTORY_CACHE = TrajectoryCache()
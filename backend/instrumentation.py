@@ -0,0 +1,219 @@
+import bisect
+import json
+import threading
+import time
+from functools import wraps
+
+from state_library import write_text_atomic
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is +Inf.
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+                   1e-3, 2.5e-3, 5e-3, 1e-2, 1e-1, 1.0)
+
+# Simulator methods wrapped while instrumentation is enabled.
+SIMULATOR_OPERATIONS = ("apply_gate", "apply_circuit", "_get_gate_by_name", "reset", "undo",
+                        "redo", "jump_to", "save_state", "load_state")
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram with a running count and sum.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def snapshot(self):
+        bounds = [str(bound) for bound in self.buckets] + ["+Inf"]
+        return {
+            "count": self.count,
+            "total_seconds": self.total,
+            "mean_seconds": self.total / self.count if self.count else 0.0,
+            "buckets": dict(zip(bounds, self.counts)),
+        }
+
+
+class Instrumentation:
+    """
+    Opt-in call counters and latency histograms for one simulator.
+
+    While enabled, the simulator's operations (and its qubit's normalize) are shadowed by
+    timing wrappers installed as instance attributes. Disabling removes the wrappers, so a
+    simulator that never enables instrumentation runs exactly the uninstrumented code.
+    The normalize wrapper follows simulator.qubit: if the simulator's qubit is replaced, the
+    next instrumented operation moves the wrapper onto the new qubit.
+    """
+
+    def __init__(self, simulator):
+        self.simulator = simulator
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._reporter = None
+        self._qubit = None  # The qubit currently carrying the normalize wrapper
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {}  # operation -> LatencyHistogram
+            self.gate_counts = {}  # gate name -> number of applications
+
+    def enable(self):
+        if self.enabled:
+            return
+        for name in SIMULATOR_OPERATIONS:
+            setattr(self.simulator, name, self._wrap(name, getattr(self.simulator, name)))
+        self.enabled = True
+        self._track_qubit()
+
+    def disable(self):
+        if not self.enabled:
+            return
+        for name in SIMULATOR_OPERATIONS:
+            self.simulator.__dict__.pop(name, None)
+        self._release_qubit()
+        self.enabled = False
+
+    def _track_qubit(self):
+        qubit = self.simulator.qubit
+        if qubit is self._qubit or not self.enabled:
+            return
+        self._release_qubit()
+        qubit.normalize = self._wrap("normalize", qubit.normalize)
+        self._qubit = qubit
+
+    def _release_qubit(self):
+        if self._qubit is not None:
+            self._qubit.__dict__.pop("normalize", None)
+            self._qubit = None
+
+    def record(self, operation, seconds):
+        with self._lock:
+            histogram = self.histograms.get(operation)
+            if histogram is None:
+                histogram = self.histograms[operation] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def _wrap(self, operation, method):
+        perf_counter = time.perf_counter
+        track_qubit = self._track_qubit
+
+        if operation == "apply_gate":
+            @wraps(method)
+            def timed(gate_name, **kwargs):
+                track_qubit()
+                start = perf_counter()
+                try:
+                    return method(gate_name, **kwargs)
+                finally:
+                    self.record(operation, perf_counter() - start)
+                    name = gate_name.lower()
+                    with self._lock:
+                        self.gate_counts[name] = self.gate_counts.get(name, 0) + 1
+        elif operation == "_get_gate_by_name":
+            @wraps(method)
+            def timed(gate_name, **kwargs):
+                start = perf_counter()
+                try:
+                    return method(gate_name, **kwargs)
+                finally:
+                    elapsed = perf_counter() - start
+                    self.record("gate_lookup", elapsed)
+                    if gate_name.lower() == "custom":
+                        # Lookup of a custom gate is dominated by its unitarity validation.
+                        self.record("custom_gate", elapsed)
+        elif operation == "normalize":
+            @wraps(method)
+            def timed(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    self.record(operation, perf_counter() - start)
+        else:
+            @wraps(method)
+            def timed(*args, **kwargs):
+                track_qubit()
+                start = perf_counter()
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    self.record(operation, perf_counter() - start)
+        return timed
+
+    def stats(self):
+        """
+        :return: A snapshot dict with per-operation histograms, per-gate counts and the
+            current history length.
+        """
+        with self._lock:
+            operations = {name: histogram.snapshot() for name, histogram in self.histograms.items()}
+            gate_counts = dict(self.gate_counts)
+        return {
+            "enabled": self.enabled,
+            "operations": operations,
+            "gate_counts": gate_counts,
+            "history_len": self.simulator.history_len(),
+        }
+
+    def prometheus_text(self, prefix="quantum_simulator"):
+        """
+        :return: The current metrics in the Prometheus text exposition format.
+        """
+        stats = self.stats()
+        lines = [f"# HELP {prefix}_operation_seconds Latency of simulator operations.",
+                 f"# TYPE {prefix}_operation_seconds histogram"]
+        for operation, snapshot in sorted(stats["operations"].items()):
+            cumulative = 0
+            for bound, count in snapshot["buckets"].items():
+                cumulative += count
+                lines.append(f'{prefix}_operation_seconds_bucket{{op="{operation}",le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}_operation_seconds_sum{{op="{operation}"}} {snapshot["total_seconds"]}')
+            lines.append(f'{prefix}_operation_seconds_count{{op="{operation}"}} {snapshot["count"]}')
+        lines += [f"# HELP {prefix}_gates_total Gates applied, by gate name.",
+                  f"# TYPE {prefix}_gates_total counter"]
+        for gate, count in sorted(stats["gate_counts"].items()):
+            lines.append(f'{prefix}_gates_total{{gate="{gate}"}} {count}')
+        lines += [f"# HELP {prefix}_history_len Length of the undo/redo timeline.",
+                  f"# TYPE {prefix}_history_len gauge",
+                  f"{prefix}_history_len {stats['history_len']}"]
+        return "\n".join(lines) + "\n"
+
+    def write_report(self, path, fmt="prometheus"):
+        """
+        Writes the current metrics to a file, replacing it in one step so a reader never
+        sees a partially written report.
+        :param fmt: "prometheus" for the text exposition format or "json" for stats().
+        """
+        text = self.prometheus_text() if fmt == "prometheus" else json.dumps(self.stats(), indent=2)
+        write_text_atomic(path, text)
+
+    def start_periodic_report(self, path, interval=10.0, fmt="prometheus"):
+        """
+        Rewrites the report file every interval seconds from a daemon thread.
+        """
+        self.stop_periodic_report()
+        stop = threading.Event()
+
+        def loop():
+            while not stop.wait(interval):
+                self.write_report(path, fmt)
+
+        thread = threading.Thread(target=loop, name="metrics-reporter", daemon=True)
+        self._reporter = (thread, stop)
+        thread.start()
+
+    def stop_periodic_report(self):
+        if self._reporter is None:
+            return
+        thread, stop = self._reporter
+        stop.set()
+        thread.join()
+        self._reporter = None
@@ -0,0 +1,131 @@
+"""
+Load generator for api_server.py.
+
+Opens a number of keep-alive connections (one session each) and sends apply_gate requests
+pipelined `--depth` deep, then reports throughput and latency percentiles. With
+`--batch N` every request carries a /batch of N gates instead of a single gate.
+
+Usage: python load_generator.py [--port 8765] [--connections 16] [--requests 20000]
+                                [--depth 8] [--batch 1] [--spawn-server]
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from api_server import ApiServer
+
+GATES = ["hadamard", "pauli_x", "t", "phase", "pauli_z"]
+
+
+def _encode_request(path, body, session_id):
+    payload = json.dumps(body).encode("utf-8")
+    head = (f"POST {path} HTTP/1.1\r\n"
+            f"Host: localhost\r\n"
+            f"X-Session-Id: {session_id}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n\r\n")
+    return head.encode("latin-1") + payload
+
+
+async def read_response(reader):
+    """
+    Reads one HTTP response and returns (status, decoded JSON body).
+    """
+    status_line = await reader.readline()
+    status = int(status_line.split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        if key.strip().lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+def _make_request(index, batch, session_id):
+    if batch > 1:
+        ops = [{"op": "apply_gate", "gate_name": GATES[(index + i) % len(GATES)]} for i in range(batch)]
+        return _encode_request("/batch", {"ops": ops}, session_id)
+    return _encode_request("/apply_gate", {"gate_name": GATES[index % len(GATES)]}, session_id)
+
+
+async def _client(host, port, session_id, count, depth, batch, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    sent = 0
+    while sent < count:
+        window = min(depth, count - sent)
+        started = []
+        for i in range(window):
+            writer.write(_make_request(sent + i, batch, session_id))
+            started.append(time.perf_counter())
+        await writer.drain()
+        for start in started:
+            status, _ = await read_response(reader)
+            if status != 200:
+                raise RuntimeError(f"Server answered {status}")
+            latencies.append(time.perf_counter() - start)
+        sent += window
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run_load(host, port, connections, requests, depth, batch):
+    """
+    Runs the load and returns a dict with requests, seconds, requests_per_sec,
+    gates_per_sec, p50_ms and p99_ms.
+    """
+    latencies = []
+    per_client = requests // connections
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, f"load{i}", per_client, depth, batch, latencies)
+                           for i in range(connections)))
+    elapsed = time.perf_counter() - start
+    latencies = np.array(latencies) * 1000
+    return {
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "requests_per_sec": len(latencies) / elapsed,
+        "gates_per_sec": len(latencies) * batch / elapsed,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+    }
+
+
+async def _main(args):
+    server = None
+    if args.spawn_server:
+        server = await ApiServer().start(args.host, args.port)
+        args.port = server.sockets[0].getsockname()[1]
+    try:
+        report = await run_load(args.host, args.port, args.connections, args.requests,
+                                args.depth, args.batch)
+    finally:
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+    print(json.dumps(report, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--depth", type=int, default=8, help="Pipelined requests in flight per connection.")
+    parser.add_argument("--batch", type=int, default=1, help="Gates per request (uses /batch when > 1).")
+    parser.add_argument("--spawn-server", action="store_true",
+                        help="Run an in-process server on a free port instead of connecting to one.")
+    args = parser.parse_args()
+    if args.spawn_server:
+        args.port = 0
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+from collections import namedtuple
+
+import numpy as np
+
+from quantum_gates import MEASUREMENT_BASES
+
+SHOT_CHUNK_SIZE = 1 << 20  # Outcomes drawn per chunk when individual shots are generated
+
+# counts and probabilities are indexed by outcome (0 = +1 eigenstate, 1 = -1 eigenstate).
+# outcomes holds the per-shot results when they were requested, otherwise None.
+MeasurementResult = namedtuple(
+    "MeasurementResult", ["basis", "shots", "counts", "probabilities", "expectation", "outcomes"])
+
+
+def outcome_probabilities(states, basis="z"):
+    """
+    Computes outcome probabilities for one or many states.
+    :param states: A length-2 state vector or an (N, 2) array of them.
+    :param basis: "z", "x" or "y".
+    :return: Array of shape (..., 2) holding [p(0), p(1)] for each state.
+    :raises ValueError: If the basis is unknown.
+    """
+    basis = basis.lower()
+    if basis not in MEASUREMENT_BASES:
+        raise ValueError(f"Unknown measurement basis: {basis}")
+    states = np.asarray(states, dtype=complex)
+    rotated = states @ MEASUREMENT_BASES[basis].T
+    probabilities = np.abs(rotated)**2
+    return probabilities / probabilities.sum(axis=-1, keepdims=True)
+
+
+class StreamingHistogram:
+    """
+    Accumulates outcome counts chunk by chunk, so memory does not depend on the number of shots.
+    """
+
+    def __init__(self, outcomes=2):
+        self.counts = np.zeros(outcomes, dtype=np.int64)
+
+    @property
+    def shots(self):
+        return int(self.counts.sum())
+
+    def update(self, chunk):
+        """
+        :param chunk: Array of integer outcomes.
+        """
+        self.counts += np.bincount(chunk, minlength=len(self.counts))
+
+    def frequencies(self):
+        return self.counts / max(self.shots, 1)
+
+
+def sample_counts(probability_zero, shots, rng):
+    """
+    Draws outcome counts without generating individual shots (one binomial draw per state).
+    :param probability_zero: Scalar or array of p(0).
+    :return: Array of shape (..., 2) with [count(0), count(1)].
+    """
+    zeros = rng.binomial(shots, np.clip(probability_zero, 0.0, 1.0))
+    return np.stack([zeros, shots - zeros], axis=-1)
+
+
+def iter_shots(probability_zero, shots, rng, chunk_size=SHOT_CHUNK_SIZE):
+    """
+    Yields individual outcomes (uint8, 0 or 1) in chunks of at most chunk_size.
+    """
+    remaining = shots
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        yield (rng.random(size) >= probability_zero).astype(np.uint8)
+        remaining -= size
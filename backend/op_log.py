@@ -0,0 +1,463 @@
+"""
+Streaming replay of recorded simulator sessions.
+
+An operation log is read in fixed-size chunks, parsed into typed NumPy arrays (OpChunk) and
+fed to a simulator. Each run of consecutive apply_gate operations between control
+operations (reset, undo, redo, save_state, load_state) is executed as one fused batch:
+the gate matrices of a whole chunk are built as one stack, their running products within
+each run are formed with a segmented parallel prefix scan, and all intermediate states of
+a run are written to the history in a single vectorized push. (Runs shorter than
+FUSE_MIN_RUN reuse the prebuilt matrices but are applied gate by gate, which is cheaper.)
+The final state of a run is set through the qubit's own apply_gate, so its precision and
+renormalization policy apply; with metrics enabled, gates go through simulator.apply_gate.
+Undo and redo in the log therefore behave exactly as with one apply_gate call per
+operation, and memory stays bounded by the chunk size whatever the length of the log.
+
+Two log formats are supported:
+- JSONL, one operation per line, in the same shape as api_server.py batch items:
+      {"op": "apply_gate", "gate_name": "rotation_x", "kwargs": {"theta": 1.0}}
+      {"op": "reset", "preset": "plus"}    {"op": "undo"}    {"op": "save_state", "name": "a"}
+- A compact binary log (see BinaryOpLogWriter) holding one 17-byte record per operation,
+  a table of argument strings (preset and state names) and a table of gate names; it is
+  memory-mapped on replay. Custom matrices require JSONL.
+
+Usage: python op_log.py replay LOG [--chunk-size N]
+       python op_log.py convert LOG.jsonl LOG.qlog
+"""
+import argparse
+import json
+import shutil
+import struct
+import sys
+import tempfile
+import time
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from quantum_gates import PARAMETRIC_GATE_STACKS, resolve_gate
+
+OP_APPLY, OP_RESET, OP_UNDO, OP_REDO, OP_SAVE, OP_LOAD = range(6)
+OP_NAMES = ("apply_gate", "reset", "undo", "redo", "save_state", "load_state")
+OP_CODES = {name: code for code, name in enumerate(OP_NAMES)}
+
+RECORD_DTYPE = np.dtype([("op", "u1"), ("gate", "<u4"), ("arg", "<i4"), ("theta", "<f8")])
+BINARY_MAGIC = b"QOPLOG2\0"
+BINARY_HEADER = struct.Struct("<8sQQ")  # magic, record count, argument string count
+OFFSET_DTYPE = np.dtype("<u8")
+DEFAULT_CHUNK_SIZE = 65536
+ARG_CACHE_SIZE = 4096  # Recent argument strings the binary writer deduplicates
+FUSE_MIN_RUN = 8  # Shortest run of gates executed through the fused path
+
+ReplayStats = namedtuple("ReplayStats", ["ops", "gates", "fused_runs", "seconds", "ops_per_sec"])
+
+
+class OpChunk:
+    """
+    A parsed block of operations stored column-wise.
+
+    ops holds the OP_* code of each operation. For apply_gate, gates indexes gate_names and
+    theta holds the rotation angle; arg indexes matrices for custom gates (-1 otherwise).
+    For reset/save_state/load_state, arg indexes the preset or state name in arg_strings
+    (a list, or a dict holding just the indices this chunk uses).
+    """
+
+    def __init__(self, ops, gates, args, thetas, gate_names, arg_strings, matrices=()):
+        self.ops = ops
+        self.gates = gates
+        self.args = args
+        self.thetas = thetas
+        self.gate_names = gate_names
+        self.arg_strings = arg_strings
+        self.matrices = matrices
+
+    def __len__(self):
+        return len(self.ops)
+
+
+class _StringTable:
+    def __init__(self, strings=()):
+        self.strings = list(strings)
+        self._index = {text: i for i, text in enumerate(self.strings)}
+
+    def add(self, text):
+        index = self._index.get(text)
+        if index is None:
+            index = self._index[text] = len(self.strings)
+            self.strings.append(text)
+        return index
+
+
+class _SpillingStringTable:
+    """
+    Append-only string table kept on disk (offsets and UTF-8 blob in temporary files), with
+    only the most recent cache_size strings held in memory for deduplication. A string
+    that has fallen out of the cache is simply stored again under a new index.
+    """
+
+    def __init__(self, cache_size=ARG_CACHE_SIZE):
+        self.cache_size = cache_size
+        self.count = 0
+        self._recent = OrderedDict()  # string -> index
+        self._blob = tempfile.TemporaryFile()
+        self._offsets = tempfile.TemporaryFile()
+        self._size = 0
+        self._offsets.write(struct.pack("<Q", 0))
+
+    def add(self, text):
+        index = self._recent.get(text)
+        if index is not None:
+            self._recent.move_to_end(text)
+            return index
+        data = text.encode("utf-8")
+        self._blob.write(data)
+        self._size += len(data)
+        self._offsets.write(struct.pack("<Q", self._size))
+        index = self._recent[text] = self.count
+        self.count += 1
+        if len(self._recent) > self.cache_size:
+            self._recent.popitem(last=False)
+        return index
+
+    def write_to(self, f):
+        """
+        Appends the offsets array and then the blob to f, and releases the temporary files.
+        """
+        for spill in (self._offsets, self._blob):
+            spill.seek(0)
+            shutil.copyfileobj(spill, f)
+            spill.close()
+
+
+def _encode_op(op, gate_table, arg_table, matrices):
+    """
+    Converts one operation dict into (code, gate, arg, theta).
+    """
+    name = op.get("op")
+    code = OP_CODES.get(name)
+    if code is None:
+        raise ValueError(f"Unknown operation: {name}")
+    if code == OP_APPLY:
+        kwargs = op.get("kwargs", {})
+        arg = -1
+        if "matrix" in kwargs:
+            arg = len(matrices)
+            matrices.append(kwargs["matrix"])
+        return code, gate_table.add(op["gate_name"].lower()), arg, float(kwargs.get("theta", 0.0))
+    if code == OP_RESET:
+        return code, 0, arg_table.add(op.get("preset", "zero")), 0.0
+    if code in (OP_SAVE, OP_LOAD):
+        return code, 0, arg_table.add(op["name"]), 0.0
+    return code, 0, -1, 0.0
+
+
+def _build_chunk(records, gate_table, arg_table, matrices):
+    ops, gates, args, thetas = zip(*records)
+    return OpChunk(np.array(ops, dtype=np.uint8), np.array(gates, dtype=np.uint32),
+                   np.array(args, dtype=np.int32), np.array(thetas, dtype=float),
+                   gate_table.strings, arg_table.strings, matrices)
+
+
+def iter_jsonl_chunks(lines, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Parses JSONL operations into OpChunks of at most chunk_size operations.
+    :param lines: An iterable of lines (e.g. an open file).
+    """
+    records, gate_table, arg_table, matrices = [], _StringTable(), _StringTable(), []
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            records.append(_encode_op(json.loads(line), gate_table, arg_table, matrices))
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Line {number}: {e}")
+        if len(records) == chunk_size:
+            yield _build_chunk(records, gate_table, arg_table, matrices)
+            records, gate_table, arg_table, matrices = [], _StringTable(), _StringTable(), []
+    if records:
+        yield _build_chunk(records, gate_table, arg_table, matrices)
+
+
+class BinaryOpLogWriter:
+    """
+    Writes the compact binary log format incrementally.
+
+    Layout: a 24-byte header (magic, record count, argument string count), the RECORD_DTYPE
+    records, the argument strings as a uint64 offsets array followed by their UTF-8 bytes,
+    then the gate names as JSON. Argument strings are spilled to temporary files as they
+    arrive, so memory stays bounded however many distinct state names a log uses. Use as a
+    context manager; the header and tables are finalized on close.
+    """
+
+    def __init__(self, path, arg_cache_size=ARG_CACHE_SIZE):
+        self._file = open(path, "wb")
+        self._file.write(BINARY_HEADER.pack(BINARY_MAGIC, 0, 0))
+        self._gates = _StringTable()
+        self._args = _SpillingStringTable(arg_cache_size)
+        self._count = 0
+
+    def write(self, ops):
+        """
+        Appends an iterable of operation dicts.
+        :raises ValueError: For custom-matrix gates, which the binary format cannot hold.
+        """
+        matrices = []
+        records = [_encode_op(op, self._gates, self._args, matrices) for op in ops]
+        if matrices:
+            raise ValueError("Custom matrices cannot be stored in a binary op log.")
+        if records:
+            np.array(records, dtype=RECORD_DTYPE).tofile(self._file)
+            self._count += len(records)
+
+    def close(self):
+        self._args.write_to(self._file)
+        self._file.write(json.dumps(self._gates.strings).encode("utf-8"))
+        self._file.seek(0)
+        self._file.write(BINARY_HEADER.pack(BINARY_MAGIC, self._count, self._args.count))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_binary_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Memory-maps a binary op log and yields OpChunks of at most chunk_size operations.
+    """
+    with open(path, "rb") as f:
+        magic, count, arg_count = BINARY_HEADER.unpack(f.read(BINARY_HEADER.size))
+        if magic != BINARY_MAGIC:
+            raise ValueError(f"'{path}' is not a binary op log (or was written by an older version).")
+        offsets_start = BINARY_HEADER.size + count * RECORD_DTYPE.itemsize
+        f.seek(offsets_start)
+        offsets = np.fromfile(f, dtype=OFFSET_DTYPE, count=arg_count + 1)
+        blob_start = offsets_start + offsets.nbytes
+        f.seek(blob_start + int(offsets[-1]))
+        gate_names = json.loads(f.read().decode("utf-8"))
+    if count == 0:
+        return
+    if arg_count:
+        offsets = np.memmap(path, dtype=OFFSET_DTYPE, mode="r", offset=offsets_start, shape=(arg_count + 1,))
+        blob = np.memmap(path, dtype=np.uint8, mode="r", offset=blob_start, shape=(max(int(offsets[-1]), 1),))
+    records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=BINARY_HEADER.size, shape=(count,))
+    for start in range(0, count, chunk_size):
+        block = np.array(records[start:start + chunk_size])
+        # Decode only the argument strings this chunk refers to.
+        used = np.unique(block["arg"][np.isin(block["op"], (OP_RESET, OP_SAVE, OP_LOAD))]).tolist()
+        arg_strings = {i: bytes(blob[offsets[i]:offsets[i + 1]]).decode("utf-8") for i in used}
+        yield OpChunk(block["op"], block["gate"], block["arg"], block["theta"], gate_names, arg_strings)
+
+
+def iter_log_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yields OpChunks from a log file, detecting the binary format by its magic bytes.
+    """
+    with open(path, "rb") as f:
+        is_binary = f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+    if is_binary:
+        yield from iter_binary_chunks(path, chunk_size)
+    else:
+        with open(path, encoding="utf-8") as f:
+            yield from iter_jsonl_chunks(f, chunk_size)
+
+
+def _gate_stack(chunk, indices):
+    """
+    Builds the (k, 2, 2) matrix stack for the apply_gate operations at the given chunk indices.
+    """
+    gates = chunk.gates[indices]
+    stack = np.empty((len(indices), 2, 2), dtype=complex)
+    for gate in np.unique(gates):
+        mask = gates == gate
+        name = chunk.gate_names[gate]
+        if name in PARAMETRIC_GATE_STACKS:
+            stack[mask] = PARAMETRIC_GATE_STACKS[name](chunk.thetas[indices[mask]])
+        elif name == "custom":
+            for offset in np.flatnonzero(mask):
+                stack[offset] = resolve_gate(name, matrix=chunk.matrices[chunk.args[indices[offset]]])
+        else:
+            stack[mask] = resolve_gate(name)
+    return stack
+
+
+def prefix_products(stack, segments=None):
+    """
+    Returns P with P[i] = stack[i] @ ... @ stack[s], where s is the first index of the segment
+    containing i, computed by a log-depth parallel scan over all segments at once.
+    :param segments: Optional non-decreasing segment id per matrix; None means one segment.
+    """
+    # The scan works on the four matrix entries as separate contiguous arrays, which is
+    # much faster than np.matmul on a large stack of 2x2 matrices.
+    m00, m01, m10, m11 = (np.ascontiguousarray(stack[:, i, j]) for i, j in ((0, 0), (0, 1), (1, 0), (1, 1)))
+    offset = 1
+    while offset < len(stack):
+        a00, a01, a10, a11 = m00[offset:], m01[offset:], m10[offset:], m11[offset:]
+        b00, b01, b10, b11 = m00[:-offset], m01[:-offset], m10[:-offset], m11[:-offset]
+        c00 = a00 * b00 + a01 * b10
+        c01 = a00 * b01 + a01 * b11
+        c10 = a10 * b00 + a11 * b10
+        c11 = a10 * b01 + a11 * b11
+        if segments is not None:
+            same = segments[offset:] == segments[:-offset]
+            if not same.any():
+                break
+            c00, c01 = np.where(same, c00, a00), np.where(same, c01, a01)
+            c10, c11 = np.where(same, c10, a10), np.where(same, c11, a11)
+        m00[offset:], m01[offset:], m10[offset:], m11[offset:] = c00, c01, c10, c11
+        offset *= 2
+    products = np.empty_like(stack)
+    products[:, 0, 0], products[:, 0, 1], products[:, 1, 0], products[:, 1, 1] = m00, m01, m10, m11
+    return products
+
+
+def apply_fused_run(simulator, products):
+    """
+    Applies a run of gates, given the running products from prefix_products, with the same
+    final state and history as one apply_gate call per gate.
+    """
+    qubit = simulator.qubit
+    start = np.array([qubit.alpha, qubit.beta], dtype=complex)
+    before = np.empty((len(products), 2), dtype=complex)
+    before[0] = start
+    if len(products) > 1:
+        states = products[:-1] @ start
+        before[1:] = states / np.linalg.norm(states, axis=1)[:, None]
+    simulator.history.push_many(before)
+    # The whole run's product goes through the qubit's own apply path (dtype, renormalization).
+    qubit.apply_gate(products[-1])
+
+
+def replay_chunks(chunks, simulator, min_fused_run=FUSE_MIN_RUN):
+    """
+    Feeds parsed chunks into a simulator.
+    :param min_fused_run: Gate runs shorter than this are applied one gate at a time, which
+        is cheaper than the fused path's fixed per-run overhead.
+    :return: A ReplayStats summary.
+    """
+    ops = gates = runs = 0
+    history = simulator.history
+    # With metrics on, every gate goes through the instrumented simulator.apply_gate instead.
+    instrumented = simulator.metrics.enabled
+    started = time.perf_counter()
+    for chunk in chunks:
+        if instrumented:
+            _replay_chunk_unfused(chunk, simulator)
+            ops += len(chunk)
+            gates += int(np.count_nonzero(chunk.ops == OP_APPLY))
+            continue
+        # Runs of identical op codes: [starts[r], stops[r]).
+        edges = np.flatnonzero(np.diff(chunk.ops)) + 1
+        starts = np.concatenate(([0], edges))
+        stops = np.concatenate((edges, [len(chunk)]))
+        apply_indices = np.flatnonzero(chunk.ops == OP_APPLY)
+        stack = _gate_stack(chunk, apply_indices)
+        run_ids = np.cumsum(np.concatenate(([True], np.diff(apply_indices) != 1)))
+        products = prefix_products(stack, run_ids)
+        position = 0  # index into stack of the next apply_gate operation
+        codes, args, strings = chunk.ops.tolist(), chunk.args.tolist(), chunk.arg_strings
+        for start, stop in zip(starts.tolist(), stops.tolist()):
+            code = codes[start]
+            if code == OP_APPLY:
+                count = stop - start
+                if count >= min_fused_run:
+                    apply_fused_run(simulator, products[position:position + count])
+                    runs += 1
+                else:
+                    qubit = simulator.qubit
+                    for matrix in stack[position:position + count]:
+                        history.push(qubit.alpha, qubit.beta)
+                        qubit.apply_gate(matrix)
+                position += count
+                gates += count
+                continue
+            for i in range(start, stop):
+                _run_control_op(simulator, code, strings, args[i])
+        ops += len(chunk)
+    seconds = time.perf_counter() - started
+    return ReplayStats(ops, gates, runs, seconds, ops / seconds if seconds else 0.0)
+
+
+def _run_control_op(simulator, code, strings, arg):
+    if code == OP_UNDO:
+        simulator.undo()
+    elif code == OP_REDO:
+        simulator.redo()
+    elif code == OP_RESET:
+        simulator.reset(strings[arg])
+    elif code == OP_SAVE:
+        simulator.save_state(strings[arg])
+    elif code == OP_LOAD:
+        simulator.load_state(strings[arg])
+
+
+def _replay_chunk_unfused(chunk, simulator):
+    for code, gate, arg, theta in zip(chunk.ops.tolist(), chunk.gates.tolist(),
+                                      chunk.args.tolist(), chunk.thetas.tolist()):
+        if code != OP_APPLY:
+            _run_control_op(simulator, code, chunk.arg_strings, arg)
+            continue
+        name = chunk.gate_names[gate]
+        if name == "custom":
+            simulator.apply_gate(name, matrix=chunk.matrices[arg])
+        elif name in PARAMETRIC_GATE_STACKS:
+            simulator.apply_gate(name, theta=theta)
+        else:
+            simulator.apply_gate(name)
+
+
+def replay_file(path, simulator=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Replays a JSONL or binary op log into a simulator (a fresh SimulatorSession by default).
+    :return: A (simulator, ReplayStats) pair.
+    """
+    if simulator is None:
+        from session_manager import SimulatorSession
+        simulator = SimulatorSession()
+    return simulator, replay_chunks(iter_log_chunks(path, chunk_size), simulator)
+
+
+def convert_jsonl_to_binary(source, target, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Streams a JSONL log into the binary format.
+    """
+    with open(source, encoding="utf-8") as f, BinaryOpLogWriter(target) as writer:
+        batch = []
+        for line in f:
+            line = line.strip()
+            if line:
+                batch.append(json.loads(line))
+            if len(batch) == chunk_size:
+                writer.write(batch)
+                batch = []
+        writer.write(batch)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    replay = commands.add_parser("replay", help="Replay a log and report throughput.")
+    replay.add_argument("log")
+    replay.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    convert = commands.add_parser("convert", help="Convert a JSONL log to the binary format.")
+    convert.add_argument("source")
+    convert.add_argument("target")
+    args = parser.parse_args(argv)
+
+    if args.command == "convert":
+        convert_jsonl_to_binary(args.source, args.target)
+        return 0
+    simulator, stats = replay_file(args.log, chunk_size=args.chunk_size)
+    print(f"ops:        {stats.ops:,} ({stats.gates:,} gates, {stats.fused_runs:,} fused runs)")
+    print(f"time:       {stats.seconds:.3f} s")
+    print(f"throughput: {stats.ops_per_sec:,.0f} ops/s")
+    theta, phi = simulator.get_bloch_coordinates()
+    print(f"final:      theta = {theta:.6f}, phi = {phi:.6f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
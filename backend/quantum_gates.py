@@ -1,48 +1,142 @@
+import math
+from functools import lru_cache
+
 import numpy as np
 
+
+def _constant(matrix, dtype=complex):
+    """
+    Freezes a gate matrix (or any shared lookup table) so the module-level instance cannot be mutated.
+    """
+    matrix = np.array(matrix, dtype=dtype)
+    matrix.setflags(write=False)
+    return matrix
+
+
+IDENTITY = _constant([[1, 0], [0, 1]])
+PAULI_X = _constant([[0, 1], [1, 0]])
+PAULI_Y = _constant([[0, -1j], [1j, 0]])
+PAULI_Z = _constant([[1, 0], [0, -1]])
+HADAMARD = _constant((1/np.sqrt(2)) * np.array([[1, 1], [1, -1]]))
+PHASE = _constant([[1, 0], [0, 1j]])
+T_GATE = _constant([[1, 0], [0, np.exp(1j*np.pi/4)]])
+
+# Basis -> unitary rotating that basis onto the computational (Z) basis before measuring.
+MEASUREMENT_BASES = {
+    "z": IDENTITY,
+    "x": HADAMARD,
+    "y": _constant(HADAMARD @ PHASE.conj().T),
+}
+
+ROTATION_CACHE_SIZE = 1024
+THETA_QUANTUM = 1e-12  # Rotation angles are cached on multiples of this step (radians)
+
+
+@lru_cache(maxsize=ROTATION_CACHE_SIZE)
+def _cached_rotation(axis, theta_key):
+    theta = theta_key * THETA_QUANTUM
+    c, s = np.cos(theta/2), np.sin(theta/2)
+    if axis == "x":
+        matrix = [[c, -1j*s], [-1j*s, c]]
+    elif axis == "y":
+        matrix = [[c, -s], [s, c]]
+    else:
+        matrix = [[c - 1j*s, 0], [0, c + 1j*s]]
+    return _constant(matrix)
+
+
+def _rotation(axis, theta):
+    """
+    :raises ValueError: If theta is NaN or infinite.
+    """
+    theta = float(theta)
+    if not math.isfinite(theta):
+        raise ValueError(f"Rotation angle must be finite, got {theta}.")
+    # Rotations repeat every 4*pi, so reducing first keeps huge angles quantizable.
+    return _cached_rotation(axis, int(round(math.fmod(theta, 4*np.pi) / THETA_QUANTUM)))
+
+
 class QuantumGates:
     @staticmethod
     def identity():
-        return np.array([[1, 0], [0, 1]], dtype=complex)
+        return IDENTITY
 
     @staticmethod
     def pauli_x():
-        return np.array([[0, 1], [1, 0]], dtype=complex)
+        return PAULI_X
 
     @staticmethod
     def pauli_y():
-        return np.array([[0, -1j], [1j, 0]], dtype=complex)
+        return PAULI_Y
 
     @staticmethod
     def pauli_z():
-        return np.array([[1, 0], [0, -1]], dtype=complex)
+        return PAULI_Z
 
     @staticmethod
     def hadamard():
-        return (1/np.sqrt(2)) * np.array([[1, 1], [1, -1]], dtype=complex)
+        return HADAMARD
 
     @staticmethod
     def phase():
-        return np.array([[1, 0], [0, 1j]], dtype=complex)
+        return PHASE
 
     @staticmethod
     def t_gate():
-        return np.array([[1, 0], [0, np.exp(1j*np.pi/4)]], dtype=complex)
+        return T_GATE
 
     @staticmethod
     def rotation_x(theta):
-        return np.array([[np.cos(theta/2), -1j*np.sin(theta/2)],
-                         [-1j*np.sin(theta/2), np.cos(theta/2)]], dtype=complex)
+        return _rotation("x", theta)
 
     @staticmethod
     def rotation_y(theta):
-        return np.array([[np.cos(theta/2), -np.sin(theta/2)],
-                         [np.sin(theta/2), np.cos(theta/2)]], dtype=complex)
+        return _rotation("y", theta)
 
     @staticmethod
     def rotation_z(theta):
-        return np.array([[np.exp(-1j*theta/2), 0],
-                         [0, np.exp(1j*theta/2)]], dtype=complex)
+        return _rotation("z", theta)
+
+    @staticmethod
+    def rotation_stack(axis, thetas):
+        """
+        Builds rotation matrices for many angles at once.
+        :param axis: One of "x", "y" or "z".
+        :param thetas: Array of angles of any shape S.
+        :return: A complex array of shape S + (2, 2).
+        """
+        thetas = np.asarray(thetas, dtype=float)
+        c, s = np.cos(thetas/2), np.sin(thetas/2)
+        stack = np.empty(thetas.shape + (2, 2), dtype=complex)
+        if axis == "x":
+            stack[..., 0, 0] = c
+            stack[..., 0, 1] = -1j*s
+            stack[..., 1, 0] = -1j*s
+            stack[..., 1, 1] = c
+        elif axis == "y":
+            stack[..., 0, 0] = c
+            stack[..., 0, 1] = -s
+            stack[..., 1, 0] = s
+            stack[..., 1, 1] = c
+        elif axis == "z":
+            stack[..., 0, 0] = c - 1j*s
+            stack[..., 0, 1] = 0
+            stack[..., 1, 0] = 0
+            stack[..., 1, 1] = c + 1j*s
+        else:
+            raise ValueError(f"Unknown rotation axis: {axis}")
+        return stack
+
+    @staticmethod
+    def rotation_cache_info():
+        """
+        :return: A dict with the hits, misses, maxsize and currsize of the rotation cache.
+        """
+        return _cached_rotation.cache_info()._asdict()
+
+    @staticmethod
+    def clear_rotation_cache():
+        _cached_rotation.cache_clear()
     
     @staticmethod
     def custom_gate(matrix):
@@ -56,4 +150,125 @@ class QuantumGates:
             raise ValueError("Custom gate matrix must be 2x2.")
         if not np.allclose(matrix.conj().T @ matrix, np.eye(2), atol=1e-8):
             raise ValueError("Custom gate matrix must be unitary.")
-        return matrix
\ No newline at end of file
+        return matrix
+
+    @staticmethod
+    def zyz_decomposition(matrix):
+        """
+        Decomposes a 2x2 unitary as exp(i*phase) * Rz(phi) @ Ry(theta) @ Rz(lam).
+        :param matrix: A 2x2 unitary matrix.
+        :return: A tuple (phase, phi, theta, lam) of real angles.
+        """
+        matrix = np.asarray(matrix, dtype=complex)
+        det = np.linalg.det(matrix)
+        phase = np.angle(det) / 2
+        su2 = matrix * np.exp(-1j * phase)
+        theta = 2 * np.arctan2(abs(su2[1, 0]), abs(su2[0, 0]))
+        # For SU(2): su2[1, 1] = exp(i(phi+lam)/2) cos, su2[1, 0] = exp(i(phi-lam)/2) sin
+        plus = 2 * np.angle(su2[1, 1]) if abs(su2[1, 1]) > 1e-12 else 0.0
+        minus = 2 * np.angle(su2[1, 0]) if abs(su2[1, 0]) > 1e-12 else 0.0
+        phi = (plus + minus) / 2
+        lam = (plus - minus) / 2
+        return phase, phi, theta, lam
+
+    @staticmethod
+    def from_zyz(phase, phi, theta, lam):
+        """
+        Rebuilds the unitary described by a zyz_decomposition tuple.
+        """
+        return (np.exp(1j * phase) * QuantumGates.rotation_z(phi)
+                @ QuantumGates.rotation_y(theta) @ QuantumGates.rotation_z(lam))
+
+
+# Gate name -> factory(**kwargs) returning a 2x2 matrix.
+GATE_REGISTRY = {
+    "identity": lambda **kwargs: IDENTITY,
+    "pauli_x": lambda **kwargs: PAULI_X,
+    "pauli_y": lambda **kwargs: PAULI_Y,
+    "pauli_z": lambda **kwargs: PAULI_Z,
+    "hadamard": lambda **kwargs: HADAMARD,
+    "phase": lambda **kwargs: PHASE,
+    "t": lambda **kwargs: T_GATE,
+    "rotation_x": lambda **kwargs: QuantumGates.rotation_x(kwargs.get("theta", 0)),
+    "rotation_y": lambda **kwargs: QuantumGates.rotation_y(kwargs.get("theta", 0)),
+    "rotation_z": lambda **kwargs: QuantumGates.rotation_z(kwargs.get("theta", 0)),
+    "custom": lambda **kwargs: QuantumGates.custom_gate(kwargs.get("matrix")),
+}
+
+# Parametric gate name -> factory(thetas) returning a stack of matrices, used for sweeps.
+PARAMETRIC_GATE_STACKS = {
+    "rotation_x": lambda thetas: QuantumGates.rotation_stack("x", thetas),
+    "rotation_y": lambda thetas: QuantumGates.rotation_stack("y", thetas),
+    "rotation_z": lambda thetas: QuantumGates.rotation_stack("z", thetas),
+}
+
+
+def _freeze(value):
+    if isinstance(value, (list, tuple, np.ndarray)):
+        array = np.asarray(value)
+        if array.ndim == 0:
+            return array.item()
+        return tuple(_freeze(item) for item in array)
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def gate_key(gate_name, kwargs):
+    """
+    Builds a hashable key identifying a gate application, for use in caches.
+    :param gate_name: The gate name.
+    :param kwargs: The gate's keyword arguments; lists and arrays are converted to tuples.
+    """
+    return gate_name.lower(), tuple(sorted((k, _freeze(v)) for k, v in kwargs.items()))
+
+
+_registry_generation = 0  # Bumped whenever a registered gate is replaced or removed
+
+
+def registry_generation():
+    """
+    :return: A counter that changes whenever an existing gate name is rebound or removed.
+        Caches keyed by gate name compare it to know when their entries are stale.
+    """
+    return _registry_generation
+
+
+def register_gate(name, factory, overwrite=False):
+    """
+    Registers a new named gate so it can be applied through QuantumSimulator.apply_gate.
+    :param name: The gate name (matched case-insensitively).
+    :param factory: A callable taking the gate's keyword arguments and returning a 2x2 matrix.
+    :param overwrite: Whether an existing gate with the same name may be replaced.
+    :raises ValueError: If the name is already registered and overwrite is False.
+    """
+    global _registry_generation
+    name = name.lower()
+    if name in GATE_REGISTRY:
+        if not overwrite:
+            raise ValueError(f"Gate '{name}' is already registered.")
+        _registry_generation += 1
+    GATE_REGISTRY[name] = factory
+
+
+def unregister_gate(name):
+    """
+    Removes a named gate from the registry.
+    :return: True if the gate was registered.
+    """
+    global _registry_generation
+    if GATE_REGISTRY.pop(name.lower(), None) is None:
+        return False
+    _registry_generation += 1
+    return True
+
+
+def resolve_gate(gate_name, **kwargs):
+    """
+    Looks up a gate by name in the registry and builds its matrix.
+    :raises ValueError: If the gate name is unknown.
+    """
+    factory = GATE_REGISTRY.get(gate_name.lower())
+    if factory is None:
+        raise ValueError(f"Unknown gate name: {gate_name}")
+    return factory(**kwargs)
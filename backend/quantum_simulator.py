@@ -1,5 +1,19 @@
-from qubit_state import QubitState
-from quantum_gates import QuantumGates
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from gate_animation import TRAJECTORY_CACHE
+from instrumentation import Instrumentation
+from measurement import (SHOT_CHUNK_SIZE, MeasurementResult, StreamingHistogram,
+                         iter_shots, outcome_probabilities, sample_counts)
+from qubit_state import PRESETS, QubitState, QubitStateBatch
+from quantum_gates import PARAMETRIC_GATE_STACKS, QuantumGates, gate_key, registry_generation, resolve_gate
+from state_history import StateHistory
+from state_library import StateLibrary
+
+# Result of a parameter sweep; every field is an array with the shape of the sweep grid.
+SweepResult = namedtuple("SweepResult", ["theta", "phi", "x", "y", "z"])
+
 
 class QuantumSimulator:
     """
@@ -8,7 +22,7 @@ class QuantumSimulator:
     Provides functionality for:
     - Applying standard and parametric quantum gates
     - Resetting the qubit to common preset states
-    - Undoing operations with a history stack
+    - Undoing and redoing operations with a bounded history timeline
     - Saving and loading custom qubit states by name
     - Retrieving the qubit's state vector and Bloch sphere coordinates
 
@@ -16,8 +30,9 @@ class QuantumSimulator:
     interface for managing quantum state for the frontend.
     """
     _instance = None  # Singleton instance
+    circuit_cache_size = 256  # Maximum number of compiled circuits kept
 
-    def __new__(cls):
+    def __new__(cls, *args, **kwargs):
         """
         Ensures that only one instance of the QuantumSimulator is created.
         :return: The single instance of the QuantumSimulator.
@@ -27,17 +42,23 @@ class QuantumSimulator:
             cls._instance._initialized = False
         return cls._instance
 
-    def __init__(self):
+    def __init__(self, history_capacity=10000, history_eviction="drop_oldest"):
         """
         Initializes the QuantumSimulator instance with a qubit in the |0> state, 
-        a history stack for undo operations, and a dictionary for saving states.
+        a history timeline for undo/redo operations, and a dictionary for saving states.
+        :param history_capacity: Maximum number of states kept in the undo/redo timeline.
+        :param history_eviction: What to do when the timeline is full, "drop_oldest" or "raise".
         """
         if self._initialized:
             return
         self.qubit = QubitState()
-        self.history = []
-        self.redo_stack = []
-        self.saved_states = {}  # name -> (alpha, beta)
+        self.history = StateHistory(history_capacity, history_eviction)
+        self.saved_states = StateLibrary()  # name -> (alpha, beta)
+        self.last_state_name = None  # name given to the most recent save_state
+        self._circuit_cache = OrderedDict()  # circuit key -> fused 2x2 unitary
+        self._circuit_cache_generation = registry_generation()
+        self.metrics = Instrumentation(self)
+        self.rng = np.random.default_rng()
         self._initialized = True
 
     def reset(self, preset="zero"):
@@ -46,9 +67,11 @@ class QuantumSimulator:
         :param preset: The name of the preset state (default is "zero").
 
         Supported states include: zero, one, plus, minus, i_plus, i_minus.
+        :raises ValueError: If the preset is unknown; the history is left unchanged.
         """
-        self.history.append((self.qubit.alpha, self.qubit.beta))
-        self.redo_stack.clear()
+        if preset not in PRESETS:
+            raise ValueError(f"Unknown preset {preset}")
+        self.history.push(self.qubit.alpha, self.qubit.beta)
         self.qubit.set_preset(preset)
 
     def apply_gate(self, gate_name, **kwargs):
@@ -58,47 +81,199 @@ class QuantumSimulator:
         :param kwargs: Additional arguments required by the gate (e.g., theta for rotation gates).
 
         Supported gates include: identity, pauli_x, pauli_y, pauli_z, hadamard, phase, t, 
-        rotation_x, rotation_y, rotation_z.
+        rotation_x, rotation_y, rotation_z, plus gates added with quantum_gates.register_gate
+        or custom_gates.CUSTOM_GATES (which skip re-validating their matrices).
+        :raises ValueError: If the gate name is unknown; the history is left unchanged.
         """
-        self.history.append((self.qubit.alpha, self.qubit.beta))
-        self.redo_stack.clear()
         gate = self._get_gate_by_name(gate_name, **kwargs)
+        self.history.push(self.qubit.alpha, self.qubit.beta)
         self.qubit.apply_gate(gate)
 
+    def compile_circuit(self, circuit):
+        """
+        Fuses a gate sequence into a single 2x2 unitary.
+        Compiled circuits are cached, so compiling the same sequence again is a dictionary lookup.
+        :param circuit: A list of entries in application order. Each entry is either a gate name
+            or a (gate_name, kwargs) tuple, e.g. [("hadamard", {}), ("rotation_z", {"theta": 0.5})].
+        :return: The 2x2 unitary equivalent to applying every gate in order.
+        :raises ValueError: If any gate name is unknown.
+        """
+        entries = [self._normalize_circuit_entry(entry) for entry in circuit]
+        key = tuple(gate_key(name, kwargs) for name, kwargs in entries)
+        if self._circuit_cache_generation != registry_generation():
+            # A gate name was rebound or removed, so cached products may be stale.
+            self._circuit_cache.clear()
+            self._circuit_cache_generation = registry_generation()
+        fused = self._circuit_cache.get(key)
+        if fused is not None:
+            self._circuit_cache.move_to_end(key)
+            return fused
+        fused = QuantumGates.identity()
+        for name, kwargs in entries:
+            fused = self._get_gate_by_name(name, **kwargs) @ fused
+        fused.setflags(write=False)
+        self._circuit_cache[key] = fused
+        if len(self._circuit_cache) > self.circuit_cache_size:
+            self._circuit_cache.popitem(last=False)
+        return fused
+
+    def compile_circuit_zyz(self, circuit):
+        """
+        Compiles a gate sequence into its ZYZ Euler-angle form.
+        :param circuit: A gate sequence as accepted by compile_circuit.
+        :return: A tuple (phase, phi, theta, lam) with U = exp(i*phase) Rz(phi) Ry(theta) Rz(lam).
+        """
+        return QuantumGates.zyz_decomposition(self.compile_circuit(circuit))
+
+    def apply_circuit(self, circuit):
+        """
+        Applies a whole gate sequence as one fused unitary.
+        The sequence costs a single matrix-vector product and records a single history entry,
+        so one undo reverts the entire circuit.
+        :param circuit: A gate sequence as accepted by compile_circuit.
+        """
+        gate = self.compile_circuit(circuit)
+        self.history.push(self.qubit.alpha, self.qubit.beta)
+        self.qubit.apply_gate(gate)
+
+    def sweep(self, gate_name, thetas, start_state=None):
+        """
+        Evaluates a parametric gate for many angles in one vectorized pass.
+        The simulator state and history are left untouched.
+        :param gate_name: A parametric gate name (rotation_x, rotation_y or rotation_z).
+        :param thetas: Array of angles to evaluate.
+        :param start_state: None for the current state, a preset name, or an (alpha, beta) pair.
+        :return: A SweepResult of (theta, phi, x, y, z) arrays with the shape of thetas.
+        """
+        return self.sweep_grid([gate_name], [thetas], start_state)
+
+    def sweep_grid(self, template, axes, start_state=None):
+        """
+        Evaluates a short gate template on the full grid of its parameters.
+        Gates are applied in template order. Each parametric gate consumes one entry of axes;
+        fixed gates (e.g. "hadamard") consume none. For example
+        sweep_grid(["rotation_z", "rotation_x"], [b, a]) evaluates Rx(a) @ Rz(b) |psi>
+        on a len(b) x len(a) grid.
+        :param template: List of gate names in application order.
+        :param axes: One 1-D array of angles per parametric gate in the template.
+        :param start_state: None for the current state, a preset name, or an (alpha, beta) pair.
+        :return: A SweepResult of arrays shaped like the grid.
+        :raises ValueError: If the number of axes does not match the parametric gates.
+        """
+        template = [name.lower() for name in template]
+        axes = [np.atleast_1d(np.asarray(axis, dtype=float)) for axis in axes]
+        parametric = [name for name in template if name in PARAMETRIC_GATE_STACKS]
+        if len(parametric) != len(axes):
+            raise ValueError(
+                f"Template has {len(parametric)} parametric gates but {len(axes)} axes were given.")
+        grid = np.meshgrid(*axes, indexing="ij") if axes else []
+        shape = grid[0].shape if grid else ()
+
+        alpha, beta = self._resolve_start_state(start_state)
+        batch = QubitStateBatch(int(np.prod(shape)), alpha, beta)
+        axis_index = 0
+        for name in template:
+            if name in PARAMETRIC_GATE_STACKS:
+                batch.apply_gate(PARAMETRIC_GATE_STACKS[name](grid[axis_index].ravel()))
+                axis_index += 1
+            else:
+                batch.apply_gate(self._get_gate_by_name(name))
+
+        theta, phi = batch.get_bloch_vector()
+        x, y, z = batch.get_bloch_cartesian()
+        return SweepResult(*(values.reshape(shape) for values in (theta, phi, x, y, z)))
+
+    def gate_trajectory(self, gate_name, frames=60, start_state=None, **kwargs):
+        """
+        Computes the path a gate traces on the Bloch sphere, for animating it.
+        The simulator state and history are left untouched; trajectories are cached.
+        :param gate_name: Any gate name accepted by apply_gate.
+        :param frames: Number of points, from the start state to the final state inclusive.
+        :param start_state: None for the current state, a preset name, or an (alpha, beta) pair.
+        :param kwargs: Gate arguments (e.g. theta).
+        :return: A read-only (frames, 3) array of Cartesian Bloch vectors.
+        """
+        alpha, beta = self._resolve_start_state(start_state)
+        return TRAJECTORY_CACHE.get(gate_name, kwargs, QubitState(alpha, beta), frames)
+
+    def _resolve_start_state(self, start_state):
+        if start_state is None:
+            return self.qubit.alpha, self.qubit.beta
+        if isinstance(start_state, str):
+            if start_state not in PRESETS:
+                raise ValueError(f"Unknown preset {start_state}")
+            return PRESETS[start_state]
+        alpha, beta = start_state
+        return alpha, beta
+
+    @staticmethod
+    def _normalize_circuit_entry(entry):
+        if isinstance(entry, str):
+            return entry.lower(), {}
+        if len(entry) == 1:
+            return entry[0].lower(), {}
+        name, kwargs = entry
+        return name.lower(), dict(kwargs or {})
+
     def undo(self):
         """
         Undoes the last operation (either gate or reset) by restoring the previous qubit state.
         """
-        if self.history:
-            self.redo_stack.append((self.qubit.alpha, self.qubit.beta))
-            alpha, beta = self.history.pop()
-            self.qubit.alpha = alpha
-            self.qubit.beta = beta
+        state = self.history.undo(self.qubit.alpha, self.qubit.beta)
+        if state is not None:
+            self.qubit.set_amplitudes(*state)
         else:
             print("No more undos available!")
 
     def redo(self):
-        if self.redo_stack:
-            self.history.append((self.qubit.alpha, self.qubit.beta))
-            alpha, beta = self.redo_stack.pop()
-            self.qubit.alpha = alpha
-            self.qubit.beta = beta
+        state = self.history.redo(self.qubit.alpha, self.qubit.beta)
+        if state is not None:
+            self.qubit.set_amplitudes(*state)
         else:
             print("No more redos available!")
 
+    def history_len(self):
+        """
+        Returns the length of the undo/redo timeline, including the current state.
+        Valid indices for jump_to are 0 .. history_len() - 1.
+        """
+        return self.history.timeline_len()
+
+    def history_position(self):
+        """
+        Returns the timeline index of the current state.
+        """
+        return self.history.position
+
+    def jump_to(self, index):
+        """
+        Restores the state at any point of the undo/redo timeline in O(1).
+        States after the new position stay available for redo until the next operation.
+        :param index: Timeline index; negative indices count from the end.
+        :raises IndexError: If the index is outside the timeline.
+        """
+        self.qubit.set_amplitudes(*self.history.jump_to(index, self.qubit.alpha, self.qubit.beta))
+
+    def checkpoint(self, name):
+        """
+        Marks the current point of the timeline under a name.
+        """
+        self.history.checkpoint(name)
+
+    def restore_checkpoint(self, name):
+        """
+        Jumps back (or forward) to a named checkpoint.
+        :raises KeyError: If the checkpoint does not exist or has been evicted.
+        """
+        self.jump_to(self.history.checkpoint_index(name))
+
     def save_state(self, name):
         """
         Saves the current qubit state under a specific name.
         If a state with the same name already exists, a versioned name is used automatically (e.g., "state_1", "state_2").
         :param name: The name to save the current state under.
         """
-        if name in self.saved_states:
-            version = 1
-            while f"{name}_{version}" in self.saved_states:
-                version += 1
-            name = f"{name}_{version}"
-        self.saved_states[name] = (self.qubit.alpha, self.qubit.beta)
-        self.last_state_name = name
+        self.last_state_name = self.saved_states.save(name, self.qubit.alpha, self.qubit.beta)
 
     def load_state(self, name):
         """
@@ -108,12 +283,99 @@ class QuantumSimulator:
         """
         if name in self.saved_states:
             alpha, beta = self.saved_states[name]
-            self.history.append((self.qubit.alpha, self.qubit.beta))
-            self.qubit.alpha = alpha
-            self.qubit.beta = beta
+            self.history.push(self.qubit.alpha, self.qubit.beta)
+            self.qubit.set_amplitudes(alpha, beta)
         else:
             print(f"No saved state named '{name}'")
 
+    def export_states(self, path):
+        """
+        Writes all saved states to a directory (states.npy plus a JSON name index).
+        :param path: The directory to write to.
+        """
+        self.saved_states.dump(path)
+
+    def import_states(self, path):
+        """
+        Replaces the saved states with a library previously written by export_states.
+        The state array is memory-mapped, so even very large libraries load immediately.
+        :param path: The directory to read from.
+        """
+        self.saved_states = StateLibrary.open(path)
+
+    def seed(self, seed):
+        """
+        Reseeds the random generator used by measure, for reproducible shot statistics.
+        """
+        self.rng = np.random.default_rng(seed)
+
+    def measure(self, basis="z", shots=1024, return_shots=False, chunk_size=None):
+        """
+        Samples measurement outcomes of the current state without collapsing it.
+        Counts come from a single binomial draw, so the cost does not depend on the shot count.
+        When individual shots are requested they are generated in chunks, tallied as they go and
+        written into one preallocated uint8 array, so the only temporaries are one chunk in size.
+        :param basis: "z", "x" or "y".
+        :param shots: Number of measurement shots.
+        :param return_shots: Whether to also return the per-shot outcomes as a uint8 array.
+        :param chunk_size: Shots drawn per chunk when return_shots is set (default SHOT_CHUNK_SIZE).
+        :return: A MeasurementResult.
+        :raises ValueError: If the basis is unknown.
+        """
+        probabilities = outcome_probabilities(self.get_state_vector(), basis)
+        outcomes = None
+        if return_shots:
+            histogram = StreamingHistogram()
+            outcomes = np.empty(shots, dtype=np.uint8)
+            start = 0
+            for chunk in iter_shots(probabilities[0], shots, self.rng, chunk_size or SHOT_CHUNK_SIZE):
+                histogram.update(chunk)
+                outcomes[start:start + len(chunk)] = chunk
+                start += len(chunk)
+            counts = histogram.counts
+        else:
+            counts = sample_counts(probabilities[0], shots, self.rng)
+        return MeasurementResult(basis.lower(), shots, counts, probabilities,
+                                 (counts[0] - counts[1]) / max(shots, 1), outcomes)
+
+    def stream_measurements(self, basis="z", shots=1024, chunk_size=None):
+        """
+        Yields per-shot outcomes of the current state in chunks, holding at most one chunk in memory.
+        Feed the chunks to a measurement.StreamingHistogram to aggregate them.
+        """
+        probabilities = outcome_probabilities(self.get_state_vector(), basis)
+        return iter_shots(probabilities[0], shots, self.rng, chunk_size or SHOT_CHUNK_SIZE)
+
+    def measure_batch(self, states, basis="z", shots=1024):
+        """
+        Samples outcome counts for many states at once.
+        :param states: An (N, 2) array of [alpha, beta] rows (e.g. QubitStateBatch.states).
+        :param basis: "z", "x" or "y".
+        :param shots: Shots per state.
+        :return: An (N, 2) int array of [count(0), count(1)] per state.
+        """
+        probabilities = outcome_probabilities(states, basis)
+        return sample_counts(probabilities[:, 0], shots, self.rng)
+
+    def enable_metrics(self):
+        """
+        Starts recording per-operation call counts and latency histograms.
+        Metrics are off by default and cost nothing until enabled.
+        """
+        self.metrics.enable()
+
+    def disable_metrics(self):
+        """
+        Stops recording metrics; the values collected so far are kept.
+        """
+        self.metrics.disable()
+
+    def stats(self):
+        """
+        Returns a snapshot of the recorded metrics (see Instrumentation.stats).
+        """
+        return self.metrics.stats()
+
     def get_state_vector(self):
         """
         Retrieves the current state vector of the qubit.
@@ -128,39 +390,20 @@ class QuantumSimulator:
         """
         return self.qubit.get_bloch_vector()
 
+    def get_bloch_cartesian(self):
+        """
+        Retrieves the current Bloch vector in Cartesian form.
+        :return: A tuple (x, y, z) on the unit sphere.
+        """
+        return self.qubit.get_bloch_cartesian()
+
     def _get_gate_by_name(self, gate_name, **kwargs):
         """
         Helper function to retrieve the appropriate quantum gate by name.
+        Gates are looked up in quantum_gates.GATE_REGISTRY; new gates can be added with register_gate.
         :param gate_name: The name of the quantum gate to retrieve (e.g., "identity", "pauli_x").
         :param kwargs: Additional arguments for gates that require them (e.g., theta for rotation gates).
         :return: A QuantumGate object corresponding to the specified gate name.
         :raises ValueError: If the gate name is unknown.
         """
-        gate_name = gate_name.lower()
-        if gate_name == "identity":
-            return QuantumGates.identity()
-        elif gate_name == "pauli_x":
-            return QuantumGates.pauli_x()
-        elif gate_name == "pauli_y":
-            return QuantumGates.pauli_y()
-        elif gate_name == "pauli_z":
-            return QuantumGates.pauli_z()
-        elif gate_name == "hadamard":
-            return QuantumGates.hadamard()
-        elif gate_name == "phase":
-            return QuantumGates.phase()
-        elif gate_name == "t":
-            return QuantumGates.t_gate()
-        elif gate_name == "rotation_x":
-            theta = kwargs.get("theta", 0)
-            return QuantumGates.rotation_x(theta)
-        elif gate_name == "rotation_y":
-            theta = kwargs.get("theta", 0)
-            return QuantumGates.rotation_y(theta)
-        elif gate_name == "rotation_z":
-            theta = kwargs.get("theta", 0)
-            return QuantumGates.rotation_z(theta)
-        elif gate_name == "custom":
-            return QuantumGates.custom_gate(kwargs.get("matrix"))
-        else:
-            raise ValueError(f"Unknown gate name: {gate_name}")
+        return resolve_gate(gate_name, **kwargs)
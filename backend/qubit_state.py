@@ -1,53 +1,233 @@
 import numpy as np
 
+PRESETS = {
+    "zero": (1+0j, 0+0j),
+    "one": (0+0j, 1+0j),
+    "plus": (1/np.sqrt(2), 1/np.sqrt(2)),
+    "minus": (1/np.sqrt(2), -1/np.sqrt(2)),
+    "i_plus": (1/np.sqrt(2), 1j/np.sqrt(2)),
+    "i_minus": (1/np.sqrt(2), -1j/np.sqrt(2)),
+}
+
+PRECISIONS = {"double": np.complex128, "single": np.complex64}
+
+
+def precision_dtype(dtype):
+    """
+    Resolves a precision name ("single", "double") or dtype to complex64 or complex128.
+    :raises ValueError: For any other dtype.
+    """
+    dtype = np.dtype(PRECISIONS.get(dtype, dtype))
+    if dtype not in (np.complex64, np.complex128):
+        raise ValueError(f"Unsupported precision {dtype}; use complex64 or complex128.")
+    return dtype
+
+
 class QubitState:
-    def __init__(self, alpha=1+0j, beta=0+0j):
-        self.alpha = alpha
-        self.beta = beta
-        self.normalize()
+    def __init__(self, alpha=1+0j, beta=0+0j, dtype=np.complex128, renormalize_every=1, drift_tolerance=None):
+        """
+        :param dtype: Amplitude precision, complex128 ("double") or complex64 ("single").
+        :param renormalize_every: Renormalize after every K-th gate instead of after each one.
+        :param drift_tolerance: Also renormalize as soon as the drift | |psi|^2 - 1 | exceeds this value.
+        """
+        self.dtype = precision_dtype(dtype)
+        self.renormalize_every = renormalize_every
+        self.drift_tolerance = drift_tolerance
+        self.max_drift = 0.0  # Largest drift | |psi|^2 - 1 | removed by a renormalization
+        self.renormalizations = 0
+        self._pending_gates = 0
+        self.set_state(alpha, beta)
 
     def normalize(self):
+        norm = self._rescale()
+        self.max_drift = max(self.max_drift, float(abs(norm**2 - 1)))
+        self.renormalizations += 1
+
+    def _rescale(self):
         norm = np.sqrt(abs(self.alpha)**2 + abs(self.beta)**2)
         if norm == 0:
             raise ValueError("Qubit has zero norm!")
         self.alpha /= norm
         self.beta /= norm
+        self._pending_gates = 0
+        return norm
+
+    def norm_drift(self):
+        """
+        :return: The drift | |psi|^2 - 1 | accumulated since the last renormalization.
+        """
+        return float(abs(abs(self.alpha)**2 + abs(self.beta)**2 - 1))
 
     def apply_gate(self, gate_matrix):
-        vec = np.array([self.alpha, self.beta])
-        result = np.dot(gate_matrix, vec)
+        vec = np.array([self.alpha, self.beta], dtype=self.dtype)
+        result = np.dot(np.asarray(gate_matrix, dtype=self.dtype), vec)
         self.alpha, self.beta = result[0], result[1]
-        self.normalize()
+        self._pending_gates += 1
+        if self._pending_gates >= self.renormalize_every or (
+                self.drift_tolerance is not None and self.norm_drift() > self.drift_tolerance):
+            self.normalize()
 
     def get_state_vector(self):
         return np.array([self.alpha, self.beta])
 
     def set_state(self, alpha, beta):
-        self.alpha = alpha
-        self.beta = beta
-        self.normalize()
+        self.set_amplitudes(alpha, beta)
+        self._rescale()
+
+    def set_amplitudes(self, alpha, beta):
+        """
+        Sets amplitudes recorded earlier (history, saved states) in this state's precision,
+        without renormalizing them.
+        """
+        self.alpha = self.dtype.type(alpha)
+        self.beta = self.dtype.type(beta)
 
     def set_preset(self, preset_name):
-        if preset_name == "zero":
-            self.set_state(1+0j, 0+0j)
-        elif preset_name == "one":
-            self.set_state(0+0j, 1+0j)
-        elif preset_name == "plus":
-            self.set_state(1/np.sqrt(2), 1/np.sqrt(2))
-        elif preset_name == "minus":
-            self.set_state(1/np.sqrt(2), -1/np.sqrt(2))
-        elif preset_name == "i_plus":
-            self.set_state(1/np.sqrt(2), 1j/np.sqrt(2))
-        elif preset_name == "i_minus":
-            self.set_state(1/np.sqrt(2), -1j/np.sqrt(2))
-        else:
+        if preset_name not in PRESETS:
             raise ValueError(f"Unknown preset {preset_name}")
+        self.set_state(*PRESETS[preset_name])
 
     def get_bloch_vector(self):
         # |ψ⟩ = cos(θ/2) |0⟩ + exp(iφ) sin(θ/2) |1⟩
-        theta = 2 * np.arccos(np.abs(self.alpha))
+        # Amplitudes may carry a small norm drift between renormalizations
+        norm = np.sqrt(abs(self.alpha)**2 + abs(self.beta)**2)
+        theta = 2 * np.arccos(min(abs(self.alpha) / norm, 1.0))
         if abs(self.beta) > 1e-12:  # avoid division by zero
             phi = np.angle(self.beta) - np.angle(self.alpha)  # φ is the relative phase between α and β
         else:
             phi = 0
-        return theta, phi
\ No newline at end of file
+        return theta, phi
+
+    def get_bloch_cartesian(self):
+        norm2 = abs(self.alpha)**2 + abs(self.beta)**2
+        coherence = np.conj(self.alpha) * self.beta / norm2
+        return 2 * coherence.real, 2 * coherence.imag, (abs(self.alpha)**2 - abs(self.beta)**2) / norm2
+
+
+class QubitStateBatch:
+    """
+    N independent qubits stored as one contiguous (N, 2) complex array.
+
+    Mirrors the QubitState API, but every method operates on all N states at
+    once with vectorized NumPy instead of a Python loop over QubitState objects.
+    """
+
+    def __init__(self, n, alpha=1+0j, beta=0+0j, dtype=np.complex128, renormalize_every=1,
+                 drift_tolerance=None):
+        """
+        :param n: Number of qubits in the batch.
+        :param alpha: Scalar or length-N array of |0> amplitudes.
+        :param beta: Scalar or length-N array of |1> amplitudes.
+        :param dtype: Amplitude precision; complex64 ("single") halves the memory of large batches.
+        :param renormalize_every: Renormalize after every K-th gate instead of after each one.
+        :param drift_tolerance: Also renormalize as soon as any qubit's drift | |psi|^2 - 1 |
+            exceeds this value.
+        """
+        self.dtype = precision_dtype(dtype)
+        self.renormalize_every = renormalize_every
+        self.drift_tolerance = drift_tolerance
+        self.max_drift = 0.0  # Largest drift | |psi|^2 - 1 | removed by a renormalization, over all qubits
+        self.renormalizations = 0
+        self._pending_gates = 0
+        self.states = np.empty((n, 2), dtype=self.dtype)
+        self.set_state(alpha, beta)
+
+    @classmethod
+    def from_states(cls, states, **kwargs):
+        """
+        Builds a batch from an existing (N, 2) array of [alpha, beta] rows.
+        :param states: Array-like of shape (N, 2).
+        :param kwargs: Precision and renormalization options, as for the constructor.
+        :return: A normalized QubitStateBatch holding a copy of the states.
+        """
+        states = np.asarray(states)
+        if states.ndim != 2 or states.shape[1] != 2:
+            raise ValueError("States must have shape (N, 2).")
+        return cls(states.shape[0], states[:, 0], states[:, 1], **kwargs)
+
+    def __len__(self):
+        return self.states.shape[0]
+
+    @property
+    def alpha(self):
+        return self.states[:, 0]
+
+    @property
+    def beta(self):
+        return self.states[:, 1]
+
+    def normalize(self):
+        norm = self._rescale()
+        if len(norm):
+            self.max_drift = max(self.max_drift, float(np.max(np.abs(norm**2 - 1))))
+        self.renormalizations += 1
+
+    def _rescale(self):
+        norm = np.sqrt(self._norm_squared())
+        if np.any(norm == 0):
+            raise ValueError("Qubit has zero norm!")
+        self.states /= norm[:, None]
+        self._pending_gates = 0
+        return norm
+
+    def _norm_squared(self):
+        real, imag = self.states.real, self.states.imag
+        return real[:, 0]**2 + imag[:, 0]**2 + real[:, 1]**2 + imag[:, 1]**2
+
+    def norm_drift(self):
+        """
+        :return: The largest drift | |psi|^2 - 1 | over the batch since the last renormalization.
+        """
+        return float(np.max(np.abs(self._norm_squared() - 1), initial=0.0))
+
+    def apply_gate(self, gate_matrix):
+        """
+        Applies a gate to every qubit in the batch.
+        :param gate_matrix: Either one shared 2x2 gate or an (N, 2, 2) stack
+            holding a separate gate for each qubit.
+        """
+        gate_matrix = np.asarray(gate_matrix, dtype=self.dtype)
+        if gate_matrix.shape == (2, 2):
+            # Row-vector form of G @ v for every row at once.
+            self.states = np.ascontiguousarray(self.states @ gate_matrix.T)
+        elif gate_matrix.shape == (len(self), 2, 2):
+            self.states = np.matmul(gate_matrix, self.states[:, :, None])[:, :, 0]
+        else:
+            raise ValueError(
+                f"Gate must have shape (2, 2) or ({len(self)}, 2, 2), got {gate_matrix.shape}.")
+        self._pending_gates += 1
+        if self._pending_gates >= self.renormalize_every or (
+                self.drift_tolerance is not None and self.norm_drift() > self.drift_tolerance):
+            self.normalize()
+
+    def get_state_vector(self):
+        return self.states.copy()
+
+    def set_state(self, alpha, beta):
+        self.states[:, 0] = alpha
+        self.states[:, 1] = beta
+        self._rescale()
+
+    def set_preset(self, preset_name):
+        if preset_name not in PRESETS:
+            raise ValueError(f"Unknown preset {preset_name}")
+        self.set_state(*PRESETS[preset_name])
+
+    def get_bloch_vector(self):
+        """
+        :return: Arrays (theta, phi), each of length N, using the same convention
+            as QubitState.get_bloch_vector.
+        """
+        alpha, beta = self.states[:, 0], self.states[:, 1]
+        theta = 2 * np.arccos(np.clip(np.abs(alpha) / np.sqrt(self._norm_squared()), 0.0, 1.0))
+        phi = np.where(np.abs(beta) > 1e-12, np.angle(beta) - np.angle(alpha), 0.0)
+        return theta, phi
+
+    def get_bloch_cartesian(self):
+        """
+        :return: Arrays (x, y, z), each of length N, on the unit Bloch sphere.
+        """
+        alpha, beta = self.states[:, 0], self.states[:, 1]
+        norm2 = self._norm_squared()
+        coherence = np.conj(alpha) * beta / norm2
+        return 2 * coherence.real, 2 * coherence.imag, (np.abs(alpha)**2 - np.abs(beta)**2) / norm2
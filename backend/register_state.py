@@ -0,0 +1,239 @@
+import numpy as np
+
+from quantum_gates import PAULI_X, PAULI_Z, resolve_gate
+from qubit_state import precision_dtype
+
+MAX_QUBITS = 24  # 2^24 complex128 amplitudes take 256 MB
+
+
+class RegisterState:
+    """
+    An n-qubit pure state stored as a (2,) * n complex array, one axis per qubit (qubit 0 is
+    the most significant bit of the flat state vector).
+
+    Single-qubit gates update the two halves of the array along the target axis in place,
+    controlled gates do the same on the control=1 slice only, and general two-qubit gates
+    contract a (2, 2, 2, 2) tensor against two axes, so no 2^n x 2^n matrix is ever built.
+    Consecutive single-qubit gates on the same qubit are multiplied into one pending 2x2
+    matrix and only applied when another operation touches that qubit or the state is read.
+    """
+
+    def __init__(self, n_qubits, dtype=np.complex128):
+        """
+        :param dtype: Amplitude precision, complex128 ("double") or complex64 ("single").
+        :raises ValueError: For an out-of-range qubit count or a non-complex dtype.
+        """
+        if not 1 <= n_qubits <= MAX_QUBITS:
+            raise ValueError(f"Number of qubits must be between 1 and {MAX_QUBITS}.")
+        self.n_qubits = n_qubits
+        self.state = np.zeros((2,) * n_qubits, dtype=precision_dtype(dtype))
+        self.state[(0,) * n_qubits] = 1
+        self._pending = {}  # qubit -> fused 2x2 gate not yet applied
+
+    def _check_qubit(self, qubit):
+        if not 0 <= qubit < self.n_qubits:
+            raise ValueError(f"Qubit index {qubit} out of range for {self.n_qubits} qubits.")
+
+    def apply_gate(self, gate_matrix, qubit):
+        """
+        Queues a single-qubit gate; it is fused with any other gates pending on the same qubit.
+        """
+        self._check_qubit(qubit)
+        gate_matrix = np.asarray(gate_matrix)
+        pending = self._pending.get(qubit)
+        self._pending[qubit] = gate_matrix if pending is None else gate_matrix @ pending
+
+    def flush(self, *qubits):
+        """
+        Applies pending fused gates, on the given qubits or on all of them.
+        """
+        for qubit in qubits or list(self._pending):
+            gate_matrix = self._pending.pop(qubit, None)
+            if gate_matrix is not None:
+                _apply_on_axis(self.state, gate_matrix, qubit)
+
+    def apply_controlled(self, gate_matrix, control, target):
+        """
+        Applies a single-qubit gate to target on the part of the state where control is |1>.
+        """
+        self._check_qubit(control)
+        self._check_qubit(target)
+        if control == target:
+            raise ValueError("Control and target must be different qubits.")
+        self.flush(control, target)
+        index = [slice(None)] * self.n_qubits
+        index[control] = 1
+        _apply_on_axis(self.state[tuple(index)], np.asarray(gate_matrix), target - (target > control))
+
+    def apply_two_qubit_gate(self, gate_matrix, first, second):
+        """
+        Applies a 4x4 gate in the |first second> basis (first is the more significant bit).
+        """
+        self._check_qubit(first)
+        self._check_qubit(second)
+        if first == second:
+            raise ValueError("A two-qubit gate needs two different qubits.")
+        self.flush(first, second)
+        tensor = np.asarray(gate_matrix).reshape(2, 2, 2, 2)
+        result = np.tensordot(tensor, self.state, axes=([2, 3], [first, second]))
+        self.state[...] = np.moveaxis(result, [0, 1], [first, second])
+
+    def cnot(self, control, target):
+        self.apply_controlled(PAULI_X, control, target)
+
+    def cz(self, control, target):
+        self.apply_controlled(PAULI_Z, control, target)
+
+    def swap(self, first, second):
+        self._check_qubit(first)
+        self._check_qubit(second)
+        self.flush(first, second)
+        self.state = np.ascontiguousarray(np.swapaxes(self.state, first, second))
+
+    def normalize(self):
+        norm = np.linalg.norm(self.state)
+        if norm == 0:
+            raise ValueError("Register has zero norm!")
+        self.state /= norm
+
+    def get_state_vector(self):
+        """
+        :return: The flat length-2^n state vector (a copy).
+        """
+        self.flush()
+        return self.state.reshape(-1).copy()
+
+    def reduced_density_matrix(self, qubit):
+        """
+        :return: The 2x2 density matrix of one qubit, with every other qubit traced out.
+        """
+        self._check_qubit(qubit)
+        self.flush()
+        amplitudes = np.moveaxis(self.state, qubit, 0).reshape(2, -1)
+        return amplitudes @ amplitudes.conj().T
+
+    def get_bloch_cartesian(self, qubit=0):
+        """
+        :return: (x, y, z) of one qubit's reduced state; inside the unit ball when the qubit is entangled.
+        """
+        rho = self.reduced_density_matrix(qubit)
+        return 2 * rho[1, 0].real, 2 * rho[1, 0].imag, (rho[0, 0] - rho[1, 1]).real
+
+    def get_bloch_vectors(self):
+        """
+        :return: An (n, 3) array holding every qubit's reduced Bloch vector.
+        """
+        return np.array([self.get_bloch_cartesian(qubit) for qubit in range(self.n_qubits)])
+
+    def get_bloch_vector(self, qubit=0):
+        """
+        :return: (theta, phi) of the direction of one qubit's reduced Bloch vector.
+        """
+        x, y, z = self.get_bloch_cartesian(qubit)
+        radius = np.sqrt(x**2 + y**2 + z**2)
+        if radius < 1e-12:
+            return 0.0, 0.0
+        return np.arccos(np.clip(z / radius, -1.0, 1.0)), np.arctan2(y, x)
+
+
+def _apply_on_axis(state, gate_matrix, axis):
+    # Update the |0> and |1> halves along the axis in place (basic indexing keeps them views).
+    zero, one = state[(slice(None),) * axis + (0,)], state[(slice(None),) * axis + (1,)]
+    saved = zero.copy()
+    zero *= gate_matrix[0, 0]
+    zero += gate_matrix[0, 1] * one
+    one *= gate_matrix[1, 1]
+    one += gate_matrix[1, 0] * saved
+
+
+class RegisterSimulator:
+    """
+    An n-qubit counterpart of QuantumSimulator: gates are applied by name, with a qubit index,
+    and every operation can be undone and redone. Undo applies the inverse (conjugate transpose)
+    of the recorded gate, so history costs a few matrices per step instead of a state copy.
+    """
+
+    TWO_QUBIT_GATES = ("cnot", "cz", "swap")
+
+    def __init__(self, n_qubits, dtype=np.complex128):
+        self.register = RegisterState(n_qubits, dtype)
+        self._undo_stack = []
+        self._redo_stack = []
+
+    @property
+    def n_qubits(self):
+        return self.register.n_qubits
+
+    def reset(self):
+        self.register = RegisterState(self.n_qubits, self.register.state.dtype)
+        self._undo_stack.clear()
+        self._redo_stack.clear()
+
+    def apply_gate(self, gate_name, qubit=0, **kwargs):
+        """
+        Applies a registered single-qubit gate, or cnot/cz/swap, by name.
+        :param gate_name: Any name known to quantum_gates.resolve_gate, or "cnot", "cz", "swap".
+        :param qubit: Target qubit for single-qubit gates.
+        :param kwargs: Gate arguments (e.g. theta); two-qubit gates take control/target or
+            first/second.
+        :raises ValueError: If the gate name is unknown or the qubit indices are invalid.
+        """
+        name = gate_name.lower()
+        if name in self.TWO_QUBIT_GATES:
+            keys = ("first", "second") if name == "swap" else ("control", "target")
+            if any(key not in kwargs for key in keys):
+                raise ValueError(f"Gate '{name}' requires '{keys[0]}' and '{keys[1]}' arguments.")
+            op = (name, None, tuple(kwargs[key] for key in keys))
+        else:
+            op = ("single", resolve_gate(name, **kwargs), (qubit,))
+        self._run(op)
+        self._undo_stack.append(op)
+        self._redo_stack.clear()
+
+    def apply_controlled(self, gate_name, control, target, **kwargs):
+        """
+        Applies a registered single-qubit gate to target, controlled on control.
+        """
+        op = ("controlled", resolve_gate(gate_name, **kwargs), (control, target))
+        self._run(op)
+        self._undo_stack.append(op)
+        self._redo_stack.clear()
+
+    def _run(self, op, inverse=False):
+        kind, gate_matrix, qubits = op
+        if gate_matrix is not None and inverse:
+            gate_matrix = gate_matrix.conj().T
+        if kind == "single":
+            self.register.apply_gate(gate_matrix, *qubits)
+        elif kind == "controlled":
+            self.register.apply_controlled(gate_matrix, *qubits)
+        else:
+            getattr(self.register, kind)(*qubits)  # cnot, cz and swap are their own inverses
+
+    def undo(self):
+        if not self._undo_stack:
+            print("No more undos available!")
+            return
+        op = self._undo_stack.pop()
+        self._run(op, inverse=True)
+        self._redo_stack.append(op)
+
+    def redo(self):
+        if not self._redo_stack:
+            print("No more redos available!")
+            return
+        op = self._redo_stack.pop()
+        self._run(op)
+        self._undo_stack.append(op)
+
+    def get_state_vector(self):
+        return self.register.get_state_vector()
+
+    def get_bloch_coordinates(self, qubit=0):
+        """
+        :return: (theta, phi) for one qubit, so the sphere view can display any qubit of the register.
+        """
+        return self.register.get_bloch_vector(qubit)
+
+    def get_bloch_cartesian(self, qubit=0):
+        return self.register.get_bloch_cartesian(qubit)
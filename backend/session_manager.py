@@ -0,0 +1,161 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+
+from quantum_simulator import QuantumSimulator
+from qubit_state import QubitState
+from state_library import StateLibrary
+
+
+class SimulatorSession(QuantumSimulator):
+    """
+    A non-singleton QuantumSimulator owning its own qubit, history and saved states.
+
+    Each session carries a re-entrant lock; callers sharing a session between threads
+    should hold it (SessionManager.session does this for you) while operating on it.
+    """
+
+    def __new__(cls, *args, **kwargs):
+        instance = object.__new__(cls)
+        instance._initialized = False
+        return instance
+
+    def __init__(self, session_id=None, **kwargs):
+        """
+        :param session_id: An identifier for the session.
+        :param kwargs: Passed on to QuantumSimulator (e.g. history_capacity).
+        """
+        super().__init__(**kwargs)
+        self.session_id = session_id
+        self.lock = threading.RLock()
+        self.last_used = time.monotonic()
+
+    def clear(self):
+        """
+        Returns the session to a fresh |0> state with empty history, no saved states, a fresh
+        random stream, an empty circuit cache and metrics switched off and reset, so a recycled
+        session carries nothing from its last user.
+        """
+        self.metrics.stop_periodic_report()
+        self.metrics.disable()
+        self.metrics.reset()
+        self.qubit = QubitState()
+        self.history.clear()
+        self.saved_states = StateLibrary()
+        self.last_state_name = None
+        self._circuit_cache.clear()
+        self.rng = np.random.default_rng()
+
+
+class SessionManager:
+    """
+    Hands out independent SimulatorSessions keyed by session id.
+
+    Sessions are created on first use and kept in least-recently-used order. Idle
+    sessions are evicted after idle_timeout seconds (see evict_idle), and the least
+    recently used idle session is evicted when max_sessions is reached. Evicted sessions
+    are cleared and kept in a small pool so new sessions can reuse their buffers.
+    """
+
+    def __init__(self, max_sessions=1024, idle_timeout=300.0, pool_size=64, **session_kwargs):
+        """
+        :param max_sessions: Maximum number of live sessions.
+        :param idle_timeout: Seconds after which an unused session may be evicted.
+        :param pool_size: Maximum number of cleared sessions kept for reuse.
+        :param session_kwargs: Passed on to every new SimulatorSession.
+        """
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.pool_size = pool_size
+        self.session_kwargs = session_kwargs
+        self._lock = threading.Lock()
+        self._sessions = OrderedDict()  # session id -> SimulatorSession
+        self._active = {}  # session id -> number of callers inside session()
+        self._pool = []
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def __contains__(self, session_id):
+        return session_id in self._sessions
+
+    @contextmanager
+    def session(self, session_id):
+        """
+        Context manager yielding the session for session_id with its lock held.
+        The session is created if it does not exist and cannot be evicted while in use.
+        :raises RuntimeError: If a new session is needed but every live session is in use.
+        """
+        with self._lock:
+            sim = self._get_or_create(session_id)
+            self._active[session_id] = self._active.get(session_id, 0) + 1
+        try:
+            with sim.lock:
+                yield sim
+        finally:
+            with self._lock:
+                sim.last_used = time.monotonic()
+                self._active[session_id] -= 1
+                if not self._active[session_id]:
+                    del self._active[session_id]
+
+    def get(self, session_id):
+        """
+        Returns the session for session_id, creating it if needed, without locking it.
+        """
+        with self._lock:
+            return self._get_or_create(session_id)
+
+    def close(self, session_id):
+        """
+        Removes a session and returns it to the pool.
+        :return: True if the session existed.
+        """
+        with self._lock:
+            if session_id not in self._sessions or session_id in self._active:
+                return False
+            self._release(self._sessions.pop(session_id))
+            return True
+
+    def evict_idle(self, now=None):
+        """
+        Evicts every session that has not been used for idle_timeout seconds.
+        :param now: The current time.monotonic() value (mostly for tests).
+        :return: The number of evicted sessions.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            expired = [session_id for session_id, sim in self._sessions.items()
+                       if now - sim.last_used >= self.idle_timeout and session_id not in self._active]
+            for session_id in expired:
+                self._release(self._sessions.pop(session_id))
+            return len(expired)
+
+    def _get_or_create(self, session_id):
+        sim = self._sessions.get(session_id)
+        if sim is not None:
+            self._sessions.move_to_end(session_id)
+            sim.last_used = time.monotonic()
+            return sim
+        if len(self._sessions) >= self.max_sessions:
+            victim = next((sid for sid in self._sessions if sid not in self._active), None)
+            if victim is None:
+                raise RuntimeError(f"All {self.max_sessions} sessions are in use.")
+            self._release(self._sessions.pop(victim))
+        if self._pool:
+            sim = self._pool.pop()
+            sim.session_id = session_id
+            sim.last_used = time.monotonic()
+        else:
+            sim = SimulatorSession(session_id, **self.session_kwargs)
+        self._sessions[session_id] = sim
+        return sim
+
+    def _release(self, sim):
+        if len(self._pool) < self.pool_size:
+            sim.clear()
+            sim.session_id = None
+            self._pool.append(sim)
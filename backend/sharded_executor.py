@@ -0,0 +1,175 @@
+"""
+Multi-process execution of one gate program over a huge ensemble of independent qubits.
+
+The ensemble lives in a multiprocessing.shared_memory block (SharedEnsemble): an (N, 2)
+complex array of [alpha, beta] rows plus an (N, 3) float array for Bloch coordinates.
+Worker processes attach to the block by name and update their slice in place, so the state
+data is never pickled; only the block name, the slice bounds and the fused 2x2 program
+matrix are sent to the workers.
+
+Usage: python sharded_executor.py [--states 4000000] [--workers 1 2 4 8]
+"""
+import argparse
+import os
+import time
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+
+from quantum_gates import IDENTITY, resolve_gate
+from qubit_state import precision_dtype
+
+
+class SharedEnsemble:
+    """
+    An ensemble of N qubit states, and their Bloch coordinates, in shared memory.
+    Use as a context manager (or call close) to release the block.
+    """
+
+    def __init__(self, n, alpha=1+0j, beta=0+0j, dtype=np.complex128):
+        """
+        :param dtype: Amplitude precision, complex128 ("double") or complex64 ("single"); single
+            precision halves the shared block and the Bloch output follows as float32.
+        :raises ValueError: For a non-complex dtype.
+        """
+        self.dtype = precision_dtype(dtype)
+        states_bytes = n * 2 * self.dtype.itemsize
+        bloch_bytes = n * 3 * self.dtype.itemsize // 2
+        self.n = n
+        self._memory = shared_memory.SharedMemory(create=True, size=max(states_bytes + bloch_bytes, 1))
+        self.states, self.bloch = _views(self._memory, n, self.dtype)
+        self.states[:, 0] = alpha
+        self.states[:, 1] = beta
+        self.states /= np.linalg.norm(self.states, axis=1)[:, None]
+
+    @property
+    def name(self):
+        return self._memory.name
+
+    def close(self):
+        if self._memory is None:
+            return
+        del self.states, self.bloch
+        self._memory.close()
+        self._memory.unlink()
+        self._memory = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _views(memory, n, dtype):
+    states = np.ndarray((n, 2), dtype=dtype, buffer=memory.buf)
+    bloch = np.ndarray((n, 3), dtype=states.real.dtype, buffer=memory.buf, offset=states.nbytes)
+    return states, bloch
+
+
+def compile_program(program):
+    """
+    Resolves a gate program through the gate registry and fuses it into one 2x2 matrix.
+    :param program: A list of gate names or (gate_name, kwargs) pairs, in application order.
+    :raises ValueError: If a gate name is unknown.
+    """
+    fused = IDENTITY
+    for entry in program:
+        name, kwargs = (entry, {}) if isinstance(entry, str) else (entry[0], dict(entry[1] or {}))
+        fused = resolve_gate(name, **kwargs) @ fused
+    return np.array(fused)
+
+
+def _run_shard(task):
+    name, n, dtype, start, stop, matrix, with_bloch = task
+    # Attach for this shard only: a handle kept open would keep the pages of an ensemble
+    # mapped in the worker long after the parent has closed and unlinked it.
+    memory = shared_memory.SharedMemory(name=name)
+    try:
+        _apply_shard(memory, n, dtype, start, stop, matrix, with_bloch)
+    finally:
+        memory.close()
+    return stop - start
+
+
+def _apply_shard(memory, n, dtype, start, stop, matrix, with_bloch):
+    # Every view of the block is local to this function, so it is released before close().
+    states, bloch = _views(memory, n, dtype)
+    shard = states[start:stop]
+    matrix = matrix.astype(dtype)
+    alpha = matrix[0, 0] * shard[:, 0] + matrix[0, 1] * shard[:, 1]
+    beta = matrix[1, 0] * shard[:, 0] + matrix[1, 1] * shard[:, 1]
+    norm = np.sqrt(np.abs(alpha)**2 + np.abs(beta)**2)
+    alpha /= norm
+    beta /= norm
+    shard[:, 0], shard[:, 1] = alpha, beta
+    if with_bloch:
+        coherence = np.conj(alpha) * beta
+        bloch[start:stop, 0] = 2 * coherence.real
+        bloch[start:stop, 1] = 2 * coherence.imag
+        bloch[start:stop, 2] = np.abs(alpha)**2 - np.abs(beta)**2
+
+
+class ShardedExecutor:
+    """
+    A process pool that applies gate programs to SharedEnsembles shard by shard.
+    """
+
+    def __init__(self, workers=None, shards_per_worker=4, start_method=None):
+        """
+        :param workers: Number of worker processes (defaults to the CPU count).
+        :param shards_per_worker: Slices handed to each worker per call, for load balancing.
+        :param start_method: multiprocessing start method ("fork", "spawn", ...).
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.shards_per_worker = shards_per_worker
+        self._pool = get_context(start_method).Pool(self.workers)
+
+    def run(self, ensemble, program, bloch=True):
+        """
+        Applies a gate program to every state of the ensemble in place.
+        :param ensemble: A SharedEnsemble.
+        :param program: Gate names or (gate_name, kwargs) pairs, in application order.
+        :param bloch: Whether to also fill ensemble.bloch with Cartesian Bloch coordinates.
+        :return: The ensemble's (N, 3) Bloch coordinate array (only updated if bloch is set).
+        """
+        matrix = compile_program(program)
+        bounds = np.linspace(0, ensemble.n, self.workers * self.shards_per_worker + 1).astype(int)
+        tasks = [(ensemble.name, ensemble.n, ensemble.dtype, start, stop, matrix, bloch)
+                 for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+        self._pool.map(_run_shard, tasks)
+        return ensemble.bloch
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--states", type=int, default=4_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    program = ["hadamard", ("rotation_z", {"theta": 0.3}), "t", ("rotation_x", {"theta": 1.1})]
+    print(f"{args.states:,} states, {os.cpu_count()} CPUs")
+    with SharedEnsemble(args.states) as ensemble:
+        for workers in args.workers:
+            with ShardedExecutor(workers) as executor:
+                executor.run(ensemble, program)  # warm up the pool
+                start = time.perf_counter()
+                for _ in range(args.repeat):
+                    executor.run(ensemble, program)
+                elapsed = (time.perf_counter() - start) / args.repeat
+            rate = args.states / elapsed / 1e6
+            print(f"{workers:>3} workers: {elapsed * 1000:8.1f} ms/run  {rate:8.1f} M states/s")
+
+
+if __name__ == "__main__":
+    main()
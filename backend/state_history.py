@@ -0,0 +1,182 @@
+import numpy as np
+
+EVICTION_POLICIES = ("drop_oldest", "raise")
+
+
+class HistoryFullError(OverflowError):
+    """
+    Raised by a full history whose eviction policy is "raise".
+    """
+
+
+class StateHistory:
+    """
+    A fixed-capacity undo/redo timeline stored in a preallocated complex ring buffer.
+
+    The timeline holds every recorded state in order. A cursor marks the slot of the
+    current state: slots before it can be undone, slots after it can be redone. The
+    current state is only written into its slot when the cursor moves away from it,
+    so undo, redo and jump_to are all O(1) regardless of how far they move.
+
+    When the buffer is full, the eviction policy decides what happens on the next push:
+    - "drop_oldest": the oldest entry is overwritten (default)
+    - "raise": a HistoryFullError is raised and the history is left unchanged
+    """
+
+    def __init__(self, capacity=10000, eviction="drop_oldest"):
+        """
+        :param capacity: Maximum number of timeline slots, including the current state.
+        :param eviction: One of EVICTION_POLICIES.
+        """
+        if capacity < 2:
+            raise ValueError("History capacity must be at least 2.")
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy: {eviction}")
+        self.capacity = capacity
+        self.eviction = eviction
+        self._buffer = np.zeros((capacity, 2), dtype=complex)
+        self._checkpoints = {}  # name -> absolute slot index
+        self.clear()
+
+    def clear(self):
+        self._start = 0  # physical index of logical slot 0
+        self._cursor = 0  # logical slot of the current state
+        self._top = 1  # number of valid logical slots
+        self._evicted = 0  # number of slots dropped from the front so far
+        self._checkpoints.clear()
+
+    def __len__(self):
+        """
+        :return: The number of states that can be undone.
+        """
+        return self._cursor
+
+    @property
+    def redo_count(self):
+        return self._top - self._cursor - 1
+
+    @property
+    def position(self):
+        """
+        :return: The timeline index of the current state.
+        """
+        return self._cursor
+
+    def timeline_len(self):
+        """
+        :return: The number of timeline slots, including the current state.
+        """
+        return self._top
+
+    def push(self, alpha, beta):
+        """
+        Records the current state before it is changed and discards any redo entries.
+        :raises HistoryFullError: If the buffer is full and the eviction policy is "raise".
+        """
+        if self._cursor + 1 == self.capacity and self.eviction == "raise":
+            raise HistoryFullError(f"History is full ({self.capacity} states).")
+        if self.redo_count:
+            self._checkpoints = {name: index for name, index in self._checkpoints.items()
+                                 if index - self._evicted <= self._cursor}
+        self._write(self._cursor, alpha, beta)
+        if self._cursor + 1 < self.capacity:
+            self._cursor += 1
+        else:
+            self._start = (self._start + 1) % self.capacity
+            self._evicted += 1
+            self._checkpoints = {name: index for name, index in self._checkpoints.items()
+                                 if index >= self._evicted}
+        self._top = self._cursor + 1
+
+    def push_many(self, states):
+        """
+        Records a run of states in one vectorized write, as if push were called for each row.
+        :param states: An (N, 2) array of [alpha, beta] rows, oldest first.
+        :raises HistoryFullError: If the run does not fit and the eviction policy is "raise".
+        """
+        states = np.asarray(states, dtype=complex)
+        count = len(states)
+        if count == 0:
+            return
+        total = self._cursor + count + 1  # slots needed, including the new current state
+        if total > self.capacity and self.eviction == "raise":
+            raise HistoryFullError(f"History is full ({self.capacity} states).")
+        if self.redo_count:
+            self._checkpoints = {name: index for name, index in self._checkpoints.items()
+                                 if index - self._evicted <= self._cursor}
+        drop = max(0, total - self.capacity)
+        first = max(self._cursor, drop)  # earliest logical slot that survives eviction
+        positions = (self._start + np.arange(first, self._cursor + count)) % self.capacity
+        self._buffer[positions] = states[first - self._cursor:]
+        if drop:
+            self._start = (self._start + drop) % self.capacity
+            self._evicted += drop
+            self._checkpoints = {name: index for name, index in self._checkpoints.items()
+                                 if index >= self._evicted}
+        self._cursor = self._cursor + count - drop
+        self._top = self._cursor + 1
+
+    def undo(self, alpha, beta):
+        """
+        :param alpha, beta: The current state, kept so it can be redone.
+        :return: The previous (alpha, beta), or None if there is nothing to undo.
+        """
+        if self._cursor == 0:
+            return None
+        return self._move(self._cursor - 1, alpha, beta)
+
+    def redo(self, alpha, beta):
+        """
+        :param alpha, beta: The current state, kept so it can be undone again.
+        :return: The next (alpha, beta), or None if there is nothing to redo.
+        """
+        if self.redo_count == 0:
+            return None
+        return self._move(self._cursor + 1, alpha, beta)
+
+    def jump_to(self, index, alpha, beta):
+        """
+        Moves the cursor to any timeline slot in O(1).
+        :param index: Timeline index in [0, timeline_len()); negative indices count from the end.
+        :param alpha, beta: The current state, kept so it can be returned to.
+        :return: The (alpha, beta) stored at index.
+        :raises IndexError: If index is outside the timeline.
+        """
+        if index < 0:
+            index += self._top
+        if not 0 <= index < self._top:
+            raise IndexError(f"History index {index} out of range (length {self._top}).")
+        return self._move(index, alpha, beta)
+
+    def checkpoint(self, name):
+        """
+        Marks the current timeline slot under a name so it can be jumped back to later.
+        A checkpoint is dropped when its slot is evicted or discarded by a new push.
+        """
+        self._checkpoints[name] = self._cursor + self._evicted
+
+    def checkpoint_index(self, name):
+        """
+        :return: The timeline index of a checkpoint.
+        :raises KeyError: If the checkpoint does not exist.
+        """
+        if name not in self._checkpoints:
+            raise KeyError(f"No checkpoint named '{name}'")
+        return self._checkpoints[name] - self._evicted
+
+    def checkpoints(self):
+        """
+        :return: A dict of checkpoint name -> timeline index.
+        """
+        return {name: index - self._evicted for name, index in self._checkpoints.items()}
+
+    def _move(self, index, alpha, beta):
+        self._write(self._cursor, alpha, beta)
+        self._cursor = index
+        alpha, beta = self._buffer[(self._start + index) % self.capacity]
+        return complex(alpha), complex(beta)
+
+    def _write(self, index, alpha, beta):
+        slot = self._buffer[(self._start + index) % self.capacity]
+        slot[0] = alpha
+        slot[1] = beta
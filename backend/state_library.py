@@ -0,0 +1,169 @@
+import json
+import os
+import tempfile
+
+import numpy as np
+
+STATES_FILE = "states.npy"
+INDEX_FILE = "index.json"
+
+
+def _replace_atomic(path, write, mode):
+    # Writes to a temporary file next to path, then renames it over path. A library or index that
+    # is memory-mapped from path keeps the old file's pages, so dumping back to the directory
+    # it was opened from cannot truncate the mapping.
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, **({"encoding": "utf-8"} if "b" not in mode else {})) as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def save_array_atomic(path, array):
+    """
+    Saves an array in .npy format through a temporary file, so it is safe to overwrite a file
+    that is currently memory-mapped.
+    """
+    _replace_atomic(path, lambda f: np.save(f, array), "wb")
+
+
+def write_text_atomic(path, text):
+    """
+    Writes a text file through a temporary file, so readers see either the old or the new contents.
+    """
+    _replace_atomic(path, lambda f: f.write(text), "w")
+
+
+def write_json_atomic(path, data):
+    """
+    Writes JSON through a temporary file, replacing path in one step.
+    """
+    _replace_atomic(path, lambda f: json.dump(data, f), "w")
+
+
+class StateLibrary:
+    """
+    A named collection of saved qubit states backed by one contiguous (N, 2) complex array.
+
+    Names map to rows of the array through a dict, and a per-base-name version counter
+    makes finding the next free versioned name ("psi_1", "psi_2", ...) O(1) amortized.
+    A library can be written to a directory holding a states.npy array and a JSON name
+    index, and reopened with the array memory-mapped so large libraries load instantly.
+    """
+
+    def __init__(self, capacity=16):
+        self._states = np.empty((capacity, 2), dtype=complex)
+        self._count = 0
+        self._names = []  # row -> name
+        self._index = {}  # name -> row
+        self._versions = {}  # base name -> next version number to try
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __getitem__(self, name):
+        """
+        :return: The (alpha, beta) saved under name.
+        :raises KeyError: If there is no state with that name.
+        """
+        alpha, beta = self._states[self._index[name]]
+        return complex(alpha), complex(beta)
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def names(self):
+        return list(self._names)
+
+    def save(self, name, alpha, beta):
+        """
+        Saves a state, appending a version suffix if the name is taken.
+        :return: The name the state was actually stored under.
+        """
+        return self.save_many([name], [[alpha, beta]])[0]
+
+    def save_many(self, names, states):
+        """
+        Saves many states in one call.
+        :param names: Sequence of N requested names; duplicates are versioned like save().
+        :param states: Array-like of shape (N, 2) holding [alpha, beta] rows.
+        :return: The list of names the states were stored under, in order.
+        """
+        states = np.asarray(states, dtype=complex)
+        if states.ndim != 2 or states.shape[1] != 2 or states.shape[0] != len(names):
+            raise ValueError("States must have shape (len(names), 2).")
+        self._reserve(len(names))
+        stored = []
+        for offset, name in enumerate(names):
+            name = self._free_name(name)
+            self._index[name] = self._count + offset
+            self._names.append(name)
+            stored.append(name)
+        self._states[self._count:self._count + len(names)] = states
+        self._count += len(names)
+        return stored
+
+    def load_many(self, names):
+        """
+        :param names: Sequence of saved names.
+        :return: An (N, 2) complex array of the matching [alpha, beta] rows.
+        :raises KeyError: If any name is missing.
+        """
+        rows = np.fromiter((self._index[name] for name in names), dtype=np.intp, count=len(names))
+        return np.array(self._states[rows])
+
+    def dump(self, path):
+        """
+        Writes the library to a directory (created if needed).
+        :param path: Target directory.
+        """
+        os.makedirs(path, exist_ok=True)
+        save_array_atomic(os.path.join(path, STATES_FILE), self._states[:self._count])
+        write_json_atomic(os.path.join(path, INDEX_FILE), {"names": self._names, "versions": self._versions})
+
+    @classmethod
+    def open(cls, path, mmap=True):
+        """
+        Loads a library written by dump().
+        :param path: Directory containing states.npy and index.json.
+        :param mmap: Whether to memory-map the state array instead of reading it eagerly.
+            The mapping is copied into memory the first time a new state is saved.
+        :return: A StateLibrary.
+        """
+        with open(os.path.join(path, INDEX_FILE), encoding="utf-8") as f:
+            index = json.load(f)
+        states = np.load(os.path.join(path, STATES_FILE), mmap_mode="r" if mmap else None)
+        if states.shape != (len(index["names"]), 2):
+            raise ValueError(f"State library at '{path}' is inconsistent with its index.")
+        library = cls(capacity=0)
+        library._states = states
+        library._count = len(index["names"])
+        library._names = list(index["names"])
+        library._index = {name: row for row, name in enumerate(library._names)}
+        library._versions = dict(index["versions"])
+        return library
+
+    def _free_name(self, name):
+        if name not in self._index:
+            return name
+        version = self._versions.get(name, 1)
+        while f"{name}_{version}" in self._index:
+            version += 1
+        self._versions[name] = version + 1
+        return f"{name}_{version}"
+
+    def _reserve(self, extra):
+        needed = self._count + extra
+        if needed <= self._states.shape[0] and self._states.flags.writeable:
+            return
+        capacity = max(needed, 2 * self._states.shape[0], 16)
+        states = np.empty((capacity, 2), dtype=complex)
+        states[:self._count] = self._states[:self._count]
+        self._states = states
@@ -0,0 +1,325 @@
+"""
+Approximation of arbitrary single-qubit unitaries by words over discrete gates.
+
+Every word over the alphabet (hadamard, t, phase by default) up to a maximum length is
+enumerated once, breadth first, keeping only the shortest word for each distinct unitary
+(modulo global phase). Each unitary is stored as its unit quaternion; both signs, q and -q,
+go into a uniform 4D grid so that the nearest word to any target is found by looking at a
+few neighbouring grid cells. The distance between unitaries U and V is
+sqrt(2 - 2 |tr(U^dagger V)| / 2), the Euclidean distance between their closest quaternions.
+
+Words are stored as a parent-pointer trie (each entry is its parent's word plus one gate),
+and the whole index is written to a directory of .npy files that are memory-mapped on load.
+SequenceIndex.approximate can refine a lookup with Solovay-Kitaev recursion.
+
+Usage: python synthesis.py build DIR [--max-length 24]
+       python synthesis.py query DIR --rotation-z 0.3 [--depth 1]
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+
+import numpy as np
+
+from quantum_gates import resolve_gate
+from state_library import save_array_atomic, write_json_atomic
+
+DEFAULT_ALPHABET = ("hadamard", "t", "phase")
+DEFAULT_MAX_LENGTH = 24
+POINTS_PER_CELL = 8  # Target grid occupancy when the number of cells is chosen automatically
+INDEX_FILE = "index.json"
+ARRAY_FILES = ("quaternions", "parents", "letters", "cell_ids", "order")
+SPHERE_AREA = 2 * np.pi**2  # Surface volume of the unit 3-sphere, used to size the grid
+
+
+def su2_quaternion(matrices):
+    """
+    Converts 2x2 unitaries (or an (..., 2, 2) stack) to unit quaternions (q0, q1, q2, q3) with
+    U = e^{i phi} (q0 I - i (q1 X + q2 Y + q3 Z)). The global phase is removed up to the sign of q.
+    """
+    matrices = np.asarray(matrices, dtype=complex)
+    det = matrices[..., 0, 0] * matrices[..., 1, 1] - matrices[..., 0, 1] * matrices[..., 1, 0]
+    special = matrices / np.sqrt(det)[..., None, None]
+    a, b = special[..., 0, 0], special[..., 0, 1]
+    return np.stack([a.real, -b.imag, -b.real, -a.imag], axis=-1)
+
+
+def quaternion_matrix(quaternions):
+    """
+    Inverse of su2_quaternion: builds the SU(2) matrices of (..., 4) unit quaternions.
+    """
+    q0, q1, q2, q3 = np.moveaxis(np.asarray(quaternions, dtype=float), -1, 0)
+    return np.stack([np.stack([q0 - 1j*q3, -q2 - 1j*q1], axis=-1),
+                     np.stack([q2 - 1j*q1, q0 + 1j*q3], axis=-1)], axis=-2)
+
+
+def gate_distance(first, second):
+    """
+    :return: The phase-invariant distance sqrt(2 - |tr(first^dagger second)|) between two unitaries.
+    """
+    overlap = abs(np.dot(su2_quaternion(first), su2_quaternion(second)))
+    return float(np.sqrt(max(2 - 2 * overlap, 0.0)))
+
+
+def word_matrix(word):
+    """
+    :param word: Gate names in application order.
+    :return: The 2x2 unitary of the whole word.
+    """
+    matrix = np.eye(2, dtype=complex)
+    for gate_name in word:
+        matrix = resolve_gate(gate_name) @ matrix
+    return matrix
+
+
+def _canonical_sign(quaternions):
+    # Makes the first non-negligible component positive, so q and -q get the same key.
+    first = np.argmax(np.abs(quaternions) > 1e-9, axis=1)
+    signs = np.sign(quaternions[np.arange(len(quaternions)), first])
+    return quaternions * signs[:, None]
+
+
+def _keys(quaternions):
+    return np.round(_canonical_sign(quaternions) * 1e8).astype(np.int64)
+
+
+class SequenceIndex:
+    """
+    Nearest-word lookup table for approximating single-qubit unitaries with discrete gates.
+    Build it once with build(), save it with dump() and reopen it memory-mapped with open().
+    """
+
+    def __init__(self, alphabet, quaternions, parents, letters, cells_per_axis, cell_ids=None, order=None):
+        self.alphabet = tuple(alphabet)
+        self.quaternions = quaternions  # (M, 4), one sign per distinct unitary
+        self.parents = parents  # (M,) parent entry, -1 for the empty word
+        self.letters = letters  # (M,) index into alphabet of the last gate
+        self.cells_per_axis = cells_per_axis
+        self.cell_size = 2 / cells_per_axis
+        if cell_ids is None:
+            points = np.concatenate([quaternions, -quaternions])
+            cell_ids = self._cell_ids(points)
+            order = np.argsort(cell_ids, kind="stable")
+            cell_ids = cell_ids[order]
+        self.cell_ids = cell_ids  # Sorted grid cell of each point (points are q then -q)
+        self.order = order  # Point number for each position in cell_ids
+
+    def __len__(self):
+        return len(self.quaternions)
+
+    @classmethod
+    def build(cls, max_length=DEFAULT_MAX_LENGTH, alphabet=DEFAULT_ALPHABET, cells_per_axis=None):
+        """
+        Enumerates every word up to max_length, keeping the shortest word per distinct unitary.
+        :param max_length: Maximum word length.
+        :param alphabet: Names of the parameterless registered gates words are built from.
+        :param cells_per_axis: Grid resolution; by default about POINTS_PER_CELL points per cell.
+        :return: A SequenceIndex.
+        """
+        generators = np.array([resolve_gate(name) for name in alphabet])
+        quaternions = [su2_quaternion(np.eye(2))[None]]
+        parents, letters = [np.array([-1])], [np.array([0])]
+        seen = {_keys(quaternions[0])[0].tobytes()}
+        frontier, offset = quaternion_matrix(quaternions[0]), 0
+        for _ in range(max_length):
+            if not len(frontier):
+                break
+            # Every frontier word extended by every gate, as one (len(frontier) * len(alphabet)) stack.
+            candidates = np.einsum("gij,njk->ngik", generators, frontier).reshape(-1, 2, 2)
+            candidate_q = su2_quaternion(candidates)
+            _, first = np.unique(_keys(candidate_q), axis=0, return_index=True)
+            first.sort()
+            keys = _keys(candidate_q[first])
+            new = np.array([key.tobytes() not in seen for key in keys], dtype=bool)
+            first = first[new]
+            seen.update(key.tobytes() for key in keys[new])
+            quaternions.append(candidate_q[first])
+            parents.append(offset + first // len(alphabet))
+            letters.append(first % len(alphabet))
+            offset += len(frontier)
+            frontier = candidates[first]
+        quaternions = np.concatenate(quaternions)
+        if cells_per_axis is None:
+            cell = (SPHERE_AREA * POINTS_PER_CELL / (2 * len(quaternions))) ** (1 / 3)
+            cells_per_axis = int(np.clip(np.ceil(2 / cell), 2, 256))
+        return cls(alphabet, quaternions, np.concatenate(parents).astype(np.int32),
+                   np.concatenate(letters).astype(np.uint8), cells_per_axis)
+
+    def _cell_coords(self, points):
+        return np.clip(((points + 1) / self.cell_size).astype(np.int64), 0, self.cells_per_axis - 1)
+
+    def _cell_ids(self, points):
+        return np.ravel_multi_index(tuple(self._cell_coords(points).T), (self.cells_per_axis,) * 4)
+
+    def word(self, entry):
+        """
+        :return: The gate names of an entry's word, in application order.
+        """
+        word = []
+        while self.parents[entry] >= 0:
+            word.append(self.alphabet[self.letters[entry]])
+            entry = self.parents[entry]
+        return word[::-1]
+
+    def nearest(self, gate_matrix):
+        """
+        Finds the stored word closest to a unitary.
+        :param gate_matrix: A 2x2 unitary.
+        :return: (word, distance), with word a list of gate names in application order.
+        """
+        target = su2_quaternion(gate_matrix)
+        center = self._cell_coords(target[None])[0]
+        for radius in range(1, self.cells_per_axis + 1):
+            offsets = np.array(list(itertools.product(range(-radius, radius + 1), repeat=4)))
+            cells = center + offsets
+            cells = cells[np.all((cells >= 0) & (cells < self.cells_per_axis), axis=1)]
+            ids = np.ravel_multi_index(tuple(cells.T), (self.cells_per_axis,) * 4)
+            starts = np.searchsorted(self.cell_ids, ids, side="left")
+            stops = np.searchsorted(self.cell_ids, ids, side="right")
+            if not np.any(stops > starts):
+                continue
+            points = np.asarray(self.order)[np.concatenate([np.arange(a, b) for a, b in zip(starts, stops)])]
+            entries = points % len(self)
+            signs = np.where(points < len(self), 1.0, -1.0)
+            distances = np.linalg.norm(np.asarray(self.quaternions)[entries] * signs[:, None] - target, axis=1)
+            best = np.argmin(distances)
+            # Any point within radius * cell_size of the target lies inside the searched block.
+            if distances[best] <= radius * self.cell_size or radius == self.cells_per_axis:
+                return self.word(int(entries[best])), float(distances[best])
+        return [], gate_distance(np.eye(2), gate_matrix)
+
+    def approximate(self, gate_matrix, depth=0):
+        """
+        Approximates a unitary by a word, optionally refined by Solovay-Kitaev recursion.
+        Each level of recursion multiplies the word length by about five and, once the base
+        lookup is accurate enough, shrinks the error roughly as eps -> c * eps^1.5.
+        :param gate_matrix: A 2x2 unitary.
+        :param depth: Number of Solovay-Kitaev refinement levels (0 is a plain nearest lookup).
+        :return: (word, distance) for the returned word.
+        """
+        gate_matrix = np.asarray(gate_matrix, dtype=complex)
+        word = self._solovay_kitaev(gate_matrix, depth)
+        return word, gate_distance(word_matrix(word), gate_matrix)
+
+    def _solovay_kitaev(self, gate_matrix, depth):
+        if depth == 0:
+            return self.nearest(gate_matrix)[0]
+        approximation = self._solovay_kitaev(gate_matrix, depth - 1)
+        v, w = _balanced_commutator(gate_matrix @ word_matrix(approximation).conj().T)
+        v_word, w_word = self._solovay_kitaev(v, depth - 1), self._solovay_kitaev(w, depth - 1)
+        # U ~ V W V^dagger W^dagger U_{n-1}; words are in application order, so U_{n-1} comes first.
+        return approximation + self._inverse_word(w_word) + self._inverse_word(v_word) + w_word + v_word
+
+    def _inverse_word(self, word):
+        inverse = []
+        for gate_name in reversed(word):
+            inverse.extend(self._inverse_letters(gate_name))
+        return inverse
+
+    def _inverse_letters(self, gate_name):
+        # A gate's inverse as a power of itself: every alphabet gate has finite order modulo phase.
+        matrix, power = resolve_gate(gate_name), 1
+        product = matrix
+        while gate_distance(product, np.eye(2)) > 1e-9:
+            product, power = matrix @ product, power + 1
+            if power > 64:
+                raise ValueError(f"Gate '{gate_name}' has no finite order, so it cannot be inverted "
+                                 f"within the alphabet.")
+        return [gate_name] * (power - 1)
+
+    def dump(self, path):
+        """
+        Writes the index to a directory (created if needed).
+        """
+        os.makedirs(path, exist_ok=True)
+        for name in ARRAY_FILES:
+            save_array_atomic(os.path.join(path, f"{name}.npy"), getattr(self, name))
+        write_json_atomic(os.path.join(path, INDEX_FILE),
+                          {"alphabet": list(self.alphabet), "cells_per_axis": self.cells_per_axis})
+
+    @classmethod
+    def open(cls, path, mmap=True):
+        """
+        Loads an index written by dump().
+        :param path: Directory containing the .npy arrays and index.json.
+        :param mmap: Whether to memory-map the arrays instead of reading them eagerly.
+        :return: A SequenceIndex.
+        """
+        with open(os.path.join(path, INDEX_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r" if mmap else None)
+                  for name in ARRAY_FILES}
+        if len(arrays["cell_ids"]) != 2 * len(arrays["quaternions"]):
+            raise ValueError(f"Sequence index at '{path}' is inconsistent.")
+        return cls(meta["alphabet"], arrays["quaternions"], arrays["parents"], arrays["letters"],
+                   meta["cells_per_axis"], arrays["cell_ids"], arrays["order"])
+
+
+def _axis_angle(gate_matrix):
+    q = su2_quaternion(gate_matrix)
+    if q[0] < 0:
+        q = -q
+    angle = 2 * np.arccos(np.clip(q[0], -1.0, 1.0))
+    norm = np.linalg.norm(q[1:])
+    axis = q[1:] / norm if norm > 1e-15 else np.array([0.0, 0.0, 1.0])
+    return axis, angle
+
+
+def _rotation(axis, angle):
+    return quaternion_matrix(np.concatenate([[np.cos(angle / 2)], np.sin(angle / 2) * np.asarray(axis)]))
+
+
+def _balanced_commutator(gate_matrix):
+    """
+    Finds V, W with V W V^dagger W^dagger equal to gate_matrix (up to phase), both rotations
+    by the same small angle, as required by the Solovay-Kitaev step.
+    """
+    axis, angle = _axis_angle(gate_matrix)
+    # For rotations about x and y by phi, the commutator rotates by theta with
+    # sin(theta / 2) = 2 sin^2(phi / 2) sqrt(1 - sin^4(phi / 2)).
+    s = np.sqrt(np.sqrt((1 - np.sqrt(max(1 - np.sin(angle / 2)**2, 0.0))) / 2))
+    phi = 2 * np.arcsin(s)
+    v, w = _rotation([1, 0, 0], phi), _rotation([0, 1, 0], phi)
+    commutator_axis, _ = _axis_angle(v @ w @ v.conj().T @ w.conj().T)
+    # Conjugate both by the rotation taking the commutator's axis onto the target axis.
+    cross = np.cross(commutator_axis, axis)
+    turn = np.arctan2(np.linalg.norm(cross), np.dot(commutator_axis, axis))
+    if np.linalg.norm(cross) < 1e-12:
+        cross = np.cross(commutator_axis, [1.0, 0.0, 0.0] if abs(commutator_axis[0]) < 0.9 else [0.0, 1.0, 0.0])
+    similarity = _rotation(cross / np.linalg.norm(cross), turn)
+    return similarity @ v @ similarity.conj().T, similarity @ w @ similarity.conj().T
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Enumerate words and write the index.")
+    build.add_argument("path")
+    build.add_argument("--max-length", type=int, default=DEFAULT_MAX_LENGTH)
+    build.add_argument("--alphabet", nargs="+", default=list(DEFAULT_ALPHABET))
+    query = commands.add_parser("query", help="Approximate a rotation with the saved index.")
+    query.add_argument("path")
+    query.add_argument("--rotation-x", type=float, default=0.0)
+    query.add_argument("--rotation-y", type=float, default=0.0)
+    query.add_argument("--rotation-z", type=float, default=0.0)
+    query.add_argument("--depth", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        index = SequenceIndex.build(args.max_length, args.alphabet)
+        index.dump(args.path)
+        print(f"{len(index):,} distinct unitaries, grid of {index.cells_per_axis}^4 cells")
+        return 0
+    index = SequenceIndex.open(args.path)
+    target = (resolve_gate("rotation_z", theta=args.rotation_z) @ resolve_gate("rotation_y", theta=args.rotation_y)
+              @ resolve_gate("rotation_x", theta=args.rotation_x))
+    word, distance = index.approximate(target, depth=args.depth)
+    print(f"length {len(word)}, distance {distance:.3e}")
+    print(" ".join(word))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+import asyncio
+import json
+from api_server import ApiServer
+from load_generator import read_response
+from session_manager import SessionManager
+
+def _request(path, body, session="s1"):
+    payload = json.dumps(body).encode()
+    return (f"POST {path} HTTP/1.1\r\nX-Session-Id: {session}\r\n"
+            f"Content-Length: {len(payload)}\r\n\r\n").encode() + payload
+
+async def _exchange(requests):
+    server = await ApiServer().start("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"".join(requests))  # all requests pipelined in one write
+    await writer.drain()
+    responses = [await read_response(reader) for _ in requests]
+    writer.close()
+    server.close()
+    await server.wait_closed()
+    return responses
+
+def test_pipelined_requests_are_answered_in_order():
+    responses = asyncio.run(_exchange([
+        _request("/apply_gate", {"gate_name": "pauli_x"}),
+        _request("/save_state", {"name": "one"}),
+        _request("/undo", {}),
+        _request("/bloch", {}),
+        _request("/load_state", {"name": "one"}),
+        _request("/bloch", {}, session="s2"),
+    ]))
+    assert [status for status, _ in responses] == [200] * 6
+    assert responses[1][1]["result"] == "one"
+    assert abs(responses[0][1]["bloch"][0] - 3.14159265) < 1e-6
+    assert responses[3][1]["bloch"][0] == 0
+    assert abs(responses[4][1]["bloch"][0] - 3.14159265) < 1e-6
+    assert responses[5][1]["bloch"] == [0, 0]
+
+def test_batch_and_errors():
+    responses = asyncio.run(_exchange([
+        _request("/batch", {"ops": [{"op": "apply_gate", "gate_name": "hadamard"},
+                                    {"op": "apply_gate", "gate_name": "rotation_z", "kwargs": {"theta": 1.0}}]}),
+        _request("/apply_gate", {"gate_name": "nope"}),
+        _request("/load_state", {"name": "missing"}),
+        _request("/explode", {}),
+    ]))
+    assert responses[0][0] == 200 and abs(responses[0][1]["bloch"][1] - 1.0) < 1e-9
+    assert [status for status, _ in responses[1:]] == [400, 404, 404]
+    assert not responses[1][1]["ok"]
+
+def test_malformed_requests_get_errors_and_keep_the_connection():
+    responses = asyncio.run(_exchange([
+        _request("/batch", {"ops": ["hadamard"]}),
+        _request("/apply_circuit", {"circuit": [[1, {}]]}),
+        _request("/apply_gate", {"gate_name": 5}),
+        _request("/apply_gate", {"gate_name": "hadamard", "kwargs": [1]}),
+        _request("/apply_gate", {"gate_name": "pauli_x"}),
+    ]))
+    assert [status for status, _ in responses] == [400, 400, 400, 400, 200]
+    assert abs(responses[4][1]["bloch"][0] - 3.14159265) < 1e-6
+
+def test_bad_content_length_full_history_and_full_manager():
+    [(status, response)] = asyncio.run(_exchange([b"POST /bloch HTTP/1.1\r\nContent-Length: ten\r\n\r\n"]))
+    assert status == 400 and not response["ok"]
+    server = ApiServer(SessionManager(max_sessions=1, history_capacity=2, history_eviction="raise"))
+    assert server.handle("/apply_gate", {}, b'{"gate_name": "hadamard"}')[0] == 200
+    assert server.handle("/apply_gate", {}, b'{"gate_name": "hadamard"}')[0] == 400
+    with server.manager.session("default"):
+        assert server.handle("/bloch", {"x-session-id": "other"}, b"")[0] == 503
+
+def test_idle_sessions_are_evicted_in_the_background():
+    async def scenario():
+        server = ApiServer(SessionManager(idle_timeout=0.05), evict_interval=0.01)
+        listener = await server.start("127.0.0.1", 0)
+        try:
+            server.handle("/bloch", {}, b"")
+            assert len(server.manager) == 1
+            await asyncio.sleep(0.2)
+            return len(server.manager)
+        finally:
+            server.close()
+            listener.close()
+            await listener.wait_closed()
+    assert asyncio.run(scenario()) == 0
+
+def test_batch_is_validated_before_it_runs():
+    server = ApiServer()
+    def batch(*ops):
+        return server.handle("/batch", {}, json.dumps({"ops": list(ops)}).encode())
+    flip = {"op": "apply_gate", "gate_name": "pauli_x"}
+    status, response = batch(flip, {"op": "apply_gate", "gate_name": "nope"})
+    assert status == 400 and "applied" not in response
+    status, response = batch(flip, {"op": "load_state", "name": "missing"})
+    assert status == 404 and response["applied"] == 1
+    with server.manager.session("default") as sim:
+        assert sim.history_len() == 2
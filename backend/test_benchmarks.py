@@ -0,0 +1,13 @@
+from benchmarks import BENCHMARKS, compare_results, run_benchmarks
+
+def test_quick_run_covers_every_benchmark():
+    report = run_benchmarks(scale=0.001)
+    assert set(report["results"]) == set(BENCHMARKS)
+    assert all(result["seconds_per_op"] > 0 for result in report["results"].values())
+
+def test_compare_flags_slowdowns_beyond_threshold():
+    baseline = {"results": {"a": {"seconds_per_op": 1.0}, "b": {"seconds_per_op": 1.0}}}
+    current = {"results": {"a": {"seconds_per_op": 1.1}, "b": {"seconds_per_op": 1.5},
+                           "new": {"seconds_per_op": 9.0}}}
+    rows = {name: regressed for name, _, _, _, regressed in compare_results(baseline, current, 0.2)}
+    assert rows == {"a": False, "b": True}
@@ -0,0 +1,48 @@
+import json
+import os
+import subprocess
+import sys
+import numpy as np
+import pytest
+from cli import main, parse_line, run_script
+from session_manager import SimulatorSession
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+IMPORT_BUDGET_SECONDS = 1.0
+HEAVY_MODULES = ("PyQt5", "qutip", "matplotlib", "scipy")
+
+def test_parse_line():
+    assert parse_line("rotation_x theta=1.5  # comment") == ("rotation_x", [], {"theta": 1.5})
+    assert parse_line("reset plus") == ("reset", ["plus"], {})
+    assert parse_line("   # only a comment") is None
+
+def test_run_script_drives_simulator():
+    sim = run_script(["reset plus", "pauli_z; save m", "hadamard", "load m"], SimulatorSession())
+    assert np.allclose(sim.get_state_vector(), [1/np.sqrt(2), -1/np.sqrt(2)])
+    with pytest.raises(ValueError):
+        run_script(["not_a_gate"], SimulatorSession())
+
+def test_headless_import_stays_light_and_fast():
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        "import cli\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(__import__('json').dumps({'elapsed': elapsed, 'heavy': heavy}))\n"
+    )
+    output = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR,
+                            capture_output=True, text=True, check=True).stdout
+    result = json.loads(output)
+    assert result["heavy"] == []
+    assert result["elapsed"] < IMPORT_BUDGET_SECONDS
+
+def test_module_entry_point():
+    result = subprocess.run([sys.executable, "-m", "backend", "-e", "pauli_x", "--json"],
+                            cwd=os.path.dirname(BACKEND_DIR), capture_output=True, text=True, check=True)
+    assert json.loads(result.stdout)["cartesian"] == [0.0, 0.0, -1.0]
+
+def test_missing_script_is_a_one_line_error(tmp_path, capsys):
+    assert main([str(tmp_path / "missing.txt")]) == 1
+    err = capsys.readouterr().err
+    assert err.startswith("error: cannot read") and err.count("\n") == 1
@@ -0,0 +1,27 @@
+import numpy as np
+from clifford import (CLIFFORD_MATRICES, COMPOSE, INVERSE, CliffordState, gate_indices,
+                      random_rb_sequences, reduce_sequences)
+from quantum_gates import resolve_gate
+from qubit_state import QubitState
+
+def test_tables_form_the_clifford_group():
+    assert len({tuple(np.round(m, 6).ravel()) for m in CLIFFORD_MATRICES}) == 24
+    assert all(COMPOSE[i, INVERSE[i]] == 0 for i in range(24))
+    assert sorted(set(COMPOSE[3])) == list(range(24))
+
+def test_clifford_state_matches_qubit_state():
+    names = ["hadamard", "phase", "pauli_x", "hadamard", "pauli_y", "phase", "phase", "pauli_z"] * 5
+    q, c = QubitState(0.6, 0.8j), CliffordState(0.6, 0.8j)
+    for name in names:
+        q.apply_gate(resolve_gate(name))
+        c.apply_named_gate(name)
+    assert np.allclose(c.get_bloch_cartesian(), q.get_bloch_cartesian())
+    c.set_state(0.6, 0.8j)
+    c.apply_sequence(gate_indices(names))
+    assert np.isclose(abs(np.vdot(c.get_state_vector(), q.get_state_vector())), 1)
+
+def test_random_rb_sequences_compose_to_identity():
+    sequences = random_rb_sequences(500, 37, rng=7)
+    assert sequences.shape == (500, 38)
+    assert not reduce_sequences(sequences).any()
+    assert reduce_sequences(sequences[:, :0]).shape == (500,)
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from custom_gates import CustomGateRegistry, fingerprint
+from gate_animation import TRAJECTORY_CACHE
+from quantum_gates import GATE_REGISTRY, QuantumGates, resolve_gate
+from qubit_state import QubitState
+from session_manager import SimulatorSession
+
+SQRT_X = 0.5 * np.array([[1 + 1j, 1 - 1j], [1 - 1j, 1 + 1j]])
+
+@pytest.fixture
+def registry():
+    registry = CustomGateRegistry()
+    yield registry
+    registry.clear()
+
+def test_register_and_apply_by_name(registry):
+    name = registry.register(SQRT_X)
+    assert name == f"custom_{fingerprint(SQRT_X)}"
+    assert registry.register(SQRT_X + 1e-15) == name
+    assert np.allclose(resolve_gate(name) @ resolve_gate(name), QuantumGates.pauli_x())
+    registry.unregister(name)
+    assert name not in GATE_REGISTRY
+
+def test_register_many_validates_in_one_batch(registry):
+    with pytest.raises(ValueError, match=r"\[1\]"):
+        registry.register_many([SQRT_X, [[1, 1], [0, 1]]], ["sqrt_x", "shear"])
+    assert len(registry) == 0
+    registry.register_many([SQRT_X, QuantumGates.hadamard()], ["sqrt_x", "my_h"])
+    assert registry.name_for(QuantumGates.hadamard()) == "my_h"
+    with pytest.raises(ValueError):
+        registry.register(SQRT_X, name="hadamard")
+    with pytest.raises(ValueError, match="two different matrices"):
+        registry.register_many([QuantumGates.hadamard(), QuantumGates.pauli_x()], ["g", "g"])
+    assert "g" not in registry and "g" not in GATE_REGISTRY
+
+def test_dump_and_load_round_trip(registry, tmp_path):
+    registry.register_many([SQRT_X, QuantumGates.t_gate()], ["sqrt_x", "my_t"])
+    registry.dump(tmp_path)
+    registry.dump(tmp_path)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["gates.npy", "index.json"]
+    registry.clear()
+    assert registry.load(tmp_path) == ["sqrt_x", "my_t"]
+    assert np.allclose(resolve_gate("sqrt_x"), SQRT_X)
+
+def test_overwriting_a_gate_invalidates_name_keyed_caches(registry):
+    sim = SimulatorSession()
+    registry.register(QuantumGates.pauli_x(), name="g")
+    assert np.allclose(sim.compile_circuit(["g"]), QuantumGates.pauli_x())
+    assert np.allclose(TRAJECTORY_CACHE.get("g", {}, QubitState(), frames=5)[-1], [0, 0, -1])
+    registry.register(QuantumGates.hadamard(), name="g", overwrite=True)
+    assert np.allclose(sim.compile_circuit(["g"]), QuantumGates.hadamard())
+    assert np.allclose(TRAJECTORY_CACHE.get("g", {}, QubitState(), frames=5)[-1], [1, 0, 0])
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from density_matrix import DensityMatrixBatch, NoiseChannels
+from quantum_gates import QuantumGates
+from qubit_state import QubitStateBatch
+
+def test_unitaries_match_pure_state_batch():
+    rng = np.random.default_rng(3)
+    states = rng.normal(size=(5, 2)) + 1j * rng.normal(size=(5, 2))
+    pure = QubitStateBatch.from_states(states)
+    mixed = DensityMatrixBatch.from_states(states)
+    gates = QuantumGates.rotation_stack("y", rng.uniform(0, 6, 5))
+    for batch in (pure, mixed):
+        batch.apply_gate(QuantumGates.hadamard())
+        batch.apply_gate(gates)
+    assert np.allclose(mixed.get_bloch_cartesian(), pure.get_bloch_cartesian())
+    assert np.allclose(mixed.purity(), 1)
+
+def test_thermal_relaxation_decay_rates():
+    batch = DensityMatrixBatch(4)
+    batch.set_preset("plus")
+    t, t1, t2 = 1.0, 5.0, 3.0
+    batch.apply_channel(NoiseChannels.thermal_relaxation(t, t1, t2))
+    x, y, z = batch.get_bloch_cartesian()
+    assert np.allclose(x, np.exp(-t / t2))
+    assert np.allclose(z, 1 - np.exp(-t / t1))
+    assert np.all(batch.get_bloch_radius() < 1)
+    with pytest.raises(ValueError):
+        NoiseChannels.thermal_relaxation(t, 1.0, 3.0)
+
+def test_per_qubit_channels_and_depolarizing():
+    batch = DensityMatrixBatch(2)
+    kraus = np.stack([NoiseChannels.depolarizing(1.0),
+                      NoiseChannels.custom_channel(NoiseChannels.depolarizing(0.0))])
+    batch.apply_channel(kraus)
+    assert np.allclose(batch.get_bloch_radius(), [0, 1])
+    assert np.allclose(batch.purity(), [0.5, 1])
+
+def test_single_precision_ensemble():
+    ensemble = DensityMatrixBatch(100, 1, 1, dtype="single")
+    reference = DensityMatrixBatch(100, 1, 1)
+    for batch in (ensemble, reference):
+        batch.apply_gate(QuantumGates.rotation_y(0.4))
+        batch.apply_channel(NoiseChannels.amplitude_damping(0.1))
+    assert ensemble.rho.dtype == np.complex64
+    assert np.allclose(ensemble.get_bloch_cartesian(), reference.get_bloch_cartesian(), atol=1e-6)
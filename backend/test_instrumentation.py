@@ -0,0 +1,51 @@
+from session_manager import SimulatorSession
+
+def test_metrics_disabled_by_default_and_wrappers_removed():
+    sim = SimulatorSession()
+    sim.apply_gate("hadamard")
+    assert sim.stats()["operations"] == {}
+    sim.enable_metrics()
+    assert "apply_gate" in vars(sim)
+    sim.disable_metrics()
+    assert "apply_gate" not in vars(sim) and "normalize" not in vars(sim.qubit)
+
+def test_metrics_record_counts_and_latencies(tmp_path):
+    sim = SimulatorSession()
+    sim.enable_metrics()
+    sim.apply_gate("hadamard")
+    sim.apply_gate("HADAMARD")
+    sim.apply_gate("custom", matrix=[[0, 1], [1, 0]])
+    sim.undo()
+    stats = sim.stats()
+    assert stats["gate_counts"] == {"hadamard": 2, "custom": 1}
+    assert stats["operations"]["apply_gate"]["count"] == 3
+    assert stats["operations"]["gate_lookup"]["count"] == 3
+    assert stats["operations"]["custom_gate"]["count"] == 1
+    assert stats["operations"]["normalize"]["count"] >= 3
+    assert stats["operations"]["undo"]["count"] == 1
+    assert stats["history_len"] == 4
+    sim.metrics.write_report(tmp_path / "metrics.prom")
+    text = (tmp_path / "metrics.prom").read_text()
+    assert 'quantum_simulator_gates_total{gate="hadamard"} 2' in text
+    assert 'quantum_simulator_operation_seconds_count{op="apply_gate"} 3' in text
+    with open(tmp_path / "metrics.prom") as reader:  # a reader opened before the rewrite
+        sim.apply_gate("t")
+        sim.metrics.write_report(tmp_path / "metrics.prom", fmt="json")
+        assert reader.read() == text
+    assert [p.name for p in tmp_path.iterdir()] == ["metrics.prom"]
+
+def test_clear_resets_metrics_and_wrappers_follow_the_qubit():
+    sim = SimulatorSession("a")
+    sim.enable_metrics()
+    sim.apply_gate("hadamard")
+    sim.clear()
+    assert not sim.metrics.enabled and "apply_gate" not in vars(sim)
+    assert sim.stats()["gate_counts"] == {} and sim.stats()["operations"] == {}
+    sim.enable_metrics()
+    old_qubit = sim.qubit
+    sim.clear()
+    sim.enable_metrics()
+    sim.qubit = type(old_qubit)()  # Replaced behind the instrumentation's back
+    sim.apply_gate("pauli_x")
+    assert "normalize" in vars(sim.qubit) and "normalize" not in vars(old_qubit)
+    assert sim.stats()["operations"]["normalize"]["count"] == 1
@@ -0,0 +1,109 @@
+import json
+import numpy as np
+import pytest
+from op_log import (BinaryOpLogWriter, convert_jsonl_to_binary, iter_jsonl_chunks,
+                    prefix_products, replay_chunks, replay_file)
+from quantum_gates import QuantumGates
+from qubit_state import QubitState
+from session_manager import SimulatorSession
+
+def _random_ops(count, seed=0):
+    rng = np.random.default_rng(seed)
+    gates = ["hadamard", "t", "phase", "pauli_y", "rotation_x", "rotation_z"]
+    ops = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.75:
+            name = gates[rng.integers(len(gates))]
+            op = {"op": "apply_gate", "gate_name": name}
+            if name.startswith("rotation"):
+                op["kwargs"] = {"theta": float(rng.uniform(0, 6))}
+            ops.append(op)
+        elif roll < 0.85:
+            ops.append({"op": "undo"})
+        elif roll < 0.9:
+            ops.append({"op": "redo"})
+        elif roll < 0.93:
+            ops.append({"op": "reset", "preset": "i_minus"})
+        elif roll < 0.97:
+            ops.append({"op": "save_state", "name": f"s{i % 5}"})
+        else:
+            ops.append({"op": "load_state", "name": "s0"})
+    return ops
+
+def _replay_one_by_one(ops):
+    sim = SimulatorSession()
+    for op in ops:
+        if op["op"] == "apply_gate":
+            sim.apply_gate(op["gate_name"], **op.get("kwargs", {}))
+        elif op["op"] == "reset":
+            sim.reset(op["preset"])
+        elif op["op"] in ("save_state", "load_state"):
+            getattr(sim, op["op"])(op["name"])
+        else:
+            getattr(sim, op["op"])()
+    return sim
+
+def _assert_same(a, b):
+    assert np.allclose(a.get_state_vector(), b.get_state_vector(), atol=1e-9)
+    assert a.history_len() == b.history_len() and a.history_position() == b.history_position()
+    assert a.saved_states.names() == b.saved_states.names()
+
+def test_segmented_prefix_products():
+    stack = np.stack([QuantumGates.hadamard(), QuantumGates.t_gate(), QuantumGates.rotation_y(0.3),
+                      QuantumGates.pauli_x(), QuantumGates.phase()])
+    products = prefix_products(stack)
+    assert np.allclose(products[2], stack[2] @ stack[1] @ stack[0])
+    segmented = prefix_products(stack, np.array([0, 0, 0, 1, 1]))
+    assert np.allclose(segmented[2], products[2])
+    assert np.allclose(segmented[4], stack[4] @ stack[3])
+
+def test_fused_replay_matches_individual_calls(tmp_path):
+    ops = _random_ops(3000)
+    expected = _replay_one_by_one(ops)
+    lines = [json.dumps(op) for op in ops]
+    for min_fused_run in (1, 3, 100):
+        sim = SimulatorSession()
+        stats = replay_chunks(iter_jsonl_chunks(lines, chunk_size=257), sim, min_fused_run)
+        assert stats.ops == len(ops)
+        _assert_same(sim, expected)
+
+    jsonl = tmp_path / "log.jsonl"
+    jsonl.write_text("\n".join(lines))
+    convert_jsonl_to_binary(jsonl, tmp_path / "log.qlog", chunk_size=100)
+    binary_sim, _ = replay_file(tmp_path / "log.qlog", chunk_size=333)
+    _assert_same(binary_sim, expected)
+
+def test_binary_log_rejects_custom_matrices(tmp_path):
+    with BinaryOpLogWriter(tmp_path / "log.qlog") as writer:
+        with pytest.raises(ValueError):
+            writer.write([{"op": "apply_gate", "gate_name": "custom", "kwargs": {"matrix": [[0, 1], [1, 0]]}}])
+
+def test_jsonl_custom_matrix_and_bad_op():
+    lines = [json.dumps({"op": "apply_gate", "gate_name": "custom", "kwargs": {"matrix": [[0, 1], [1, 0]]}})]
+    sim = SimulatorSession()
+    replay_chunks(iter_jsonl_chunks(lines), sim)
+    assert np.allclose(sim.get_state_vector(), [0, 1])
+    with pytest.raises(ValueError):
+        list(iter_jsonl_chunks(['{"op": "explode"}']))
+
+def test_binary_log_with_many_distinct_state_names(tmp_path):
+    names = [f"state_{i}" for i in range(70000)]
+    with BinaryOpLogWriter(tmp_path / "log.qlog", arg_cache_size=16) as writer:
+        writer.write({"op": "save_state", "name": name} for name in names)
+        writer.write([{"op": "apply_gate", "gate_name": "pauli_x"}, {"op": "load_state", "name": "state_3"}])
+    sim, stats = replay_file(tmp_path / "log.qlog", chunk_size=4096)
+    assert stats.ops == 70002 and len(sim.saved_states) == 70000
+    assert np.allclose(sim.get_state_vector(), [1, 0])
+
+def test_replay_respects_qubit_precision_and_metrics():
+    lines = [json.dumps(op) for op in _random_ops(500, seed=4)]
+    sim = SimulatorSession()
+    sim.qubit = QubitState(dtype="single")
+    replay_chunks(iter_jsonl_chunks(lines), sim, min_fused_run=2)
+    assert sim.qubit.alpha.dtype == np.complex64
+    metered = SimulatorSession()
+    metered.enable_metrics()
+    stats = replay_chunks(iter_jsonl_chunks(lines), metered)
+    assert sum(metered.stats()["gate_counts"].values()) == stats.gates
+    _assert_same(metered, _replay_one_by_one(_random_ops(500, seed=4)))
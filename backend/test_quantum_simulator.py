@@ -0,0 +1,219 @@
+import numpy as np
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from gate_animation import TrajectoryCache
+from measurement import StreamingHistogram
+from quantum_gates import QuantumGates
+from quantum_simulator import QuantumSimulator
+from qubit_state import QubitState
+from state_history import HistoryFullError, StateHistory
+from state_library import StateLibrary
+
+@pytest.fixture
+def sim():
+    QuantumSimulator._instance = None
+    simulator = QuantumSimulator()
+    yield simulator
+    QuantumSimulator._instance = None
+
+def test_apply_circuit_matches_sequential_gates(sim):
+    circuit = ["hadamard", ("rotation_z", {"theta": 0.7}), ("t", {}), ("rotation_x", {"theta": 1.1})]
+    for entry in circuit:
+        if isinstance(entry, str):
+            sim.apply_gate(entry)
+        else:
+            sim.apply_gate(entry[0], **entry[1])
+    expected = sim.get_state_vector()
+    sim.reset("zero")
+    history_before = sim.history_len()
+    sim.apply_circuit(circuit)
+    assert np.allclose(sim.get_state_vector(), expected, atol=1e-12)
+    assert sim.history_len() == history_before + 1
+
+def test_compile_circuit_is_cached(sim):
+    circuit = [("rotation_y", {"theta": 0.2}), ("phase", {})]
+    first = sim.compile_circuit(circuit)
+    assert sim.compile_circuit(circuit) is first
+    with pytest.raises(ValueError):
+        first[0, 0] = 0
+
+def test_zyz_round_trip():
+    gate = QuantumGates.rotation_x(0.4) @ QuantumGates.hadamard() @ QuantumGates.t_gate()
+    assert np.allclose(QuantumGates.from_zyz(*QuantumGates.zyz_decomposition(gate)), gate)
+
+def test_sweep_matches_apply_gate_without_touching_state(sim):
+    thetas = np.linspace(0, 2*np.pi, 7)
+    result = sim.sweep("rotation_x", thetas, start_state="plus")
+    assert sim.history_len() == 1
+    assert np.allclose(sim.get_state_vector(), [1, 0])
+    for i, theta in enumerate(thetas):
+        sim.reset("plus")
+        sim.apply_gate("rotation_x", theta=theta)
+        expected_theta, expected_phi = sim.get_bloch_coordinates()
+        assert np.isclose(result.theta[i], expected_theta)
+        x = np.sin(expected_theta) * np.cos(expected_phi)
+        z = np.cos(expected_theta)
+        assert np.isclose(result.x[i], x) and np.isclose(result.z[i], z)
+
+def test_sweep_grid_shape_and_values(sim):
+    a = np.linspace(0, np.pi, 4)
+    b = np.linspace(0, np.pi, 3)
+    result = sim.sweep_grid(["rotation_z", "hadamard", "rotation_x"], [b, a], start_state="zero")
+    assert result.x.shape == (3, 4)
+    gate = QuantumGates.rotation_x(a[2]) @ QuantumGates.hadamard() @ QuantumGates.rotation_z(b[1])
+    state = gate @ np.array([1, 0])
+    assert np.isclose(result.z[1, 2], abs(state[0])**2 - abs(state[1])**2)
+
+def test_undo_redo_and_jump_to(sim):
+    sim.apply_gate("pauli_x")
+    sim.apply_gate("hadamard")
+    sim.apply_gate("pauli_z")
+    assert sim.history_len() == 4 and sim.history_position() == 3
+    sim.jump_to(1)
+    assert np.allclose(sim.get_state_vector(), [0, 1])
+    sim.redo()
+    assert np.allclose(sim.get_state_vector(), [1/np.sqrt(2), -1/np.sqrt(2)])
+    sim.jump_to(-1)
+    assert np.allclose(sim.get_state_vector(), [1/np.sqrt(2), 1/np.sqrt(2)])
+    sim.undo()
+    sim.undo()
+    sim.undo()
+    assert np.allclose(sim.get_state_vector(), [1, 0])
+    sim.apply_gate("pauli_y")
+    assert sim.history_len() == 2
+
+def test_history_ring_buffer_drops_oldest():
+    QuantumSimulator._instance = None
+    sim = QuantumSimulator(history_capacity=3)
+    try:
+        for _ in range(5):
+            sim.apply_gate("pauli_x")
+        assert sim.history_len() == 3
+        sim.undo()
+        sim.undo()
+        assert sim.history_position() == 0
+        assert np.allclose(sim.get_state_vector(), [0, 1])
+    finally:
+        QuantumSimulator._instance = None
+
+def test_history_raise_policy():
+    history = StateHistory(capacity=2, eviction="raise")
+    history.push(1, 0)
+    with pytest.raises(OverflowError):
+        history.push(0, 1)
+
+def test_checkpoints(sim):
+    sim.apply_gate("hadamard")
+    sim.checkpoint("superposition")
+    sim.apply_gate("pauli_z")
+    sim.apply_gate("pauli_x")
+    sim.restore_checkpoint("superposition")
+    assert np.allclose(sim.get_state_vector(), [1/np.sqrt(2), 1/np.sqrt(2)])
+    sim.apply_gate("pauli_y")
+    sim.restore_checkpoint("superposition")
+    assert sim.history_position() == 1
+
+def test_save_state_versions_names(sim):
+    sim.save_state("psi")
+    sim.apply_gate("hadamard")
+    sim.save_state("psi")
+    sim.save_state("psi")
+    assert sim.last_state_name == "psi_2"
+    sim.load_state("psi")
+    assert np.allclose(sim.get_state_vector(), [1, 0])
+
+def test_state_library_bulk_round_trip(tmp_path):
+    library = StateLibrary()
+    states = np.random.default_rng(0).normal(size=(1000, 2)) + 0j
+    names = library.save_many([f"s{i % 10}" for i in range(1000)], states)
+    assert names[10] == "s0_1" and len(library) == 1000
+    library.dump(tmp_path)
+    reopened = StateLibrary.open(tmp_path)
+    assert np.allclose(reopened.load_many(names[::7]), states[::7])
+    assert reopened.save("s0", 1, 0) == "s0_100"
+    assert reopened["s0_100"] == (1, 0)
+
+def test_gate_trajectory_ends_at_applied_state(sim):
+    sim.reset("plus")
+    for name, kwargs in [("t", {}), ("hadamard", {}), ("rotation_y", {"theta": 4.0}),
+                         ("custom", {"matrix": [[0, 1j], [1j, 0]]})]:
+        path = sim.gate_trajectory(name, frames=30, **kwargs)
+        assert path.shape == (30, 3)
+        assert np.allclose(path[0], sim.get_bloch_cartesian())
+        assert np.allclose(np.linalg.norm(path, axis=1), 1)
+        sim.apply_gate(name, **kwargs)
+        assert np.allclose(path[-1], sim.get_bloch_cartesian(), atol=1e-12)
+
+def test_gate_trajectory_is_cached(sim):
+    first = sim.gate_trajectory("rotation_x", theta=1.0, start_state="zero")
+    assert sim.gate_trajectory("rotation_x", theta=1.0, start_state="zero") is first
+    path = sim.gate_trajectory("rotation_x", frames=3, theta=np.pi, start_state="zero")
+    assert np.allclose(path[1], [0, -1, 0])
+
+def test_measure_is_seedable_and_matches_probabilities(sim):
+    sim.reset("i_plus")
+    sim.seed(7)
+    first = sim.measure("z", shots=100_000)
+    sim.seed(7)
+    assert np.array_equal(sim.measure("z", shots=100_000).counts, first.counts)
+    assert first.counts.sum() == 100_000 and abs(first.expectation) < 0.02
+    assert np.allclose(sim.measure("y", shots=10).counts, [10, 0])
+    assert np.allclose(sim.measure("x", shots=10).probabilities, [0.5, 0.5])
+    assert np.allclose(sim.get_state_vector(), [1/np.sqrt(2), 1j/np.sqrt(2)])
+
+def test_measure_shots_are_streamed(sim):
+    sim.apply_gate("rotation_y", theta=np.pi / 3)
+    result = sim.measure("z", shots=10_001, return_shots=True, chunk_size=1000)
+    assert result.outcomes.shape == (10_001,)
+    assert result.counts[1] == result.outcomes.sum()
+    histogram = StreamingHistogram()
+    for chunk in sim.stream_measurements("z", shots=50_000, chunk_size=4096):
+        assert len(chunk) <= 4096
+        histogram.update(chunk)
+    assert histogram.shots == 50_000 and abs(histogram.frequencies()[1] - 0.25) < 0.01
+
+def test_measure_batch(sim):
+    states = np.array([[1, 0], [0, 1], [1/np.sqrt(2), -1/np.sqrt(2)]])
+    counts = sim.measure_batch(states, "x", shots=500)
+    assert counts.shape == (3, 2) and counts[2, 1] == 500
+    with pytest.raises(ValueError):
+        sim.measure("w")
+
+def test_state_library_dump_back_to_opened_directory(tmp_path):
+    library = StateLibrary()
+    library.save_many([f"s{i}" for i in range(5000)], np.tile([1, 1j], (5000, 1)))
+    library.dump(tmp_path)
+    reopened = StateLibrary.open(tmp_path)
+    reopened.dump(tmp_path)
+    assert len(StateLibrary.open(tmp_path)) == 5000
+    assert np.allclose(reopened.load_many(["s0", "s4999"]), library.load_many(["s0", "s4999"]))
+
+def test_trajectory_cache_is_thread_safe():
+    cache = TrajectoryCache(maxsize=4)
+    def work(seed):
+        for i in range(300):
+            theta = float((seed * 7 + i) % 10)
+            assert cache.get("rotation_x", {"theta": theta}, QubitState(), frames=3).shape == (3, 3)
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(work, range(8)))
+    assert len(cache) <= 4
+
+def test_failed_operations_leave_history_unchanged(sim):
+    with pytest.raises(ValueError):
+        sim.apply_gate("nope")
+    with pytest.raises(ValueError):
+        sim.reset("nowhere")
+    assert sim.history_len() == 1
+    history = StateHistory(capacity=2, eviction="raise")
+    history.push(1, 0)
+    with pytest.raises(HistoryFullError):
+        history.push(0, 1)
+
+def test_returned_shots_do_not_depend_on_chunk_size(sim):
+    sim.apply_gate("rotation_y", theta=1.0)
+    sim.seed(3)
+    whole = sim.measure("z", shots=5000, return_shots=True, chunk_size=5000)
+    sim.seed(3)
+    chunked = sim.measure("z", shots=5000, return_shots=True)
+    assert chunked.outcomes.dtype == np.uint8 and np.array_equal(chunked.outcomes, whole.outcomes)
+    assert sim.measure("z", shots=0, return_shots=True).outcomes.shape == (0,)
@@ -1,6 +1,9 @@
 import numpy as np
-from qubit_state import QubitState
-from quantum_gates import QuantumGates
+import pytest
+from bloch_vector import BlochVectorState, so3_gate
+from qubit_state import QubitState, QubitStateBatch
+from quantum_gates import QuantumGates, register_gate, resolve_gate, GATE_REGISTRY
+from session_manager import SimulatorSession
 
 def almost_equal_complex(a, b, tol=1e-6):
     return np.abs(a - b) < tol
@@ -59,4 +62,137 @@ def test_bloch_vector_plus_state():
 def test_normalization():
     q = QubitState(alpha=3+4j, beta=1+2j)
     norm = abs(q.alpha)**2 + abs(q.beta)**2
-    assert np.isclose(norm, 1.0, atol=1e-6)
\ No newline at end of file
+    assert np.isclose(norm, 1.0, atol=1e-6)
+
+def test_batch_matches_single_qubit():
+    batch = QubitStateBatch(3)
+    batch.set_preset("plus")
+    batch.apply_gate(QuantumGates.rotation_y(0.3))
+    q = QubitState()
+    q.set_preset("plus")
+    q.apply_gate(QuantumGates.rotation_y(0.3))
+    for row in batch.get_state_vector():
+        assert np.allclose(row, q.get_state_vector(), atol=1e-12)
+    theta, phi = batch.get_bloch_vector()
+    assert np.allclose(theta, q.get_bloch_vector()[0])
+    assert np.allclose(phi, q.get_bloch_vector()[1])
+
+def test_batch_per_qubit_gate_stack():
+    batch = QubitStateBatch(2)
+    gates = np.stack([QuantumGates.pauli_x(), QuantumGates.hadamard()])
+    batch.apply_gate(gates)
+    states = batch.get_state_vector()
+    assert np.allclose(states[0], [0, 1], atol=1e-12)
+    assert np.allclose(states[1], [1/np.sqrt(2), 1/np.sqrt(2)], atol=1e-12)
+
+def test_batch_rejects_bad_gate_shape():
+    batch = QubitStateBatch(4)
+    try:
+        batch.apply_gate(np.eye(3))
+    except ValueError:
+        pass
+    else:
+        assert False, "Expected ValueError for a 3x3 gate"
+
+def test_fixed_gates_are_shared_read_only_constants():
+    assert QuantumGates.hadamard() is QuantumGates.hadamard()
+    assert not QuantumGates.pauli_x().flags.writeable
+
+def test_rotation_cache_records_hits():
+    QuantumGates.clear_rotation_cache()
+    first = QuantumGates.rotation_x(np.deg2rad(45))
+    second = QuantumGates.rotation_x(np.deg2rad(45))
+    info = QuantumGates.rotation_cache_info()
+    assert first is second
+    assert info["hits"] == 1 and info["misses"] == 1
+    expected = np.array([[np.cos(np.pi/8), -1j*np.sin(np.pi/8)],
+                         [-1j*np.sin(np.pi/8), np.cos(np.pi/8)]])
+    assert np.allclose(first, expected)
+
+def test_rotation_angles_are_reduced_and_checked():
+    assert np.allclose(QuantumGates.rotation_y(1e300), QuantumGates.rotation_y(np.fmod(1e300, 4*np.pi)))
+    assert np.allclose(QuantumGates.rotation_z(4*np.pi + 0.3), QuantumGates.rotation_z(0.3))
+    assert np.allclose(QuantumGates.rotation_x(-0.3), QuantumGates.rotation_x(0.3).conj().T)
+    for theta in (np.nan, np.inf, -np.inf, 1e400):
+        with pytest.raises(ValueError):
+            QuantumGates.rotation_x(theta)
+
+def test_register_gate():
+    register_gate("sqrt_x", lambda **kwargs: QuantumGates.rotation_x(np.pi/2))
+    try:
+        assert np.allclose(resolve_gate("SQRT_X"), QuantumGates.rotation_x(np.pi/2))
+    finally:
+        del GATE_REGISTRY["sqrt_x"]
+
+def test_bloch_vector_engine_matches_qubit_state():
+    q = QubitState()
+    v = BlochVectorState.from_qubit_state(q)
+    for name, kwargs in [("hadamard", {}), ("t", {}), ("rotation_y", {"theta": 0.4}),
+                         ("phase", {}), ("rotation_x", {"theta": 2.1}), ("pauli_y", {})]:
+        q.apply_gate(resolve_gate(name, **kwargs))
+        v.apply_named_gate(name, **kwargs)
+        assert np.allclose(v.get_bloch_cartesian(), q.get_bloch_cartesian(), atol=1e-12)
+    assert np.allclose(so3_gate("hadamard") @ so3_gate("hadamard"), np.eye(3))
+
+def test_bloch_vector_engine_follows_rebound_gates():
+    original = GATE_REGISTRY["t"]
+    v = BlochVectorState()
+    register_gate("t", lambda **kwargs: QuantumGates.pauli_x(), overwrite=True)
+    try:
+        v.apply_named_gate("t")
+        assert np.allclose(v.get_bloch_cartesian(), [0, 0, -1])
+    finally:
+        register_gate("t", original, overwrite=True)
+
+def test_bloch_vector_round_trip_up_to_global_phase():
+    for alpha, beta in [(0.6, 0.8j), (1, 0), (0, 1), (1 - 1j, 0.3 + 2j)]:
+        q = QubitState(alpha, beta)
+        back = BlochVectorState.from_qubit_state(q).to_qubit_state().get_state_vector()
+        original = q.get_state_vector()
+        overlap = abs(np.vdot(original, back))
+        assert np.isclose(overlap, 1.0, atol=1e-12)
+
+def test_single_precision_and_lazy_renormalization():
+    batch = QubitStateBatch(100, 1, 1j, dtype="single", renormalize_every=16)
+    reference = QubitStateBatch(100, 1, 1j)
+    gate = QuantumGates.rotation_y(0.3) @ QuantumGates.t_gate()
+    for _ in range(40):
+        batch.apply_gate(gate)
+        reference.apply_gate(gate)
+    assert batch.states.dtype == np.complex64
+    assert batch.renormalizations == 2
+    assert batch.norm_drift() < 1e-5 and batch.max_drift < 1e-5
+    assert np.allclose(np.column_stack(batch.get_bloch_cartesian()),
+                       np.column_stack(reference.get_bloch_cartesian()), atol=1e-5)
+
+def test_drift_tolerance_and_unnormalized_readout():
+    q = QubitState(renormalize_every=1000, drift_tolerance=1e-3)
+    q.apply_gate(1.01 * QuantumGates.hadamard())  # Slightly non-unitary: drift 0.02 > tolerance
+    assert q.renormalizations == 1 and q.norm_drift() < 1e-12
+    q.apply_gate(1.0001 * QuantumGates.rotation_y(np.pi / 2))  # Drift 2e-4 stays below tolerance
+    assert q.renormalizations == 1 and q.norm_drift() > 1e-4
+    theta, _ = q.get_bloch_vector()
+    assert np.isclose(theta, np.pi)
+    assert np.allclose(q.get_bloch_cartesian(), [0, 0, -1])
+
+def test_drift_is_measured_the_same_way_everywhere():
+    q = QubitState(renormalize_every=1000)
+    q.apply_gate(1.01 * QuantumGates.hadamard())
+    drift = q.norm_drift()
+    assert np.isclose(drift, 1.01**2 - 1)
+    q.normalize()
+    assert np.isclose(q.max_drift, drift)
+
+def test_restored_amplitudes_keep_the_configured_precision():
+    sim = SimulatorSession()
+    sim.qubit = QubitState(dtype="single")
+    sim.apply_gate("hadamard")
+    sim.save_state("plus")
+    sim.apply_gate("t")
+    sim.undo()
+    assert sim.qubit.alpha.dtype == np.complex64
+    sim.redo()
+    sim.jump_to(0)
+    sim.load_state("plus")
+    assert sim.qubit.alpha.dtype == sim.qubit.beta.dtype == np.complex64
+    assert np.allclose(sim.get_state_vector(), [1 / np.sqrt(2), 1 / np.sqrt(2)], atol=1e-6)
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from functools import reduce
+from quantum_gates import QuantumGates, resolve_gate
+from register_state import RegisterSimulator, RegisterState
+
+def full_operator(gate, qubit, n):
+    ops = [np.eye(2)] * n
+    ops[qubit] = gate
+    return reduce(np.kron, ops)
+
+def test_single_qubit_gates_match_kronecker_product():
+    n = 4
+    reg, expected = RegisterState(n), np.eye(2**n)[0].astype(complex)
+    for qubit, name, kwargs in [(0, "hadamard", {}), (2, "rotation_y", {"theta": 0.4}), (2, "t", {}),
+                                (3, "pauli_y", {}), (0, "rotation_z", {"theta": 1.3})]:
+        gate = resolve_gate(name, **kwargs)
+        reg.apply_gate(gate, qubit)
+        expected = full_operator(gate, qubit, n) @ expected
+    assert len(reg._pending) == 3  # gates on qubits 0 and 2 were fused
+    assert np.allclose(reg.get_state_vector(), expected)
+
+def test_bell_state_and_reduced_bloch_vectors():
+    reg = RegisterState(3)
+    reg.apply_gate(QuantumGates.hadamard(), 0)
+    reg.cnot(0, 2)
+    reg.apply_gate(QuantumGates.pauli_x(), 1)
+    state = reg.get_state_vector()
+    assert np.allclose(state[[0b010, 0b111]], 1 / np.sqrt(2))
+    assert np.allclose(reg.get_bloch_vectors(), [[0, 0, 0], [0, 0, -1], [0, 0, 0]])
+    swap = np.eye(4)[[0, 2, 1, 3]]
+    reg.apply_two_qubit_gate(swap, 1, 2)
+    reg.swap(2, 1)
+    assert np.allclose(reg.get_state_vector(), state)
+
+def test_controlled_gate_with_trailing_control():
+    reg = RegisterState(3)
+    for qubit in range(3):
+        reg.apply_gate(QuantumGates.hadamard(), qubit)
+    before = reg.get_state_vector()
+    gate = QuantumGates.rotation_y(0.9)
+    reg.apply_controlled(gate, 2, 0)
+    projector = np.diag([0, 1])
+    expected = (full_operator(np.eye(2) - projector, 2, 3)
+                + full_operator(gate, 0, 3) @ full_operator(projector, 2, 3)) @ before
+    assert np.allclose(reg.get_state_vector(), expected)
+
+def test_register_simulator_undo_redo():
+    sim = RegisterSimulator(3)
+    sim.apply_gate("hadamard", qubit=1)
+    sim.apply_gate("cnot", control=1, target=0)
+    sim.apply_controlled("rotation_x", 0, 2, theta=0.7)
+    sim.apply_gate("swap", first=0, second=2)
+    after = sim.get_state_vector()
+    for _ in range(4):
+        sim.undo()
+    assert np.allclose(sim.get_state_vector(), np.eye(8)[0])
+    for _ in range(4):
+        sim.redo()
+    assert np.allclose(sim.get_state_vector(), after)
+    with pytest.raises(ValueError):
+        sim.apply_gate("cz", control=1)
+
+def test_single_precision_register():
+    sim = RegisterSimulator(3, dtype="single")
+    sim.apply_gate("hadamard", 0)
+    sim.apply_gate("cnot", control=0, target=2)
+    state = sim.register.get_state_vector()
+    assert state.dtype == np.complex64
+    assert np.allclose(state[[0b000, 0b101]], 1 / np.sqrt(2), atol=1e-6)
+    sim.reset()
+    assert sim.register.state.dtype == np.complex64
+    with pytest.raises(ValueError):
+        RegisterState(2, dtype=np.float32)
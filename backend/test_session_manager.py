@@ -0,0 +1,54 @@
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from quantum_simulator import QuantumSimulator
+from session_manager import SessionManager, SimulatorSession
+
+def test_sessions_are_independent_of_each_other_and_the_singleton():
+    a = SimulatorSession("a")
+    b = SimulatorSession("b")
+    assert a is not b and a is not QuantumSimulator()
+    a.apply_gate("pauli_x")
+    b.save_state("only_b")
+    assert np.allclose(b.get_state_vector(), [1, 0])
+    assert "only_b" not in a.saved_states
+
+def test_manager_evicts_idle_sessions_and_reuses_them():
+    manager = SessionManager(idle_timeout=10.0)
+    with manager.session("alice") as sim:
+        sim.apply_gate("hadamard")
+        sim.seed(7)
+        sim.save_state("x")
+        sim.compile_circuit(["hadamard"])
+    first = manager.get("alice")
+    assert manager.evict_idle(now=first.last_used + 5) == 0
+    assert manager.evict_idle(now=first.last_used + 11) == 1
+    assert "alice" not in manager
+    with manager.session("bob") as sim:
+        assert sim is first
+        assert np.allclose(sim.get_state_vector(), [1, 0])
+        assert sim.history_len() == 1
+        assert sim.last_state_name is None and not sim._circuit_cache
+        assert sim.rng.random() != np.random.default_rng(7).random()
+
+def test_manager_evicts_least_recently_used_when_full():
+    manager = SessionManager(max_sessions=2)
+    manager.get("a")
+    manager.get("b")
+    manager.get("a")
+    manager.get("c")
+    assert "a" in manager and "c" in manager and "b" not in manager
+
+def test_concurrent_sessions_do_not_interfere():
+    manager = SessionManager()
+
+    def run(user):
+        for _ in range(200):
+            with manager.session(user) as sim:
+                sim.apply_gate("pauli_x")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(run, [f"user{i % 4}" for i in range(8)]))
+    for i in range(4):
+        sim = manager.get(f"user{i}")
+        assert sim.history_len() == 401
+        assert np.allclose(sim.get_state_vector(), [1, 0])
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from quantum_gates import QuantumGates
+from qubit_state import QubitStateBatch
+from sharded_executor import SharedEnsemble, ShardedExecutor
+
+def test_sharded_run_matches_batch_engine():
+    program = ["hadamard", ("rotation_y", {"theta": 0.7}), "t"]
+    with SharedEnsemble(1001, alpha=0.6, beta=0.8j) as ensemble, ShardedExecutor(workers=2) as executor:
+        bloch = executor.run(ensemble, program)
+        expected = QubitStateBatch(1001, 0.6, 0.8j)
+        for gate in (QuantumGates.hadamard(), QuantumGates.rotation_y(0.7), QuantumGates.t_gate()):
+            expected.apply_gate(gate)
+        assert np.allclose(ensemble.states, expected.states)
+        assert np.allclose(bloch, np.column_stack(expected.get_bloch_cartesian()))
+
+def test_sharded_run_at_single_precision():
+    with SharedEnsemble(501, dtype="single") as ensemble, ShardedExecutor(workers=2) as executor:
+        assert ensemble.states.dtype == np.complex64
+        bloch = executor.run(ensemble, ["hadamard", "phase"])
+        assert bloch.dtype == np.float32
+        assert np.allclose(bloch, [0, 1, 0], atol=1e-6)
+    with pytest.raises(ValueError):
+        SharedEnsemble(10, dtype=np.float32)
+
+def _mapped_shared_blocks(_):
+    with open("/proc/self/maps") as f:
+        return sum("/dev/shm/" in line for line in f)
+
+def test_workers_release_closed_ensembles():
+    with ShardedExecutor(workers=2) as executor:
+        baseline = max(executor._pool.map(_mapped_shared_blocks, range(8)))
+        for _ in range(20):
+            with SharedEnsemble(1000) as ensemble:
+                executor.run(ensemble, ["hadamard"])
+        assert max(executor._pool.map(_mapped_shared_blocks, range(8))) == baseline
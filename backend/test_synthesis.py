@@ -0,0 +1,41 @@
+import numpy as np
+from quantum_gates import resolve_gate
+from synthesis import SequenceIndex, gate_distance, su2_quaternion, word_matrix
+
+def test_nearest_word_is_exact_for_clifford_t_words():
+    index = SequenceIndex.build(max_length=12)
+    target = word_matrix(["hadamard", "t", "hadamard", "phase", "t"])
+    word, distance = index.nearest(1j * target)
+    assert distance < 1e-7 and len(word) <= 5
+    assert gate_distance(word_matrix(word), target) < 1e-7
+
+def test_nearest_matches_brute_force_after_reload(tmp_path):
+    SequenceIndex.build(max_length=16).dump(tmp_path)
+    index = SequenceIndex.open(tmp_path)
+    assert isinstance(index.quaternions, np.memmap)
+    rng = np.random.default_rng(3)
+    for _ in range(20):
+        target = (resolve_gate("rotation_z", theta=rng.uniform(0, 6))
+                  @ resolve_gate("rotation_y", theta=rng.uniform(0, 3)))
+        word, distance = index.nearest(target)
+        overlaps = np.abs(np.asarray(index.quaternions) @ su2_quaternion(target))
+        assert np.isclose(distance, np.sqrt(max(2 - 2 * overlaps.max(), 0)))
+        assert np.isclose(gate_distance(word_matrix(word), target), distance)
+
+def test_solovay_kitaev_refinement_reduces_error():
+    index = SequenceIndex.build(max_length=20)
+    target = resolve_gate("rotation_x", theta=0.3)
+    _, base = index.approximate(target)
+    word, refined = index.approximate(target, depth=1)
+    assert refined < base / 3
+    assert set(word) <= {"hadamard", "t", "phase"}
+
+def test_redump_opened_index_to_its_own_path(tmp_path):
+    built = SequenceIndex.build(max_length=14)
+    built.dump(tmp_path)
+    opened = SequenceIndex.open(tmp_path)
+    opened.dump(tmp_path)
+    reopened = SequenceIndex.open(tmp_path)
+    target = resolve_gate("rotation_y", theta=1.1)
+    assert len(reopened) == len(built)
+    assert reopened.nearest(target) == built.nearest(target) == opened.nearest(target)